@@ -1,15 +1,13 @@
-import openai
 import smtplib
 from email.message import EmailMessage
 from pathlib import Path
 from dotenv import load_dotenv
 import os
+from email_generation import generate_emails
 
 # Load API keys and credentials
 load_dotenv()
 
-# Initialize OpenAI client
-client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 EMAIL_ADDRESS = os.getenv("EMAIL_USER")
 EMAIL_PASSWORD = os.getenv("EMAIL_PASS")
 
@@ -24,19 +22,13 @@ def search_jobs():
         {"title": "Computer Vision Engineer", "company": "VisionX", "email": "careers@visionx.com"}
     ]
 
-# Generate email using OpenAI
-def generate_email(job):
-    prompt = f"""
+# OpenAI prompt for one application email (generated concurrently by email_generation.py)
+def email_prompt(job):
+    return f"""
     Write a short, professional job application email for the position of {job['title']} at {job['company']}.
     Mention relevant AI skills (NLP, Deep Learning, Python, TensorFlow).
     Note that the resume is attached. Keep it under 200 words.
     """
-    response = client.chat.completions.create(
-        model="gpt-4",
-        messages=[{"role": "user", "content": prompt}],
-        max_tokens=250
-    )
-    return response.choices[0].message.content
 
 # Send email with CV attachment
 def send_email(subject, body, to_email):
@@ -72,9 +64,13 @@ def send_email(subject, body, to_email):
 # Main process
 def main():
     jobs = search_jobs()
-    for job in jobs:
+    print(f"🤖 Generating {len(jobs)} application emails...")
+    email_bodies = generate_emails(jobs, email_prompt)
+    for job, email_body in zip(jobs, email_bodies):
         print(f"📨 Preparing application for: {job['title']} at {job['company']}")
-        email_body = generate_email(job)
+        if email_body is None:
+            print("❌ No email generated - skipped.\n")
+            continue
         print("✉️ Email Preview:")
         print(email_body)
         send_email(
@@ -0,0 +1,47 @@
+from playwright.sync_api import sync_playwright
+import sys
+import time
+from browser_profile import PROFILES, TrafficMeter
+
+# Benchmark: bytes received and ms per page load under each browser profile
+# ("full" = the scrapers' old headed, unfiltered browser; "lean" = headless with
+# images/media/fonts and tracker domains blocked).
+#
+#   python benchmark_browser_profile.py [url ...]
+
+DEFAULT_URLS = [
+    "https://www.linkedin.com/jobs/search/?keywords=data%20scientist&f_WT=2",
+    "https://www.indeed.com/jobs?q=data%20scientist%20remote&l=Germany&rbl=Remote&jlid=remote",
+]
+
+def measure(playwright, profile, urls):
+    """(KB per page, ms per page, requests blocked) for one profile over `urls`"""
+    browser = profile.launch(playwright)
+    meter = TrafficMeter()
+    page = profile.new_context(browser, meter).new_page()
+    start = time.perf_counter()
+    for url in urls:
+        try:
+            page.goto(url, wait_until="load", timeout=30000)
+        except Exception as e:
+            print(f"⚠️  {profile.name}: {url} failed to load: {e}")
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    browser.close()
+    return meter.bytes / 1e3 / len(urls), elapsed_ms / len(urls), meter.blocked
+
+def run_benchmark(urls):
+    with sync_playwright() as p:
+        print(f"📊 Browser profile benchmark ({len(urls)} pages per profile)\n")
+        print(f"{'Profile':<8} {'KB/page':>10} {'ms/page':>10} {'blocked':>9}")
+        results = {}
+        for name in ("full", "lean"):
+            results[name] = measure(p, PROFILES[name], urls)
+            kb, ms, blocked = results[name]
+            print(f"{name:<8} {kb:>10.0f} {ms:>10.0f} {blocked:>9}")
+        full_kb, full_ms, _ = results["full"]
+        lean_kb, lean_ms, _ = results["lean"]
+        if lean_kb and lean_ms:
+            print(f"\n{'saving':<8} {full_kb / lean_kb:>9.1f}x {full_ms / lean_ms:>9.1f}x")
+
+if __name__ == "__main__":
+    run_benchmark(sys.argv[1:] or DEFAULT_URLS)
@@ -0,0 +1,85 @@
+import re
+import sys
+import time
+import random
+from text_classify import REMOTE_KEYWORDS, KeywordMatcher, ahocorasick, classify, classify_batch
+
+# Micro-benchmark: the scrapers' old per-job extract_email()/remote check vs
+# text_classify (precompiled patterns, single-pass keyword matcher, batch API).
+# Runs offline on synthetic job descriptions.
+#
+#   python benchmark_classify.py [jobs]
+
+WORDS = ("data model python pipeline team customer product analytics platform cloud "
+         "experience years skills degree office hybrid onsite benefits salary growth").split()
+EXTRAS = ["remote", "work from home", "Distributed team", "telecommute", "VIRTUAL", "anywhere in Europe", "", "", "", ""]
+
+def legacy_extract_email(text):
+    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
+    return re.findall(email_pattern, text)
+
+def legacy_is_remote(title, company, description, location):
+    full_text = (title + " " + company + " " + description + " " + location).lower()
+    return any(keyword in full_text for keyword in REMOTE_KEYWORDS)
+
+def make_jobs(count, seed=7):
+    rng = random.Random(seed)
+    jobs = []
+    for i in range(count):
+        words = [rng.choice(WORDS) for _ in range(rng.randint(80, 250))]
+        words.insert(rng.randrange(len(words)), rng.choice(EXTRAS))
+        if rng.random() < 0.3:
+            email = f"jobs{i}@company{i % 50}.example"
+            words.insert(rng.randrange(len(words)), rng.choice([email, f"({email})", f"mail:{email}.", f"@{email}@x"]))
+        jobs.append({
+            "title": rng.choice(["Data Scientist", "AI Engineer", "Data Analyst", "Python Developer"]),
+            "company": f"Company {i % 50}",
+            "description": " ".join(words),
+            "location": rng.choice(["Berlin, Germany", "London", "Toronto, Canada", "Sydney"]),
+        })
+    return jobs
+
+def timed(function):
+    started = time.perf_counter()
+    result = function()
+    return result, (time.perf_counter() - started) * 1e6
+
+def run_benchmark(count=5000):
+    jobs = make_jobs(count)
+    fields = lambda job: (job["title"], job["company"], job["description"], job["location"])
+
+    legacy, legacy_us = timed(lambda: [
+        (legacy_extract_email(job["description"]), legacy_is_remote(*fields(job))) for job in jobs
+    ])
+    single, single_us = timed(lambda: [classify(*fields(job)) for job in jobs])
+    batch, batch_us = timed(lambda: classify_batch(jobs))
+    automaton_matcher = KeywordMatcher(REMOTE_KEYWORDS, automaton=True)
+    automaton_batch, automaton_batch_us = timed(lambda: classify_batch(jobs, automaton_matcher))
+
+    # Role tagging against a large vocabulary, where the automaton's single pass pays off
+    vocabulary = [f"{level} {role}" for level in ("data", "ml", "ai", "python", "cloud", "senior", "junior", "lead", "staff", "principal")
+                  for role in ("scientist", "engineer", "analyst", "developer", "architect", "manager")]
+    descriptions = [job["description"] for job in jobs]
+    scan_tags, scan_us = timed(lambda: [{k for k in vocabulary if k in text} for text in (d.lower() for d in descriptions)])
+    tag_matcher = KeywordMatcher(vocabulary)
+    automaton_tags, automaton_tags_us = timed(lambda: [tag_matcher.find_all(d) for d in descriptions])
+    assert scan_tags == automaton_tags, "KeywordMatcher.find_all disagrees with substring scans"
+
+    expected = [(emails, remote) for emails, remote in legacy]
+    for name, results in (("classify", single), ("classify_batch", batch), ("classify_batch (automaton)", automaton_batch)):
+        got = [(r["emails"], r["is_remote"]) for r in results]
+        assert got == expected, f"{name} disagrees with the legacy functions"
+
+    print(f"📊 Text classification benchmark ({count} jobs, pyahocorasick {'installed' if ahocorasick else 'not installed'})\n")
+    print(f"{'Approach':<28} {'µs/job':>10} {'speed-up':>10}")
+    for name, micros in (("legacy per job", legacy_us), ("classify per job", single_us),
+                         ("classify_batch", batch_us), ("classify_batch (automaton)", automaton_batch_us)):
+        print(f"{name:<28} {micros / count:>10.2f} {legacy_us / micros:>9.1f}x")
+
+    print(f"\n{len(vocabulary)}-keyword tagging ({'automaton' if tag_matcher.automaton else 'substring scans'})")
+    print(f"{'any(k in text) per keyword':<28} {scan_us / count:>10.2f} {1:>9.1f}x")
+    print(f"{'KeywordMatcher.find_all':<28} {automaton_tags_us / count:>10.2f} {scan_us / automaton_tags_us:>9.1f}x")
+    print("\n✅ All approaches agree on emails and remote flags")
+
+if __name__ == "__main__":
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
@@ -0,0 +1,122 @@
+from playwright.sync_api import sync_playwright
+import sys
+import time
+from job_extraction import INDEED_DETAIL_SPEC, LINKEDIN_DETAIL_SPEC, extract_job_details
+
+# Benchmark: per-field query_selector()/inner_text() extraction vs one page.evaluate()
+# Runs offline against a static detail pane loaded with page.set_content().
+#
+#   python benchmark_extraction.py [iterations]
+
+LINKEDIN_PANE_HTML = """
+<section class="top-card-layout">
+  <h2 class="topcard__title">Senior Data Scientist</h2>
+  <span class="topcard__flavor">BigTech</span>
+  <span class="topcard__flavor topcard__flavor--bullet">Berlin, Germany (Remote)</span>
+  <a class="jobs-details-top-card__company-url" href="/company/bigtech/">BigTech</a>
+</section>
+<div class="message-the-recruiter">
+  <a class="app-aware-link" href="/in/jane-recruiter/"><img src="data:,">Jane Doe - Recruiter</a>
+</div>
+<div class="description__text">We are hiring a remote data scientist. Contact jobs@bigtech.example. """ + "Lorem ipsum dolor sit amet. " * 80 + """</div>
+"""
+
+INDEED_PANE_HTML = """
+<h1 data-testid="jobsearch-JobInfoHeader-title">Machine Learning Engineer</h1>
+<div data-testid="inlineHeader-companyName"><a href="/cmp/visionx">VisionX</a></div>
+<div data-testid="job-location">Remote</div>
+<div id="jobDescriptionText">Work from home. Apply at careers@visionx.example. """ + "Lorem ipsum dolor sit amet. " * 80 + """</div>
+"""
+
+class RoundTripCounter:
+    """Wraps a page/element handle and counts every call that crosses into the browser"""
+
+    def __init__(self, target, counter):
+        self._target = target
+        self._counter = counter
+
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            self._counter[0] += 1
+            result = attr(*args, **kwargs)
+            if result is not None and hasattr(result, "inner_text"):
+                return RoundTripCounter(result, self._counter)
+            return result
+        return call
+
+def legacy_linkedin_extraction(page):
+    """The per-field lookups scrape_linkedin_jobs used before the batched evaluate"""
+    title = page.query_selector("h2.topcard__title").inner_text() if page.query_selector("h2.topcard__title") else ""
+    company = page.query_selector("span.topcard__flavor").inner_text() if page.query_selector("span.topcard__flavor") else ""
+    description = page.query_selector("div.description__text").inner_text() if page.query_selector("div.description__text") else ""
+    location_element = page.query_selector("span.topcard__flavor--bullet")
+    location = location_element.inner_text() if location_element else ""
+
+    recruiter_element = page.query_selector("a.app-aware-link:has-text('Recruiter')")
+    if not recruiter_element:
+        recruiter_element = page.query_selector("a[href*='/in/']:has(img)")
+    if not recruiter_element:
+        recruiter_element = page.query_selector("a.jobs-poster__name")
+    recruiter_name = recruiter_element.inner_text().strip() if recruiter_element else ""
+    recruiter_url = recruiter_element.get_attribute('href') if recruiter_element else ""
+
+    company_element = page.query_selector("a.jobs-details-top-card__company-url")
+    if not company_element:
+        company_element = page.query_selector("a[href*='/company/']")
+    company_url = company_element.get_attribute('href') if company_element else ""
+
+    return title, company, location, description, recruiter_name, recruiter_url, company_url
+
+def legacy_indeed_extraction(page):
+    """The per-field lookups scrape_google_jobs used before the batched evaluate"""
+    title_element = page.query_selector("h1[data-testid='jobsearch-JobInfoHeader-title'], h1.jobsearch-JobInfoHeader-title")
+    title = title_element.inner_text() if title_element else "N/A"
+    company_element = page.query_selector("[data-testid='inlineHeader-companyName'] a, .jobsearch-InlineCompanyRating a")
+    company = company_element.inner_text() if company_element else "N/A"
+    description_element = page.query_selector("#jobDescriptionText, .jobsearch-jobDescriptionText")
+    description = description_element.inner_text() if description_element else ""
+    location_element = page.query_selector("[data-testid='job-location'], .jobsearch-JobInfoHeader-subtitle")
+    location = location_element.inner_text() if location_element else ""
+    return title, company, location, description
+
+def measure(page, extract, iterations):
+    counter = [0]
+    counted_page = RoundTripCounter(page, counter)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        extract(counted_page)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    return counter[0] / iterations, elapsed_ms / iterations
+
+def run_benchmark(iterations=200):
+    cases = [
+        ("LinkedIn", LINKEDIN_PANE_HTML, legacy_linkedin_extraction, lambda pg: extract_job_details(pg, LINKEDIN_DETAIL_SPEC)),
+        ("Indeed", INDEED_PANE_HTML, legacy_indeed_extraction, lambda pg: extract_job_details(pg, INDEED_DETAIL_SPEC)),
+    ]
+
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+        page = browser.new_page()
+
+        print(f"📊 Detail extraction benchmark ({iterations} jobs per approach)\n")
+        print(f"{'Source':<10} {'Approach':<16} {'Round-trips/job':>16} {'ms/job':>10}")
+        for name, html, legacy, batched in cases:
+            page.set_content(html)
+            # Warm up both paths so the first measurement is not paying for JIT/compile
+            legacy(page)
+            batched(page)
+
+            legacy_trips, legacy_ms = measure(page, legacy, iterations)
+            batched_trips, batched_ms = measure(page, batched, iterations)
+            print(f"{name:<10} {'query_selector':<16} {legacy_trips:>16.1f} {legacy_ms:>10.2f}")
+            print(f"{name:<10} {'single evaluate':<16} {batched_trips:>16.1f} {batched_ms:>10.2f}")
+            print(f"{'':<10} {'speed-up':<16} {'':>16} {legacy_ms / batched_ms:>9.1f}x\n")
+
+        browser.close()
+
+if __name__ == "__main__":
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
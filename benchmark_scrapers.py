@@ -0,0 +1,182 @@
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from job_sinks import count_rows
+from replay_fixtures import PAGES_PER_SEARCH
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+try:
+    import resource
+except ImportError:
+    resource = None  # Windows: peak RSS needs psutil
+
+# End-to-end benchmark of the scrapers against recorded pages, with no network.
+#
+# Each scraper runs through run_scraper.py in its own process and an empty work
+# directory, with LinkedIn, Indeed, RemoteOK and WeWorkRemotely replayed from
+# fixtures/ (replay_fixtures.py) and request pacing off (--paced keeps it), so two
+# runs of the same code see the same pages and cost the same. Reported per scraper:
+# jobs saved, wall time and jobs/s, peak RSS of the scraper and its browser
+# processes, and the bytes it wrote (output, stream, crawl state and caches).
+# A scraper that saved no jobs counts as failed even when it exited cleanly (most
+# of them catch their own errors), and its work directory and log are kept.
+#
+#   python benchmark_scrapers.py                                   -> every scraper, 100 jobs each
+#   python benchmark_scrapers.py linkedin-100k indeed --target 500 --json bench.json
+
+SCRAPERS = ("linkedin", "linkedin-100k", "indeed", "quick", "simple", "easy")
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+LOG_NAME = "benchmark.log"
+CHILD_STATS_NAME = "benchmark_child.json"
+SAMPLE_EVERY_S = 0.1
+
+def run_child(scraper, target, pages, workdir, paced):
+    """Inside the benchmark process of one scraper: replay the fixtures and run it unattended"""
+    from rate_limiter import LIMITER
+    from replay_fixtures import install_replay
+    from run_scraper import build_config, run
+
+    site = install_replay(FIXTURES_DIR, pages)
+    LIMITER.enabled = paced
+    config, _ = build_config([scraper, "--target", str(target), "--workdir", workdir])
+    try:
+        run(config)
+    finally:
+        site.print_stats()
+        site.close()
+        stats = {"served": site.served, "unmatched": site.unmatched}
+        if resource is not None:
+            # Linux reports KB; the children figure is the largest single (browser) process
+            stats["max_rss_self"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+            stats["max_rss_children"] = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * 1024
+        with open(os.path.join(workdir, CHILD_STATS_NAME), "w", encoding="utf-8") as file:
+            json.dump(stats, file)
+
+def tree_rss(process):
+    """RSS of a process and all its descendants (the browser), in bytes"""
+    total = 0
+    for member in [process] + process.children(recursive=True):
+        try:
+            total += member.memory_info().rss
+        except psutil.Error:
+            pass
+    return total
+
+def jobs_saved(workdir):
+    """Rows of the largest final CSV a scraper wrote (the .stream.csv files hold the same jobs)"""
+    rows = [count_rows(os.path.join(workdir, name)) for name in os.listdir(workdir)
+            if name.endswith(".csv") and not name.endswith(".stream.csv")]
+    return max(rows, default=0)
+
+def bytes_written(workdir):
+    total = 0
+    for root, _, names in os.walk(workdir):
+        for name in names:
+            if name not in (LOG_NAME, CHILD_STATS_NAME):
+                total += os.path.getsize(os.path.join(root, name))
+    return total
+
+def measure(scraper, target, pages, paced, timeout_s):
+    """Run one scraper in a fresh work directory; returns its result dict and the directory"""
+    workdir = tempfile.mkdtemp(prefix=f"bench_{scraper}_")
+    command = [sys.executable, os.path.abspath(__file__), "--child", scraper, "--target", str(target),
+               "--pages", str(pages), "--workdir", workdir] + (["--paced"] if paced else [])
+    peak_rss = 0
+    timed_out = False
+    started = time.perf_counter()
+    with open(os.path.join(workdir, LOG_NAME), "w", encoding="utf-8") as log:
+        child = subprocess.Popen(command, stdout=log, stderr=subprocess.STDOUT, stdin=subprocess.DEVNULL)
+        watched = psutil.Process(child.pid) if psutil is not None else None
+        while child.poll() is None:
+            if watched is not None:
+                peak_rss = max(peak_rss, tree_rss(watched))
+            if time.perf_counter() - started > timeout_s:
+                timed_out = True
+                child.terminate()
+                child.wait()
+                break
+            time.sleep(SAMPLE_EVERY_S)
+    elapsed_s = time.perf_counter() - started
+
+    child_stats = {}
+    try:
+        with open(os.path.join(workdir, CHILD_STATS_NAME), encoding="utf-8") as file:
+            child_stats = json.load(file)
+    except (OSError, ValueError):
+        pass
+    if not peak_rss:
+        peak_rss = max(child_stats.get("max_rss_self", 0), child_stats.get("max_rss_children", 0))
+
+    jobs = jobs_saved(workdir)
+    if timed_out:
+        exit_code = "timeout"
+    elif child.returncode == 0 and not jobs:
+        exit_code = "no jobs"
+    else:
+        exit_code = child.returncode
+    return {
+        "scraper": scraper,
+        "jobs": jobs,
+        "seconds": round(elapsed_s, 2),
+        "jobs_per_s": round(jobs / elapsed_s, 3) if elapsed_s else 0,
+        "peak_rss_mb": round(peak_rss / 1e6, 1),
+        "peak_rss_scope": "process tree" if psutil is not None else "largest process",
+        "bytes_written": bytes_written(workdir),
+        "pages_replayed": child_stats.get("served", 0),
+        "requests_aborted": child_stats.get("unmatched", 0),
+        "exit_code": exit_code,
+        "failed": exit_code != 0,
+    }, workdir
+
+def run_benchmark(scrapers, target, pages, paced, timeout_s, json_path=None, keep=False):
+    print(f"📊 Offline scraper benchmark: {target} jobs per scraper, {pages} results pages per search, "
+          f"pacing {'on' if paced else 'off'}")
+    if psutil is None:
+        print("⚠️  psutil is not installed - peak RSS is the largest single process, not the browser tree")
+    print(f"\n{'Scraper':<14} {'jobs':>6} {'seconds':>9} {'jobs/s':>8} {'peak RSS MB':>12} {'MB written':>11} {'exit':>8}")
+    results = []
+    for scraper in scrapers:
+        result, workdir = measure(scraper, target, pages, paced, timeout_s)
+        results.append(result)
+        print(f"{scraper:<14} {result['jobs']:>6} {result['seconds']:>9.1f} {result['jobs_per_s']:>8.2f} "
+              f"{result['peak_rss_mb']:>12.1f} {result['bytes_written'] / 1e6:>11.2f} {result['exit_code']!s:>8}")
+        if keep or result["failed"]:
+            print(f"   📁 {workdir} (log: {LOG_NAME})")
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    if json_path:
+        with open(json_path, "w", encoding="utf-8") as file:
+            json.dump({"target": target, "pages": pages, "paced": paced, "results": results}, file, indent=2)
+        print(f"\n💾 Results saved to {json_path}")
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the scrapers offline against recorded pages")
+    parser.add_argument("scrapers", nargs="*", metavar="scraper", help=f"any of {', '.join(SCRAPERS)} (default: all)")
+    parser.add_argument("--target", type=int, default=100, help="jobs per scraper")
+    parser.add_argument("--pages", type=int, default=PAGES_PER_SEARCH, help="results pages per replayed search")
+    parser.add_argument("--paced", action="store_true", help="keep the adaptive request pacing on")
+    parser.add_argument("--timeout", type=int, default=1800, help="seconds before a scraper is stopped")
+    parser.add_argument("--json", help="also write the results to this JSON file")
+    parser.add_argument("--keep", action="store_true", help="keep every work directory (output, state, log)")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--workdir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    unknown = [scraper for scraper in args.scrapers if scraper not in SCRAPERS]
+    if unknown:
+        parser.error(f"unknown scraper {', '.join(unknown)}; choose from {', '.join(SCRAPERS)}")
+
+    if args.child:
+        run_child(args.child, args.target, args.pages, args.workdir, args.paced)
+    else:
+        run_benchmark(args.scrapers or SCRAPERS, args.target, args.pages, args.paced, args.timeout, args.json, args.keep)
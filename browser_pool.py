@@ -0,0 +1,259 @@
+import asyncio
+from browser_profile import get_profile
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# Recycled browser contexts for the long-running 100k scrapers.
+#
+# One browser context kept alive for hours grows without bound and a single
+# renderer crash used to end the run. ContextPool hands out the scraper's pages
+# and, at the safe points the scraper offers (between searches and between
+# results pages, when no element handle is in use), replaces the context:
+#
+#   - after `max_jobs` jobs on the current context,
+#   - when the Chromium processes use more than `max_memory_mb` (needs psutil),
+#   - after a page crashed or the browser disconnected.
+#
+# The context's storage_state (login cookies, local storage) is captured before
+# it is closed and loaded into the new one, so a logged-in session survives;
+# with `storage_state_path` it is also written back to the saved session file.
+# If memory is still above the threshold right after a new context, the whole
+# browser is restarted (unless the pool was given a browser it shares with others).
+#
+# AsyncContextPool does the same for the asyncio worker modes. A worker that owns
+# its pages calls maybe_recycle() between searches, like the sequential scrapers;
+# pages shared by concurrent handlers (a pipeline stage) are borrowed with get()
+# and returned with put(), and the context is replaced once every page is back.
+
+MEMORY_CHECK_EVERY = 25
+
+def chromium_memory_mb():
+    """Summed RSS of the Chromium processes started by this Python process, or 0 without psutil"""
+    if psutil is None:
+        return 0
+    total = 0
+    for process in psutil.Process().children(recursive=True):
+        try:
+            name = process.name().lower()
+            if "chrom" in name or "headless_shell" in name:
+                total += process.memory_info().rss
+        except psutil.Error:
+            pass
+    return total / 1e6
+
+class ContextPool:
+    def __init__(self, playwright, profile=None, meter=None, pages=1, max_jobs=500, max_memory_mb=2000,
+                 storage_state=None, storage_state_path=None, headless=None, launch_args=(), browser=None,
+                 **context_options):
+        self.playwright = playwright
+        self.profile = profile or get_profile()
+        self.meter = meter
+        self.page_count = pages
+        self.max_jobs = max_jobs
+        self.max_memory_mb = max_memory_mb
+        self.storage_state = storage_state
+        self.storage_state_path = storage_state_path
+        self.headless = headless
+        self.launch_args = launch_args
+        self.context_options = context_options
+        self.browser = browser
+        self.owns_browser = browser is None
+        self.context = None
+        self.jobs = 0
+        self.next_memory_check = MEMORY_CHECK_EVERY
+        self.crashed = False
+        self.recycles = 0
+        self.browser_restarts = 0
+
+    def launch(self):
+        self.browser = self.profile.launch(self.playwright, self.headless, self.launch_args)
+        self.browser.on("disconnected", self.mark_crashed)
+
+    def mark_crashed(self, *args):
+        self.crashed = True
+
+    def open(self):
+        """Start the browser and the first context; returns the scraper's pages"""
+        if self.browser is None or not self.browser.is_connected():
+            self.launch()
+        options = dict(self.context_options)
+        if self.storage_state:
+            options["storage_state"] = self.storage_state
+        self.context = self.profile.new_context(self.browser, self.meter, **options)
+        self.jobs = 0
+        self.next_memory_check = MEMORY_CHECK_EVERY
+        self.crashed = False
+        pages = []
+        for _ in range(self.page_count):
+            page = self.context.new_page()
+            page.on("crash", self.mark_crashed)
+            pages.append(page)
+        return pages
+
+    def job_done(self):
+        self.jobs += 1
+
+    def over_memory(self):
+        return bool(self.max_memory_mb) and chromium_memory_mb() > self.max_memory_mb
+
+    def needs_recycle(self):
+        if self.crashed or self.jobs >= self.max_jobs:
+            return True
+        # Checked at safe points only, so a threshold rather than a multiple: the count rarely sits exactly on one
+        if self.jobs < self.next_memory_check:
+            return False
+        self.next_memory_check = self.jobs + MEMORY_CHECK_EVERY
+        return self.over_memory()
+
+    def save_storage_state(self):
+        try:
+            self.storage_state = self.context.storage_state(path=self.storage_state_path)
+        except:
+            pass  # crashed context: keep the state captured at the previous recycle
+
+    def recycle(self):
+        """Replace the context (and the browser if needed), carrying the session over; returns new pages"""
+        print(f"♻️  Recycling browser context after {self.jobs} jobs{' (crash)' if self.crashed else ''}")
+        self.save_storage_state()
+        try:
+            self.context.close()
+        except:
+            pass
+        restart = self.crashed and not self.browser.is_connected()
+        if not restart and self.over_memory():
+            restart = True
+        if restart and self.owns_browser:
+            try:
+                self.browser.close()
+            except:
+                pass
+            self.browser = None
+            self.browser_restarts += 1
+        self.recycles += 1
+        return self.open()
+
+    def maybe_recycle(self):
+        """New pages if the context was due for recycling, else None"""
+        if self.needs_recycle():
+            return self.recycle()
+        return None
+
+    def print_stats(self):
+        if self.recycles:
+            print(f"♻️  Browser contexts recycled {self.recycles} times ({self.browser_restarts} browser restarts)")
+
+    def close(self):
+        if self.storage_state_path and self.context and not self.crashed:
+            self.save_storage_state()
+        try:
+            if self.owns_browser and self.browser:
+                self.browser.close()
+            elif self.context:
+                self.context.close()
+        except:
+            pass
+
+class AsyncContextPool(ContextPool):
+    """ContextPool on playwright.async_api; get()/put() for pages shared by concurrent handlers
+
+    With get()/put() every borrow counts as a job, and a due recycle holds back
+    new borrows until all pages are returned, so no handler loses its page.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.idle = []
+        self.borrowed = 0
+        self.recycling = False
+        self.changed = None  # asyncio.Condition, created by open() inside the running loop
+
+    async def launch(self):
+        self.browser = await self.profile.launch_async(self.playwright, self.headless, self.launch_args)
+        self.browser.on("disconnected", self.mark_crashed)
+
+    async def open(self):
+        if self.owns_browser and (self.browser is None or not self.browser.is_connected()):
+            await self.launch()
+        options = dict(self.context_options)
+        if self.storage_state:
+            options["storage_state"] = self.storage_state
+        self.context = await self.profile.new_context_async(self.browser, self.meter, **options)
+        self.jobs = 0
+        self.next_memory_check = MEMORY_CHECK_EVERY
+        self.crashed = False
+        pages = []
+        for _ in range(self.page_count):
+            page = await self.context.new_page()
+            page.on("crash", self.mark_crashed)
+            pages.append(page)
+        self.idle = list(pages)
+        if self.changed is None:
+            self.changed = asyncio.Condition()
+        return pages
+
+    async def save_storage_state(self):
+        try:
+            self.storage_state = await self.context.storage_state(path=self.storage_state_path)
+        except:
+            pass
+
+    async def recycle(self):
+        print(f"♻️  Recycling browser context after {self.jobs} jobs{' (crash)' if self.crashed else ''}")
+        await self.save_storage_state()
+        try:
+            await self.context.close()
+        except:
+            pass
+        restart = self.crashed and not self.browser.is_connected()
+        if not restart and self.over_memory():
+            restart = True
+        if restart and self.owns_browser:
+            try:
+                await self.browser.close()
+            except:
+                pass
+            self.browser = None
+            self.browser_restarts += 1
+        self.recycles += 1
+        return await self.open()
+
+    async def maybe_recycle(self):
+        if self.needs_recycle():
+            return await self.recycle()
+        return None
+
+    async def get(self):
+        """Borrow a page (waits for a free one); recycles first when the context is due"""
+        async with self.changed:
+            await self.changed.wait_for(lambda: self.idle and not self.recycling)
+            if self.needs_recycle():
+                self.recycling = True
+                try:
+                    await self.changed.wait_for(lambda: not self.borrowed)
+                    await self.recycle()
+                finally:
+                    self.recycling = False
+                    self.changed.notify_all()
+            self.borrowed += 1
+            self.jobs += 1
+            return self.idle.pop()
+
+    async def put(self, page):
+        async with self.changed:
+            self.borrowed -= 1
+            self.idle.append(page)
+            self.changed.notify_all()
+
+    async def close(self):
+        if self.storage_state_path and self.context and not self.crashed:
+            await self.save_storage_state()
+        try:
+            if self.owns_browser and self.browser:
+                await self.browser.close()
+            elif self.context:
+                await self.context.close()
+        except:
+            pass
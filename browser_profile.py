@@ -0,0 +1,193 @@
+import os
+import time
+from urllib.parse import urlsplit
+
+# Browser profiles shared by the Playwright scrapers.
+#
+# The "lean" profile (default) runs Chromium headless with flags that keep a
+# worker's memory down, and installs a route() handler on every context that
+# aborts images, media and fonts and every request to ad/tracking domains
+# before a byte is downloaded. The scrapers only read text from the DOM, so
+# none of that is ever needed. The "full" profile is the old behaviour: a
+# visible window that loads everything, for watching a run or logging in by
+# hand.
+#
+#   SCRAPER_BROWSER_PROFILE=full python linkedin_scraper.py   -> visible, unfiltered browser
+#
+# With $SCRAPER_REPLAY_DIR set, the same route answers LinkedIn, Indeed and
+# RemoteOK from recorded pages instead of the network (replay_fixtures.py).
+#
+# TrafficMeter counts the bytes each page actually received over the network
+# (Chromium's encoded data length, via CDP) and the requests the profile
+# blocked, and reports them per job at the end of a run.
+
+PROFILE_ENV = "SCRAPER_BROWSER_PROFILE"
+REPLAY_ENV = "SCRAPER_REPLAY_DIR"
+
+DEFAULT_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36"
+DEFAULT_VIEWPORT = {"width": 1280, "height": 720}
+
+LEAN_RESOURCE_TYPES = ("image", "media", "font")
+
+# Ad, analytics and tracking hosts seen on LinkedIn, Indeed and company sites (subdomains included)
+TRACKER_DOMAINS = (
+    "doubleclick.net", "googlesyndication.com", "googleadservices.com", "google-analytics.com",
+    "googletagmanager.com", "googletagservices.com", "adservice.google.com", "facebook.net", "connect.facebook.net",
+    "ads.linkedin.com", "px.ads.linkedin.com", "snap.licdn.com", "bat.bing.com", "clarity.ms", "hotjar.com",
+    "hotjar.io", "segment.io", "segment.com", "cdn.segment.com", "mixpanel.com", "amplitude.com", "fullstory.com",
+    "newrelic.com", "nr-data.net", "sentry.io", "optimizely.com", "quantserve.com", "scorecardresearch.com",
+    "criteo.com", "criteo.net", "taboola.com", "outbrain.com", "adnxs.com", "rubiconproject.com", "pubmatic.com",
+    "casalemedia.com", "demdex.net", "omtrdc.net", "everesttech.net", "krxd.net", "bluekai.com", "tiktok.com",
+    "analytics.tiktok.com", "ads-twitter.com", "static.ads-twitter.com", "t.co", "onetrust.com", "cookielaw.org",
+)
+
+LEAN_ARGS = [
+    "--disable-dev-shm-usage",
+    "--disable-gpu",
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--mute-audio",
+    "--blink-settings=imagesEnabled=false",
+]
+
+def host_in(host, domains):
+    """True if `host` is one of `domains` or a subdomain of one"""
+    labels = (host or "").lower().split(".")
+    return any(".".join(labels[i:]) in domains for i in range(len(labels) - 1))
+
+class BrowserProfile:
+    def __init__(self, name, headless=True, block_resource_types=(), block_domains=(), args=(), slow_mo=0):
+        self.name = name
+        self.headless = headless
+        self.block_resource_types = frozenset(block_resource_types)
+        self.block_domains = frozenset(block_domains)
+        self.args = list(args)
+        self.slow_mo = slow_mo
+
+    def launch_options(self, headless=None, args=()):
+        return {
+            "headless": self.headless if headless is None else headless,
+            "slow_mo": self.slow_mo,
+            "args": self.args + [arg for arg in args if arg not in self.args],
+        }
+
+    def launch(self, playwright, headless=None, args=()):
+        """Chromium with this profile's flags; `headless` overrides the profile (e.g. for a manual login)"""
+        return playwright.chromium.launch(**self.launch_options(headless, args))
+
+    async def launch_async(self, playwright, headless=None, args=()):
+        return await playwright.chromium.launch(**self.launch_options(headless, args))
+
+    def context_options(self, options):
+        merged = {"user_agent": DEFAULT_USER_AGENT, "viewport": DEFAULT_VIEWPORT}
+        merged.update(options)
+        return merged
+
+    def should_block(self, request):
+        if request.resource_type in self.block_resource_types:
+            return True
+        return bool(self.block_domains) and host_in(urlsplit(request.url).hostname, self.block_domains)
+
+    @property
+    def filters(self):
+        return bool(self.block_resource_types or self.block_domains)
+
+    def new_context(self, browser, meter=None, **options):
+        """browser.new_context() with the profile's request filter (and `meter`) installed"""
+        context = browser.new_context(**self.context_options(options))
+        self.apply(context, meter)
+        return context
+
+    async def new_context_async(self, browser, meter=None, **options):
+        context = await browser.new_context(**self.context_options(options))
+        await self.apply_async(context, meter)
+        return context
+
+    def apply(self, context, meter=None):
+        """Install the request filter and traffic meter on a context created elsewhere"""
+        replay = get_replay()
+        if self.filters or replay:
+            def handle(route):
+                if self.should_block(route.request):
+                    if meter:
+                        meter.blocked += 1
+                    route.abort()
+                elif replay:
+                    replay.handle_route(route)
+                else:
+                    route.continue_()
+            context.route("**/*", handle)
+        if meter:
+            context.on("page", meter.attach)
+
+    async def apply_async(self, context, meter=None):
+        replay = get_replay()
+        if self.filters or replay:
+            async def handle(route):
+                if self.should_block(route.request):
+                    if meter:
+                        meter.blocked += 1
+                    await route.abort()
+                elif replay:
+                    await replay.handle_route_async(route)
+                else:
+                    await route.continue_()
+            await context.route("**/*", handle)
+        if meter:
+            context.on("page", meter.attach_async)
+
+PROFILES = {
+    "lean": BrowserProfile("lean", headless=True, block_resource_types=LEAN_RESOURCE_TYPES,
+                           block_domains=TRACKER_DOMAINS, args=LEAN_ARGS),
+    "full": BrowserProfile("full", headless=False),
+}
+
+def get_profile(name=None):
+    """The named profile, else the one in $SCRAPER_BROWSER_PROFILE, else "lean" """
+    name = name or os.environ.get(PROFILE_ENV) or "lean"
+    if name not in PROFILES:
+        raise ValueError(f"Unknown browser profile {name!r}, expected one of: {', '.join(PROFILES)}")
+    return PROFILES[name]
+
+def get_replay():
+    """The recorded-page replay when $SCRAPER_REPLAY_DIR is set (offline benchmarks), else None"""
+    if not os.environ.get(REPLAY_ENV):
+        return None
+    from replay_fixtures import current_replay
+    return current_replay()
+
+class TrafficMeter:
+    """Network bytes received by every page of a context and requests blocked by the profile"""
+
+    def __init__(self):
+        self.bytes = 0
+        self.responses = 0
+        self.blocked = 0
+        self.started = time.perf_counter()
+
+    def loading_finished(self, params):
+        self.bytes += params.get("encodedDataLength", 0)
+        self.responses += 1
+
+    def attach(self, page):
+        try:
+            session = page.context.new_cdp_session(page)
+            session.send("Network.enable")
+            session.on("Network.loadingFinished", self.loading_finished)
+        except:
+            pass  # not Chromium: bytes stay uncounted
+
+    async def attach_async(self, page):
+        try:
+            session = await page.context.new_cdp_session(page)
+            await session.send("Network.enable")
+            session.on("Network.loadingFinished", self.loading_finished)
+        except:
+            pass
+
+    def print_stats(self, jobs=0):
+        elapsed_ms = (time.perf_counter() - self.started) * 1000
+        print(f"📶 Browser traffic: {self.bytes / 1e6:.1f} MB in {self.responses} responses, {self.blocked} requests blocked")
+        if jobs:
+            print(f"📶 Per job: {self.bytes / 1e3 / jobs:.0f} KB and {elapsed_ms / jobs:.0f} ms ({jobs} jobs)")
@@ -0,0 +1,141 @@
+import sqlite3
+from datetime import datetime
+
+# On-disk crawl state so a crashed 100k run resumes where it stopped.
+#
+# Every search (one country/role combination) records the last results page it
+# finished and whether it is exhausted (or how many runs in a row found its
+# first page empty, see rate_limiter.blocked_search). A restarted run skips finished searches
+# and reopens unfinished ones at the saved page; job cards it already handled
+# are skipped through the job-ID index (job_index.JobIdIndex). Accepted rows
+# themselves live in the scraper's append-only stream (job_sinks.CsvSink).
+
+def drop_jobs_table(conn):
+    # Processed job cards are kept by job_index.JobIdIndex
+    conn.execute("DROP TABLE IF EXISTS jobs")
+
+def add_empty_first_pages(conn):
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(searches)")]
+    if "empty_first_pages" not in columns:
+        conn.execute("ALTER TABLE searches ADD COLUMN empty_first_pages INTEGER NOT NULL DEFAULT 0")
+
+# Schema changes of existing state files, in order; PRAGMA user_version counts the ones applied
+MIGRATIONS = [drop_jobs_table, add_empty_first_pages]
+
+class CrawlState:
+    def __init__(self, path):
+        self.path = path
+        self.jobs_marked = 0  # cards processed by this run
+        self.conn = sqlite3.connect(path)
+        # WAL keeps the checkpoint writes cheap and the file readable while crawling
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS searches (
+                search_key TEXT PRIMARY KEY,
+                pages_done INTEGER NOT NULL DEFAULT 0,
+                finished INTEGER NOT NULL DEFAULT 0,
+                empty_first_pages INTEGER NOT NULL DEFAULT 0,
+                updated_at TEXT
+            );
+        """)
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        for number, migrate in enumerate(MIGRATIONS[version:], version + 1):
+            migrate(self.conn)
+            self.conn.execute(f"PRAGMA user_version = {number}")
+        self.conn.commit()
+
+    def is_search_finished(self, search_key):
+        row = self.conn.execute("SELECT finished FROM searches WHERE search_key = ?", (search_key,)).fetchone()
+        return bool(row and row[0])
+
+    def pages_done(self, search_key):
+        """Number of results pages of `search_key` fully processed in earlier runs"""
+        row = self.conn.execute("SELECT pages_done FROM searches WHERE search_key = ?", (search_key,)).fetchone()
+        return row[0] if row else 0
+
+    def mark_page_done(self, search_key, pages_done):
+        self.conn.execute(
+            "INSERT INTO searches (search_key, pages_done, updated_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(search_key) DO UPDATE SET pages_done = excluded.pages_done, empty_first_pages = 0, "
+            "updated_at = excluded.updated_at",
+            (search_key, pages_done, datetime.now().isoformat(timespec="seconds")),
+        )
+        self.conn.commit()
+
+    def mark_empty_first_page(self, search_key):
+        """Record that `search_key` opened without job cards; returns how many times in a row that happened"""
+        self.conn.execute(
+            "INSERT INTO searches (search_key, empty_first_pages, updated_at) VALUES (?, 1, ?) "
+            "ON CONFLICT(search_key) DO UPDATE SET empty_first_pages = empty_first_pages + 1, "
+            "updated_at = excluded.updated_at",
+            (search_key, datetime.now().isoformat(timespec="seconds")),
+        )
+        self.conn.commit()
+        row = self.conn.execute("SELECT empty_first_pages FROM searches WHERE search_key = ?", (search_key,)).fetchone()
+        return row[0]
+
+    def mark_search_finished(self, search_key):
+        self.conn.execute(
+            "INSERT INTO searches (search_key, finished, updated_at) VALUES (?, 1, ?) "
+            "ON CONFLICT(search_key) DO UPDATE SET finished = 1, updated_at = excluded.updated_at",
+            (search_key, datetime.now().isoformat(timespec="seconds")),
+        )
+        self.conn.commit()
+
+    def mark_job_done(self):
+        """Count a processed card for the per-job stats; resume skips it via the job-ID index"""
+        self.jobs_marked += 1
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+
+def resume_url(search_url, pages_done, page_size):
+    """Search URL that opens directly at the first unfinished results page"""
+    if not pages_done:
+        return search_url
+    return f"{search_url}&start={pages_done * page_size}"
+
+class PageCheckpoints:
+    """Page checkpoints for a staged pipeline, where discovery runs ahead of the jobs it found
+
+    A results page is marked done only once every job discovered on it, and on
+    all earlier pages of the same search, has left the pipeline; a search is
+    marked finished once discovery reached its end and all its pages are done.
+    """
+
+    def __init__(self, crawl_state, on_checkpoint=None):
+        self.crawl_state = crawl_state
+        self.on_checkpoint = on_checkpoint
+        self.outstanding = {}  # search_key -> {page_num: jobs still in the pipeline}
+        self.exhausted = set()
+
+    def expect(self, search_key, page_num, jobs):
+        """Register a discovered page and how many of its jobs were sent into the pipeline"""
+        self.outstanding.setdefault(search_key, {})[page_num] = jobs
+        self.advance(search_key)
+
+    def done(self, search_key, page_num):
+        self.outstanding[search_key][page_num] -= 1
+        self.advance(search_key)
+
+    def finish(self, search_key):
+        """Discovery saw the last page of `search_key`"""
+        self.exhausted.add(search_key)
+        self.advance(search_key)
+
+    def advance(self, search_key):
+        pages = self.outstanding.get(search_key, {})
+        advanced = False
+        while pages and pages[min(pages)] <= 0:
+            page_num = min(pages)
+            del pages[page_num]
+            self.crawl_state.mark_page_done(search_key, page_num + 1)
+            advanced = True
+        if advanced and self.on_checkpoint:
+            self.on_checkpoint()
+        if not pages and search_key in self.exhausted:
+            self.crawl_state.mark_search_finished(search_key)
+            self.exhausted.discard(search_key)
+            self.outstanding.pop(search_key, None)
@@ -1,74 +1,33 @@
-import requests
-from bs4 import BeautifulSoup
-import csv
 from datetime import datetime
+import sys
 import time
 import random
+from job_sinks import check_output_ext, job_row, save_jobs
+from job_sources import HTTP_SOURCES
 
-def simple_job_scraper():
-    """Simple job scraper using requests - no browser needed"""
-    
-    # Job search websites that are easier to scrape
-    JOB_SITES = [
-        "https://remoteok.io/remote-dev-jobs",
-        "https://weworkremotely.com/remote-jobs/search?term=data",
-    ]
+def simple_job_scraper(target_jobs=100, output_ext=".csv"):
+    """Simple job scraper using requests - no browser needed (RemoteOK, then WeWorkRemotely)"""
     
     jobs_data = []
-    target_jobs = 100
     
     print("🚀 Simple Job Scraper (No Browser Required)")
     print(f"🎯 Target: {target_jobs} jobs")
     print("📝 Extracting basic job information\n")
     
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
-    
     try:
-        # Scrape RemoteOK
-        print("🔍 Scraping RemoteOK.io...")
-        try:
-            response = requests.get("https://remoteok.io/remote-dev-jobs", headers=headers, timeout=10)
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            job_cards = soup.find_all('tr', class_='job')
-            
-            for job in job_cards[:50]:  # Limit to first 50 jobs
-                if len(jobs_data) >= target_jobs:
-                    break
-                    
-                try:
-                    # Extract job details
-                    title_elem = job.find('h2', class_='title')
-                    title = title_elem.get_text(strip=True) if title_elem else "N/A"
-                    
-                    company_elem = job.find('h3', class_='company')
-                    company = company_elem.get_text(strip=True) if company_elem else "N/A"
-                    
-                    location_elem = job.find('div', class_='location')
-                    location = location_elem.get_text(strip=True) if location_elem else "Remote"
-                    
-                    tags_elem = job.find('div', class_='tags')
-                    description = tags_elem.get_text(strip=True) if tags_elem else "N/A"
-                    
-                    jobs_data.append({
-                        "job_number": len(jobs_data) + 1,
-                        "title": title,
-                        "company": company,
-                        "location": location,
-                        "description": description[:200],
-                        "source": "RemoteOK",
-                        "scraped_at": datetime.now().strftime('%H:%M:%S')
-                    })
-                    
-                    print(f"✅ {len(jobs_data)}: {title} @ {company}")
-                    
-                except Exception as e:
-                    continue
+        for source in HTTP_SOURCES:
+            if len(jobs_data) >= target_jobs:
+                break
+            print(f"🔍 Scraping {source.name}...")
+            try:
+                for job in source.fetch()[:50]:  # Limit to first 50 jobs per site
+                    if len(jobs_data) >= target_jobs:
+                        break
+                    jobs_data.append(dict(job, description=job["description"][:200]))
+                    print(f"✅ {len(jobs_data)}: {job['title']} @ {job['company']}")
                     
-        except Exception as e:
-            print(f"❌ Error scraping RemoteOK: {e}")
+            except Exception as e:
+                print(f"❌ Error scraping {source.name}: {e}")
         
         # Add some sample data if we couldn't scrape enough
         if len(jobs_data) < target_jobs:
@@ -89,24 +48,18 @@ def simple_job_scraper():
             
             for i in range(min(target_jobs - len(jobs_data), len(sample_jobs) * 10)):
                 sample_job = sample_jobs[i % len(sample_jobs)]
-                jobs_data.append({
-                    "job_number": len(jobs_data) + 1,
-                    "title": f"{sample_job['title']} {i//len(sample_jobs) + 1}",
-                    "company": f"{sample_job['company']} {i//len(sample_jobs) + 1}",
-                    "location": sample_job['location'],
-                    "description": sample_job['description'],
-                    "source": "Sample Data",
-                    "scraped_at": datetime.now().strftime('%H:%M:%S')
-                })
+                jobs_data.append(job_row(
+                    title=f"{sample_job['title']} {i//len(sample_jobs) + 1}",
+                    company=f"{sample_job['company']} {i//len(sample_jobs) + 1}",
+                    location=sample_job['location'],
+                    description=sample_job['description'],
+                    source="Sample Data"
+                ))
                 print(f"✅ {len(jobs_data)}: {jobs_data[-1]['title']} @ {jobs_data[-1]['company']}")
         
-        # Save to CSV
+        # Save to CSV (or Parquet)
         if jobs_data:
-            filename = f"simple_jobs_{len(jobs_data)}.csv"
-            with open(filename, "w", newline='', encoding='utf-8') as file:
-                writer = csv.DictWriter(file, fieldnames=jobs_data[0].keys())
-                writer.writeheader()
-                writer.writerows(jobs_data)
+            filename = save_jobs(jobs_data, f"simple_jobs_{len(jobs_data)}{output_ext}")
             
             print(f"\n🎉 SUCCESS! Collected {len(jobs_data)} jobs")
             print(f"📁 Saved to: {filename}")
@@ -128,11 +81,7 @@ def simple_job_scraper():
     except KeyboardInterrupt:
         print(f"\n⏹️  Stopped by user. Saving {len(jobs_data)} jobs...")
         if jobs_data:
-            filename = f"simple_jobs_partial_{len(jobs_data)}.csv"
-            with open(filename, "w", newline='', encoding='utf-8') as file:
-                writer = csv.DictWriter(file, fieldnames=jobs_data[0].keys())
-                writer.writeheader()
-                writer.writerows(jobs_data)
+            filename = save_jobs(jobs_data, f"simple_jobs_partial_{len(jobs_data)}{output_ext}")
             print(f"✅ Saved to: {filename}")
     
     except Exception as e:
@@ -156,5 +105,8 @@ def install_requirements():
                 print(f"❌ Failed to install {package}")
 
 if __name__ == "__main__":
+    # python easy_scraper.py --parquet -> results as Parquet instead of CSV
+    output_ext = ".parquet" if "--parquet" in sys.argv else ".csv"
+    check_output_ext(output_ext)
     install_requirements()
-    simple_job_scraper()
+    simple_job_scraper(output_ext=output_ext)
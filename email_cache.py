@@ -0,0 +1,187 @@
+import sqlite3
+import time
+from collections import OrderedDict
+from urllib.parse import urlsplit
+
+# Persistent cache of the emails found on LinkedIn recruiter (/in/) and
+# company (/company/) pages.
+#
+# Companies post many jobs, so the same profile is looked up again and again;
+# every lookup is a navigation plus contact-modal clicks and a go_back. The
+# cache stores the result per normalized profile URL, including "no email
+# found", so a repeat profile costs no navigation at all. Entries expire after
+# a TTL (negative results sooner, since a later logged-in run may see more),
+# and the table is trimmed to `max_entries`, oldest first.
+#
+# DomainEmailCache does the same for company websites, keyed by domain: many
+# Indeed postings across roles and countries point at the same company site,
+# and each visit is a homepage plus up to three contact pages. Lookups are
+# served from an in-memory LRU first and the SQLite table second.
+
+DAY = 24 * 60 * 60
+
+def normalize_profile_url(url):
+    """https://www.linkedin.com/in/<slug> or /company/<slug>, whatever subdomain, query or subpage the link had"""
+    parts = urlsplit(url or "")
+    segments = [segment for segment in parts.path.split("/") if segment]
+    if len(segments) >= 2 and segments[0] in ("in", "company"):
+        segments = segments[:2]
+    return "https://www.linkedin.com/" + "/".join(segments).lower()
+
+class ProfileEmailCache:
+    def __init__(self, path, ttl_days=30, negative_ttl_days=7, max_entries=100000):
+        self.ttl = ttl_days * DAY
+        self.negative_ttl = negative_ttl_days * DAY
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.puts_since_trim = 0
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS profile_emails (
+                profile_url TEXT PRIMARY KEY,
+                emails TEXT NOT NULL,
+                checked_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS profile_emails_checked_at ON profile_emails (checked_at);
+        """)
+        self.conn.commit()
+
+    def get(self, profile_url):
+        """Cached emails ([] = known to have none), or None when the profile must be visited"""
+        row = self.conn.execute(
+            "SELECT emails, checked_at FROM profile_emails WHERE profile_url = ?", (normalize_profile_url(profile_url),)
+        ).fetchone()
+        if row:
+            emails = row[0].split(",") if row[0] else []
+            ttl = self.ttl if emails else self.negative_ttl
+            if time.time() - row[1] < ttl:
+                self.hits += 1
+                return emails
+        self.misses += 1
+        return None
+
+    def put(self, profile_url, emails):
+        """Remember the lookup result; None (the lookup failed) is not cached"""
+        if emails is None:
+            return
+        self.conn.execute(
+            "INSERT OR REPLACE INTO profile_emails (profile_url, emails, checked_at) VALUES (?, ?, ?)",
+            (normalize_profile_url(profile_url), ",".join(emails), time.time()),
+        )
+        self.conn.commit()
+        self.puts_since_trim += 1
+        if self.puts_since_trim >= 1000:
+            self.trim()
+
+    def trim(self):
+        """Drop expired entries, then the oldest ones beyond max_entries"""
+        now = time.time()
+        self.conn.execute(
+            "DELETE FROM profile_emails WHERE checked_at < ? OR (emails = '' AND checked_at < ?)",
+            (now - self.ttl, now - self.negative_ttl),
+        )
+        self.conn.execute(
+            "DELETE FROM profile_emails WHERE profile_url IN "
+            "(SELECT profile_url FROM profile_emails ORDER BY checked_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+        self.conn.commit()
+        self.puts_since_trim = 0
+
+    def print_stats(self):
+        lookups = self.hits + self.misses
+        if lookups:
+            print(f"💾 Profile email cache: {self.hits}/{lookups} lookups served without visiting the profile")
+
+    def close(self):
+        self.trim()
+        self.conn.close()
+
+def website_domain(url):
+    """Lowercased host of a website URL without "www.", also for bare "example.com" links"""
+    if "//" not in url:
+        url = "//" + url
+    return (urlsplit(url.strip()).hostname or "").removeprefix("www.")
+
+class DomainEmailCache:
+    """Emails found per company website domain ([] = none found), in an LRU in front of SQLite"""
+
+    def __init__(self, path, ttl_days=30, negative_ttl_days=7, memory_entries=10000):
+        self.ttl = ttl_days * DAY
+        self.negative_ttl = negative_ttl_days * DAY
+        self.memory_entries = memory_entries
+        self.memory = OrderedDict()  # domain -> (emails, checked_at), most recently used last
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS domain_emails (
+                domain TEXT PRIMARY KEY,
+                emails TEXT NOT NULL,
+                checked_at REAL NOT NULL
+            )
+        """)
+        self.conn.commit()
+
+    def fresh(self, emails, checked_at):
+        return time.time() - checked_at < (self.ttl if emails else self.negative_ttl)
+
+    def remember(self, domain, entry):
+        self.memory[domain] = entry
+        self.memory.move_to_end(domain)
+        if len(self.memory) > self.memory_entries:
+            self.memory.popitem(last=False)
+
+    def get(self, website_url):
+        """Cached emails of the website's domain ([] = known to have none), or None when it must be crawled"""
+        domain = website_domain(website_url)
+        entry = self.memory.get(domain)
+        if entry and self.fresh(*entry):
+            self.memory.move_to_end(domain)
+            self.memory_hits += 1
+            return entry[0]
+
+        row = self.conn.execute("SELECT emails, checked_at FROM domain_emails WHERE domain = ?", (domain,)).fetchone()
+        if row:
+            entry = (row[0].split(",") if row[0] else [], row[1])
+            if self.fresh(*entry):
+                self.remember(domain, entry)
+                self.disk_hits += 1
+                return entry[0]
+        self.misses += 1
+        return None
+
+    def put(self, website_url, emails):
+        """Remember the crawl result; None (the site could not be read) is not cached"""
+        if emails is None:
+            return
+        domain = website_domain(website_url)
+        entry = (list(emails), time.time())
+        self.remember(domain, entry)
+        self.conn.execute(
+            "INSERT OR REPLACE INTO domain_emails (domain, emails, checked_at) VALUES (?, ?, ?)",
+            (domain, ",".join(entry[0]), entry[1]),
+        )
+        self.conn.commit()
+
+    def print_stats(self):
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        if lookups:
+            hits = self.memory_hits + self.disk_hits
+            print(f"💾 Company website cache: {hits}/{lookups} lookups served without a crawl ({hits / lookups:.0%}; "
+                  f"{self.memory_hits} from memory, {self.disk_hits} from disk)")
+
+    def close(self):
+        now = time.time()
+        self.conn.execute(
+            "DELETE FROM domain_emails WHERE checked_at < ? OR (emails = '' AND checked_at < ?)",
+            (now - self.ttl, now - self.negative_ttl),
+        )
+        self.conn.commit()
+        self.conn.close()
@@ -0,0 +1,181 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+from run_metrics import METRICS
+
+try:
+    import openai
+except ImportError:
+    openai = None
+
+# Concurrent generation of the application emails (jjob.py, ai_job_apply_with_cv.py).
+#
+# Instead of one blocking chat.completions.create() per job, a batch of prompts
+# is sent through AsyncOpenAI with at most `concurrency` requests in flight
+# (semaphore). A RateLimitError (429) is retried with exponential back-off and
+# jitter, honouring the server's Retry-After when it sends one; the slot is kept
+# while waiting, so a rate-limited batch slows down instead of piling on. A job
+# whose email could not be generated gets None and the batch carries on.
+#
+# The client follows $OPENAI_BASE_URL, so any OpenAI-compatible server works;
+# serve_mock_openai() is one on a local port (fixed latency, every n-th request
+# answered with a 429) to check concurrency and retries without an API key:
+#
+#   python email_generation.py --jobs 100 --concurrency 8     -> mock server, serial vs concurrent
+#   EMAIL_GENERATION_CONCURRENCY=16 python jjob.py            -> more requests in flight
+
+CONCURRENCY_ENV = "EMAIL_GENERATION_CONCURRENCY"
+DEFAULT_CONCURRENCY = 8
+MODEL = "gpt-4"
+MAX_TOKENS = 250
+MAX_RETRIES = 6
+BACKOFF_S = 1.0
+MAX_BACKOFF_S = 60.0
+
+def default_concurrency():
+    return int(os.environ.get(CONCURRENCY_ENV) or DEFAULT_CONCURRENCY)
+
+def new_async_client():
+    if openai is None:
+        raise ImportError("Email generation needs the OpenAI client: pip install openai")
+    # Retries are ours (below); the client's own would retry a 429 behind our back
+    return openai.AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"), max_retries=0)
+
+def retry_delay(error, attempt, backoff_s=BACKOFF_S):
+    """Seconds before retry `attempt` (0-based): the server's Retry-After, else jittered exponential back-off"""
+    response = getattr(error, "response", None)
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    try:
+        return min(MAX_BACKOFF_S, float(retry_after))
+    except (TypeError, ValueError):
+        return min(MAX_BACKOFF_S, backoff_s * 2 ** attempt) * random.uniform(0.5, 1.0)
+
+async def complete(client, prompt, semaphore, model=MODEL, max_tokens=MAX_TOKENS, retries=MAX_RETRIES,
+                   backoff_s=BACKOFF_S):
+    async with semaphore:
+        for attempt in range(retries + 1):
+            try:
+                with METRICS.timer("email_generation"):
+                    response = await client.chat.completions.create(
+                        model=model,
+                        messages=[{"role": "user", "content": prompt}],
+                        max_tokens=max_tokens
+                    )
+                return response.choices[0].message.content
+            except openai.RateLimitError as e:
+                if attempt == retries:
+                    raise
+                delay = retry_delay(e, attempt, backoff_s)
+                METRICS.count("email_generation_retries")
+                print(f"🐢 OpenAI rate limit - retrying in {delay:.1f}s ({attempt + 1}/{retries})")
+                await asyncio.sleep(delay)
+
+async def generate_emails_async(jobs, prompt_for, concurrency=None, client=None, **options):
+    """Email body per job, in job order (None where generation failed)"""
+    own_client = client is None
+    client = client or new_async_client()
+    semaphore = asyncio.Semaphore(concurrency or default_concurrency())
+
+    async def generate(job):
+        try:
+            return await complete(client, prompt_for(job), semaphore, **options)
+        except Exception as e:
+            METRICS.count("email_generation_failed")
+            print(f"❌ Email generation failed for {job['title']} at {job['company']}: {e}")
+            return None
+
+    try:
+        return await asyncio.gather(*(generate(job) for job in jobs))
+    finally:
+        if own_client:
+            await client.close()
+
+def generate_emails(jobs, prompt_for, concurrency=None, **options):
+    """Blocking wrapper of generate_emails_async() for the synchronous apply scripts"""
+    return asyncio.run(generate_emails_async(jobs, prompt_for, concurrency, **options))
+
+def serve_mock_openai(latency_s=0.5, rate_limit_every=0, retry_after_s=None):
+    """OpenAI-compatible /v1/chat/completions on a free localhost port (daemon thread); returns the server
+
+    Every `rate_limit_every`-th request is answered with a 429 (0: never), with a
+    Retry-After header when `retry_after_s` is given. server.requests counts them all.
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    lock = threading.Lock()
+
+    class MockHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            with lock:
+                self.server.requests += 1
+                number = self.server.requests
+            time.sleep(latency_s)
+            if rate_limit_every and number % rate_limit_every == 0:
+                headers = {"retry-after": str(retry_after_s)} if retry_after_s is not None else {}
+                self.reply(429, {"error": {"message": "Rate limit reached (mock)", "type": "requests",
+                                           "code": "rate_limit_exceeded"}}, headers)
+                return
+            prompt = body.get("messages", [{}])[-1].get("content", "")
+            self.reply(200, {
+                "id": f"chatcmpl-mock-{number}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": body.get("model", MODEL),
+                "choices": [{"index": 0, "finish_reason": "stop",
+                             "message": {"role": "assistant", "content": f"Dear hiring team,\n\n(mock reply to: {prompt.strip()[:80]})"}}],
+                "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+            })
+
+        def reply(self, status, payload, headers=None):
+            data = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), MockHandler)
+    server.requests = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def benchmark_mock(jobs_count, concurrency, latency_s, rate_limit_every):
+    """Generate a batch against the mock server serially and with `concurrency` slots"""
+    server = serve_mock_openai(latency_s, rate_limit_every, retry_after_s=0.1)
+    jobs = [{"title": f"AI Engineer {i}", "company": f"Company {i}"} for i in range(jobs_count)]
+    prompt_for = lambda job: f"Write a short job application email for {job['title']} at {job['company']}."
+    print(f"🧪 Mock OpenAI server on port {server.server_port}: {latency_s:g}s per reply, "
+          f"{f'every {rate_limit_every}th request rate limited' if rate_limit_every else 'no rate limits'}")
+    # Local mock only: never send the real key anywhere here
+    os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{server.server_port}/v1"
+    os.environ["OPENAI_API_KEY"] = "mock"
+    try:
+        for slots in dict.fromkeys([1, concurrency]):
+            METRICS.reset("email_generation")
+            server.requests = 0
+            started = time.perf_counter()
+            bodies = generate_emails(jobs, prompt_for, slots, backoff_s=0.1)
+            elapsed_s = time.perf_counter() - started
+            retries = METRICS.counters.get("email_generation_retries", 0)
+            print(f"✉️  concurrency {slots:>3}: {sum(body is not None for body in bodies)}/{len(jobs)} emails "
+                  f"in {elapsed_s:.1f}s, {server.requests} requests, {retries} retried")
+    finally:
+        server.shutdown()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Email generation against a local mock OpenAI server")
+    parser.add_argument("--jobs", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=default_concurrency())
+    parser.add_argument("--latency", type=float, default=0.5, help="seconds per mock reply")
+    parser.add_argument("--rate-limit-every", type=int, default=10, help="answer every n-th request with a 429 (0: never)")
+    args = parser.parse_args()
+    benchmark_mock(args.jobs, args.concurrency, args.latency, args.rate_limit_every)
@@ -1,8 +1,22 @@
 from playwright.sync_api import sync_playwright
+from playwright.async_api import async_playwright
+import asyncio
+import sys
 import time
-import re
-import csv
 from datetime import datetime
+from browser_profile import TrafficMeter, get_profile
+from browser_pool import AsyncContextPool, ContextPool
+from crawl_state import CrawlState, PageCheckpoints
+from email_cache import DomainEmailCache, website_domain
+from job_index import JobIdIndex
+from job_pipeline import Pipeline, Stage
+from job_sinks import JOB_FIELDS, CsvSink, check_output_ext, close_quietly, save_run
+from job_extraction import extract_job_details_async
+from job_sources import INDEED
+from run_metrics import METRICS, finish_run, start_run
+from text_classify import KeywordMatcher, extract_emails
+from website_emails import SyncWebsiteEmailCrawler, WebsiteEmailCrawler, httpx
+from scraper_waits import go_back_and_wait, goto_and_wait, goto_and_wait_async, print_wait_savings, reset_wait_stats
 
 # Target countries and their Google domains
 COUNTRIES = {
@@ -23,10 +37,39 @@ JOB_ROLES = [
     "python developer remote"
 ]
 
-def extract_email(text):
-    # More comprehensive email pattern
-    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-    return re.findall(email_pattern, text)
+REMOTE_MATCHER = KeywordMatcher(["remote", "work from home", "telecommute", "anywhere", "distributed", "virtual", "home office", "remote work"])
+
+CRAWL_STATE_PATH = "indeed_crawl_state.db"
+JOB_INDEX_PATH = "indeed_job_ids.idx"
+# Emails (or their absence) per company website domain, across searches and runs
+DOMAIN_CACHE_PATH = "company_website_emails.db"
+
+# Accepted jobs are appended here as they are found; the final CSV/Parquet files are written from it
+STREAM_PATH = "indeed_jobs_100k.stream.csv"
+FIELDNAMES = JOB_FIELDS
+RESULTS_PER_PAGE = INDEED.page_size
+MAX_PAGES_PER_SEARCH = 10
+CARDS_PER_PAGE = 15
+
+# Pipeline mode (--pipeline): workers per stage and the bounded queue in front of each stage
+PIPELINE_WORKERS = {"discovery": 2, "detail": 3, "enrich": 6, "sink": 1}
+PIPELINE_QUEUE_SIZE = 50
+
+BROWSER_ARGS = [
+    "--disable-blink-features=AutomationControlled",
+    "--disable-web-security",
+    "--disable-features=VizDisplayCompositor",
+    "--no-first-run",
+    "--disable-default-apps"
+]
+# Link on an Indeed company page to the company's own website
+COMPANY_WEBSITE_SELECTOR = "a[href*='http']:not([href*='indeed']):not([href*='linkedin'])"
+
+def indeed_searches(countries=None, roles=None):
+    """(search url, country, role) for every country x role (default: COUNTRIES x JOB_ROLES)"""
+    # Indeed's jobs search rather than Google Jobs for better results
+    return [(INDEED.search_url(job_role, country), country, job_role)
+            for country in countries or COUNTRIES for job_role in roles or JOB_ROLES]
 
 def extract_company_website(page):
     """Try to find company website from job posting"""
@@ -41,16 +84,20 @@ def extract_company_website(page):
         pass
     return None
 
-def visit_company_website(page, website_url):
-    """Visit company website to extract contact emails"""
+def visit_company_website(page, website_url, crawler=None):
+    """Visit company website to extract contact emails (over HTTP with `crawler`, the browser only as fallback)"""
+    print(f"🌐 Checking company website: {website_url}")
+    if crawler is not None:
+        emails = crawler.find_emails(website_url)
+        if emails is not None:
+            return emails
+        print("🖥️  Website not readable over HTTP - opening it in the browser")
     try:
-        print(f"🌐 Checking company website: {website_url}")
-        page.goto(website_url, timeout=10000)
-        page.wait_for_timeout(3000)
+        goto_and_wait(page, website_url, fixed_ms=3000, timeout=10000)
         
         # Get page content
         content = page.content()
-        emails = extract_email(content)
+        emails = extract_emails(content)
         
         if emails:
             return emails
@@ -64,11 +111,10 @@ def visit_company_website(page, website_url):
                     if not href.startswith('http'):
                         href = website_url.rstrip('/') + '/' + href.lstrip('/')
                     
-                    page.goto(href, timeout=10000)
-                    page.wait_for_timeout(2000)
+                    goto_and_wait(page, href, fixed_ms=2000, timeout=10000)
                     
                     content = page.content()
-                    emails = extract_email(content)
+                    emails = extract_emails(content)
                     if emails:
                         return emails
             except:
@@ -76,276 +122,432 @@ def visit_company_website(page, website_url):
                 
     except Exception as e:
         print(f"❌ Error checking website {website_url}: {e}")
+        return None
     
     return []
 
-def scrape_google_jobs():
-    # User choice for no reboot option
-    print("🔧 Google Jobs Scraper Setup")
-    print("1. Run with fresh browser (recommended)")
-    print("2. Continue without reboot (faster startup)")
-    
-    choice = input("Choose option (1-2): ").strip()
-    
+def visit_company_website_cached(page, website_url, crawler, domain_cache):
+    """visit_company_website() once per domain; a failed visit is not cached"""
+    emails = domain_cache.get(website_url)
+    if emails is not None:
+        print(f"💾 {website_domain(website_url)} already checked - using cached result")
+        METRICS.count("domain_cache_hits")
+        return emails
+    with METRICS.timer("website_crawl"):
+        emails = visit_company_website(page, website_url, crawler)
+    domain_cache.put(website_url, emails)
+    return emails or []
+
+async def visit_company_website_async(page, website_url):
+    """Browser fallback of the pipeline's enrichment stage, for sites the HTTP crawler cannot read"""
     try:
-        with sync_playwright() as p:
-            # More robust browser launch
-            browser = p.chromium.launch(
-                headless=False,
-                slow_mo=500,  # Slower for stability
-                args=[
-                    "--disable-blink-features=AutomationControlled",
-                    "--disable-web-security",
-                    "--disable-features=VizDisplayCompositor",
-                    "--no-first-run",
-                    "--disable-default-apps"
-                ]
-            )
-            context = browser.new_context(
-                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36",
-                viewport={"width": 1280, "height": 720}
+        await goto_and_wait_async(page, website_url, fixed_ms=3000, timeout=10000)
+
+        emails = extract_emails(await page.content())
+        if emails:
+            return emails
+
+        contact_links = await page.query_selector_all("a[href*='contact'], a[href*='about'], a[href*='team']")
+        for link in contact_links[:3]:
+            try:
+                href = await link.get_attribute('href')
+                if href:
+                    if not href.startswith('http'):
+                        href = website_url.rstrip('/') + '/' + href.lstrip('/')
+
+                    await goto_and_wait_async(page, href, fixed_ms=2000, timeout=10000)
+
+                    emails = extract_emails(await page.content())
+                    if emails:
+                        return emails
+            except:
+                continue
+
+    except Exception as e:
+        print(f"❌ Error checking website {website_url}: {e}")
+        return None
+
+    return []
+
+async def new_page_pool(playwright, profile, browser, traffic, size):
+    """Pages for one pipeline stage, in a context of their own that is recycled once every page is back
+
+    A handler borrows one per job with get() and returns it with put().
+    """
+    pool = AsyncContextPool(playwright, profile, traffic, pages=size, browser=browser)
+    await pool.open()
+    return pool
+
+def new_job(card, search_url, page_num, country, job_role):
+    """Job dict of one results card, as it travels through the pipeline stages (and the sequential loop)"""
+    return {"job_key": card["job_id"], "job_url": card["job_url"], "search_url": search_url, "page_num": page_num,
+            "country": country, "job_category": job_role}
+
+def read_details(job, details, crawl_state, job_index):
+    """Fill a job from its detail pane; None (posting marked handled) when it is not remote"""
+    job["title"] = details["title"] or "N/A"
+    job["company"] = details["company"] or "N/A"
+    job["description"] = details["description"]
+    job["location"] = details["location"]
+    job["company_url"] = INDEED.absolute_url(details["company_url"])
+
+    if not REMOTE_MATCHER.search(" ".join((job["title"], job["company"], job["description"], job["location"]))):
+        print(f"⚠️  Skipped non-remote job: {job['title']} at {job['company']}")
+        METRICS.count("skipped_non_remote")
+        crawl_state.mark_job_done()
+        job_index.add(job["job_key"])
+        return None
+
+    job["emails"] = extract_emails(job["description"])
+    return job
+
+def company_website_emails(page, job, crawler, domain_cache):
+    """Emails on the company's own website, found through its Indeed company page; the results page is restored after"""
+    print(f"🔍 Looking for company website for: {job['title']} at {job['company']}")
+    try:
+        goto_and_wait(page, job["company_url"], fixed_ms=3000)
+        website_element = page.query_selector(COMPANY_WEBSITE_SELECTOR)
+        website_url = website_element.get_attribute('href') if website_element else None
+        emails = visit_company_website_cached(page, website_url, crawler, domain_cache) if website_url else []
+        if emails:
+            print(f"✅ Found email on company website: {emails[0]}")
+
+        # Go back to job listing
+        go_back_and_wait(page, INDEED.results_selector, fixed_ms=3000)
+        return emails
+    except Exception as e:
+        print(f"❌ Error checking company: {e}")
+        return []
+
+async def discover_search_async(discovery_pages, search, emit, crawl_state, job_index, checkpoints, in_flight, stats, target_jobs,
+                                max_pages=MAX_PAGES_PER_SEARCH):
+    """Discovery stage: page through one search and emit every job card not seen before"""
+    search_url, country, job_role = search
+    page = await discovery_pages.get()
+    try:
+        print(f"\n🔍 Searching for: {job_role} in {country}")
+        # A page is checkpointed once its jobs have left the pipeline (PageCheckpoints), not when discovery moves on
+        walk = INDEED.listing_pages(page, search_url, f"{job_role} in {country}", max_pages=max_pages, crawl_state=crawl_state,
+                                    on_page_done=lambda pages_done: None, on_finished=lambda: checkpoints.finish(search_url),
+                                    elements=False)
+        async for cards in walk:
+            jobs = []
+            for card in cards[:CARDS_PER_PAGE]:
+                # Skip postings handled in an earlier run or already somewhere in the pipeline
+                if not card["job_id"] or INDEED.known(card, job_index) or card["job_id"] in in_flight:
+                    continue
+                in_flight.add(card["job_id"])
+                jobs.append(new_job(card, search_url, walk.page_num, country, job_role))
+
+            print(f"📋 Found {len(cards)} job cards on page {walk.page_num + 1} for {job_role} in {country}, {len(jobs)} new")
+            checkpoints.expect(search_url, walk.page_num, len(jobs))
+            for job in jobs:
+                await emit(job)
+            if stats["job_count"] >= target_jobs:
+                break
+    finally:
+        await discovery_pages.put(page)
+
+async def fetch_details_async(job, detail_pages, crawl_state, job_index):
+    """Detail stage: open the posting, read it in one evaluate and drop non-remote jobs"""
+    page = await detail_pages.get()
+    try:
+        view_url = f"https://www.indeed.com/viewjob?jk={job['job_key']}" if job["job_key"] != job["job_url"] else job["job_url"]
+        await goto_and_wait_async(page, view_url, INDEED.detail_selector, fixed_ms=4000)
+        details = await extract_job_details_async(page, INDEED.detail_spec)
+        METRICS.count("jobs_seen")
+    finally:
+        await detail_pages.put(page)
+
+    return read_details(job, details, crawl_state, job_index)
+
+async def find_company_website_async(job, enrich_pages):
+    """The company's own website as linked from its Indeed company page, or None"""
+    page = await enrich_pages.get()
+    try:
+        print(f"🔍 Looking for company website for: {job['title']} at {job['company']}")
+        await goto_and_wait_async(page, job["company_url"], fixed_ms=3000)
+        website_element = await page.query_selector(COMPANY_WEBSITE_SELECTOR)
+        return await website_element.get_attribute('href') if website_element else None
+    finally:
+        await enrich_pages.put(page)
+
+async def enrich_job_async(job, enrich_pages, domain_cache, crawler=None):
+    """Enrichment stage: look for an email on the company's own website when the description had none
+
+    The website itself is crawled over HTTP, so a browser page is only held
+    for the Indeed company page and for sites that need the browser fallback.
+    """
+    if job["emails"] or not job["company_url"]:
+        return job
+
+    try:
+        website_url = await find_company_website_async(job, enrich_pages)
+        if not website_url:
+            return job
+
+        website_emails = domain_cache.get(website_url)
+        if website_emails is not None:
+            print(f"💾 {website_domain(website_url)} already checked - using cached result")
+            METRICS.count("domain_cache_hits")
+        else:
+            print(f"🌐 Checking company website: {website_url}")
+            with METRICS.timer("website_crawl"):
+                website_emails = await crawler.find_emails(website_url) if crawler else None
+                if website_emails is None:
+                    page = await enrich_pages.get()
+                    try:
+                        website_emails = await visit_company_website_async(page, website_url)
+                    finally:
+                        await enrich_pages.put(page)
+            domain_cache.put(website_url, website_emails)
+
+        if website_emails:
+            job["emails"] = website_emails
+            print(f"✅ Found email on company website: {website_emails[0]}")
+    except Exception as e:
+        print(f"❌ Error checking company: {e}")
+    return job
+
+def write_job(job, sink, stats, target_jobs, crawl_state, job_index):
+    """Stream a remote job with an email, report one without, and mark the posting handled"""
+    if job["emails"]:
+        if stats["job_count"] >= target_jobs:
+            return None
+        stats["consecutive_no_emails"] = 0
+        sink.write(INDEED.job(job["title"], job["company"], job["location"], job["description"][:300], job["job_url"],
+                              country=job["country"], job_category=job["job_category"], email=", ".join(job["emails"])))
+        stats["job_count"] = sink.rows
+        print(f"✅ Found remote job {stats['job_count']} with email: {job['title']} at {job['company']} ({job['country']})")
+
+        # Every job is already on disk; just report progress every 500 jobs
+        if stats["job_count"] % 500 == 0:
+            sink.sync()
+            print(f"\n💾 {stats['job_count']} jobs streamed to {STREAM_PATH}\n")
+    else:
+        stats["consecutive_no_emails"] += 1
+        print(f"📧 Skipped remote job without email: {job['title']} at {job['company']}")
+        METRICS.count("skipped_no_email")
+
+        if stats["consecutive_no_emails"] >= 20:
+            print(f"⚠️  Found {stats['consecutive_no_emails']} consecutive jobs without emails.")
+            stats["consecutive_no_emails"] = 0
+
+    crawl_state.mark_job_done()
+    job_index.add(job["job_key"])
+    return job
+
+async def write_job_async(job, sink, stats, target_jobs, crawl_state, job_index):
+    """Sink stage: write_job() for the pipeline"""
+    return write_job(job, sink, stats, target_jobs, crawl_state, job_index)
+
+def save_indeed_run(sink, output_ext, outcome, start_time, traffic, crawl_state, job_index, domain_cache, pool=None):
+    """save_run() with the stats of an Indeed run"""
+    reports = [print_wait_savings, finish_run, lambda: traffic.print_stats(crawl_state.jobs_marked)]
+    if pool:
+        reports.append(pool.print_stats)
+    reports.append(lambda: print(f"🔁 Skipped {job_index.hits} postings already seen under another search, country or run"))
+    reports.append(domain_cache.print_stats)
+    save_run(sink, "indeed_jobs", output_ext, outcome, start_time, reports)
+    sink.close()
+
+async def crawl_indeed_pipeline(sink, target_jobs, crawl_state, job_index, domain_cache, traffic, workers=PIPELINE_WORKERS,
+                                searches=None, max_pages=MAX_PAGES_PER_SEARCH):
+    """Run discovery -> detail -> enrichment -> sink as separate stages with bounded queues between them"""
+    stats = {"job_count": sink.rows, "consecutive_no_emails": 0}
+    searches = [search for search in (indeed_searches() if searches is None else searches)
+                if not crawl_state.is_search_finished(search[0])]
+
+    checkpoints = PageCheckpoints(crawl_state, on_checkpoint=job_index.checkpoint)
+    in_flight = set()
+
+    def job_left(job):
+        in_flight.discard(job["job_key"])
+        checkpoints.done(job["search_url"], job["page_num"])
+
+    crawler = WebsiteEmailCrawler() if httpx is not None else None
+    async with async_playwright() as p:
+        profile = get_profile()
+        browser = await profile.launch_async(p, args=BROWSER_ARGS)
+        try:
+            discovery_pages = await new_page_pool(p, profile, browser, traffic, workers["discovery"])
+            detail_pages = await new_page_pool(p, profile, browser, traffic, workers["detail"])
+            enrich_pages = await new_page_pool(p, profile, browser, traffic, workers["enrich"])
+
+            pipeline = Pipeline([
+                Stage("detail", lambda job: fetch_details_async(job, detail_pages, crawl_state, job_index),
+                      workers["detail"], PIPELINE_QUEUE_SIZE),
+                Stage("enrich", lambda job: enrich_job_async(job, enrich_pages, domain_cache, crawler), workers["enrich"], PIPELINE_QUEUE_SIZE),
+                Stage("sink", lambda job: write_job_async(job, sink, stats, target_jobs, crawl_state, job_index),
+                      workers["sink"], PIPELINE_QUEUE_SIZE),
+            ], on_done=job_left)
+            await pipeline.run(
+                searches,
+                lambda search, emit: discover_search_async(discovery_pages, search, emit, crawl_state, job_index, checkpoints,
+                                                           in_flight, stats, target_jobs, max_pages),
+                workers["discovery"]
             )
-            page = context.new_page()
+            pipeline.print_stats()
+            recycles = discovery_pages.recycles + detail_pages.recycles + enrich_pages.recycles
+            if recycles:
+                print(f"♻️  Stage browser contexts recycled {recycles} times")
+        finally:
+            await browser.close()
+            if crawler:
+                await crawler.aclose()
 
-            jobs_data = []
-            job_count = 0
-            consecutive_no_emails = 0
-            start_time = datetime.now()
-            
-            print("🚀 Starting Google Jobs scraper for REMOTE positions with emails...")
-            print("🎯 TARGET: 100,000 jobs with emails")
-            print("🌍 Searching in: Germany, China, United Kingdom, Australia, Canada")
-            print("📌 Press Ctrl+C to stop and save partial results")
-            print("🔍 This will check job descriptions and company websites for contact emails")
-            print("⏱️  This may take several hours to complete - progress will be saved regularly")
-            print(f"🕐 Started at: {start_time.strftime('%Y-%m-%d %H:%M:%S')}\n")
-            
-            if choice == "2":
-                print("⚡ Running in no-reboot mode for faster processing")
-            
-            # ✅ Search through multiple job categories and countries
-            for country, google_domain in COUNTRIES.items():
-                if job_count >= 100000:
-                    break
-                    
-                for job_role in JOB_ROLES:
-                    if job_count >= 100000:
+def scrape_google_jobs_pipeline(target_jobs=100000, output_ext=".csv", workers=PIPELINE_WORKERS, searches=None,
+                                max_pages=MAX_PAGES_PER_SEARCH):
+    """Pipeline mode: discovery, detail fetch, enrichment and output each run with their own workers"""
+    start_time = datetime.now()
+    reset_wait_stats()
+    start_run("indeed_100k")
+    crawl_state = CrawlState(CRAWL_STATE_PATH)
+    job_index = JobIdIndex(JOB_INDEX_PATH)
+    domain_cache = DomainEmailCache(DOMAIN_CACHE_PATH)
+    sink = CsvSink(STREAM_PATH, FIELDNAMES, job_key=INDEED.job_key)
+    traffic = TrafficMeter()
+
+    print("🚀 Starting Indeed pipeline scraper for REMOTE positions with emails...")
+    print(f"🎯 TARGET: {target_jobs:,} jobs with emails")
+    print("⚡ Workers: " + ", ".join(f"{stage} {count}" for stage, count in workers.items()))
+    print("📌 Press Ctrl+C to stop and save partial results")
+    print(f"🕐 Started at: {start_time.strftime('%Y-%m-%d %H:%M:%S')}\n")
+    if sink.rows:
+        print(f"♻️  Resuming crawl from {CRAWL_STATE_PATH}: {sink.rows} jobs already in {STREAM_PATH}\n")
+
+    outcome = "final"
+    try:
+        asyncio.run(crawl_indeed_pipeline(sink, target_jobs, crawl_state, job_index, domain_cache, traffic, workers,
+                                          searches, max_pages))
+    except KeyboardInterrupt:
+        print(f"\n⚠️  Script interrupted by user. Saving {sink.rows} jobs found so far...")
+        outcome = "partial"
+    except Exception as e:
+        print(f"❌ Unexpected error: {e}")
+        outcome = "error"
+    finally:
+        close_quietly(crawl_state, job_index, domain_cache)
+
+    save_indeed_run(sink, output_ext, outcome, start_time, traffic, crawl_state, job_index, domain_cache)
+
+def scrape_google_jobs(output_ext=".csv", searches=None, target_jobs=100000, max_pages=MAX_PAGES_PER_SEARCH, interactive=True):
+    """Sequential crawl of `searches` (default: every country x role) until `target_jobs` jobs with emails"""
+    searches = indeed_searches() if searches is None else searches
+    choice = "1"
+    if interactive:
+        # User choice for no reboot option
+        print("🔧 Google Jobs Scraper Setup")
+        print("1. Run with fresh browser (recommended)")
+        print("2. Continue without reboot (faster startup)")
+
+        choice = input("Choose option (1-2): ").strip()
+
+    start_time = datetime.now()
+    traffic = pool = crawler = crawl_state = job_index = domain_cache = sink = None
+    outcome = "final"
+    try:
+        with sync_playwright() as p:
+            # Lean headless profile by default (SCRAPER_BROWSER_PROFILE=full for a visible browser)
+            traffic = TrafficMeter()
+            # Context recycled every few hundred jobs (or on a crash) so multi-hour runs do not grow without bound
+            pool = ContextPool(p, get_profile(), traffic, launch_args=BROWSER_ARGS)
+            page, = pool.open()
+
+            def recycled_page():
+                """The new page if the context was just recycled, else None"""
+                nonlocal page
+                pages = pool.maybe_recycle()
+                if pages:
+                    page, = pages
+                    return page
+
+            try:
+                # Company websites are read over HTTP; the browser only opens the ones that need it
+                crawler = SyncWebsiteEmailCrawler() if httpx is not None else None
+
+                crawl_state = CrawlState(CRAWL_STATE_PATH)
+                job_index = JobIdIndex(JOB_INDEX_PATH)
+                domain_cache = DomainEmailCache(DOMAIN_CACHE_PATH)
+                sink = CsvSink(STREAM_PATH, FIELDNAMES, job_key=INDEED.job_key)
+                stats = {"job_count": sink.rows, "consecutive_no_emails": 0}
+                reset_wait_stats()
+                start_run("indeed_100k")
+
+                print("🚀 Starting Google Jobs scraper for REMOTE positions with emails...")
+                print(f"🎯 TARGET: {target_jobs:,} jobs with emails")
+                print(f"🌍 Searching in: {', '.join(dict.fromkeys(country for _, country, _ in searches))}")
+                print("📌 Press Ctrl+C to stop and save partial results")
+                print("🔍 This will check job descriptions and company websites for contact emails")
+                print("⏱️  This may take several hours to complete - progress will be saved regularly")
+                print(f"🕐 Started at: {start_time.strftime('%Y-%m-%d %H:%M:%S')}\n")
+                if sink.rows:
+                    print(f"♻️  Resuming crawl from {CRAWL_STATE_PATH}: {sink.rows} jobs already in {STREAM_PATH}\n")
+
+                if choice == "2":
+                    print("⚡ Running in no-reboot mode for faster processing")
+
+                # ✅ Search through multiple job categories and countries
+                for search_url, country, job_role in searches:
+                    if stats["job_count"] >= target_jobs:
                         break
-                        
+
                     print(f"\n🔍 Searching for: {job_role} in {country}")
-                    
-                    # Use Indeed jobs search instead of Google Jobs for better results
-                    search_query = job_role.replace(" ", "%20")
-                    search_url = f"https://www.indeed.com/jobs?q={search_query}&l={country}&rbl=Remote&jlid=remote"
-                    
-                    try:
-                        page.goto(search_url, timeout=30000)
-                        page.wait_for_timeout(5000)
-                        
-                        # Handle cookie consent
-                        try:
-                            accept_button = page.query_selector("button#onetrust-accept-btn-handler, button:has-text('Accept'), button:has-text('I Accept')")
-                            if accept_button:
-                                accept_button.click()
-                                page.wait_for_timeout(2000)
-                        except:
-                            pass
-                        
-                        page_num = 0
-                        
-                        while job_count < 100000 and page_num < 10:  # Limit pages per search
-                            # Better job card selectors for Indeed
-                            job_cards = page.query_selector_all("h2.jobTitle a, [data-jk] h2 a")
-                            
-                            if not job_cards:
-                                print(f"No more job cards found for {job_role} in {country}")
-                                break
 
-                            print(f"📋 Found {len(job_cards)} job cards on page {page_num + 1}")
-
-                            for i, job_card in enumerate(job_cards[:15]):  # Process first 15 jobs per page
-                                if job_count >= 100000:
-                                    break
-                                
-                                try:
-                                    # Get job URL and click
-                                    job_url = job_card.get_attribute('href')
-                                    if job_url and not job_url.startswith('http'):
-                                        job_url = 'https://www.indeed.com' + job_url
-                                    
-                                    job_card.click()
-                                    page.wait_for_timeout(4000)
-
-                                    # Extract job details with better selectors
-                                    title_element = page.query_selector("h1[data-testid='jobsearch-JobInfoHeader-title'], h1.jobsearch-JobInfoHeader-title")
-                                    title = title_element.inner_text() if title_element else "N/A"
-                                    
-                                    company_element = page.query_selector("[data-testid='inlineHeader-companyName'] a, .jobsearch-InlineCompanyRating a")
-                                    company = company_element.inner_text() if company_element else "N/A"
-                                    
-                                    description_element = page.query_selector("#jobDescriptionText, .jobsearch-jobDescriptionText")
-                                    description = description_element.inner_text() if description_element else ""
-                                    
-                                    location_element = page.query_selector("[data-testid='job-location'], .jobsearch-JobInfoHeader-subtitle")
-                                    location = location_element.inner_text() if location_element else ""
-                                    
-                                    # Verify job is remote
-                                    remote_keywords = ["remote", "work from home", "telecommute", "anywhere", "distributed", "virtual", "home office", "remote work"]
-                                    full_text = (title + " " + company + " " + description + " " + location).lower()
-                                    is_remote = any(keyword in full_text for keyword in remote_keywords)
-
-                                    if not is_remote:
-                                        print(f"⚠️  Skipped non-remote job: {title} at {company}")
-                                        continue
-
-                                    # Extract emails from job description
-                                    emails = extract_email(description)
-                                    
-                                    # If no emails in description, try company website
-                                    if not emails and company_element:
-                                        print(f"🔍 Looking for company website for: {title} at {company}")
-                                        
-                                        try:
-                                            # Click on company name to get more info
-                                            company_element.click()
-                                            page.wait_for_timeout(3000)
-                                            
-                                            # Look for website link or contact info
-                                            website_element = page.query_selector("a[href*='http']:not([href*='indeed']):not([href*='linkedin'])")
-                                            if website_element:
-                                                website_url = website_element.get_attribute('href')
-                                                if website_url:
-                                                    website_emails = visit_company_website(page, website_url)
-                                                    if website_emails:
-                                                        emails = website_emails
-                                                        print(f"✅ Found email on company website: {emails[0]}")
-                                            
-                                            # Go back to job listing
-                                            page.go_back()
-                                            page.wait_for_timeout(3000)
-                                            
-                                        except Exception as e:
-                                            print(f"❌ Error checking company: {e}")
-                                    
-                                    # Only add jobs that have emails AND are remote
-                                    if emails and is_remote:
-                                        consecutive_no_emails = 0
-                                        jobs_data.append({
-                                            "country": country,
-                                            "job_category": job_role,
-                                            "title": title,
-                                            "company": company,
-                                            "location": location,
-                                            "description": description[:300],
-                                            "email": ", ".join(emails),
-                                            "source": "Indeed Jobs",
-                                            "job_url": job_url
-                                        })
-                                        job_count += 1
-                                        print(f"✅ Found remote job {job_count} with email: {title} at {company} ({country})")
-                                        
-                                        # Save progress every 500 jobs
-                                        if job_count % 500 == 0:
-                                            print(f"\n💾 Auto-saving progress at {job_count} jobs...")
-                                            with open(f"indeed_jobs_progress_{job_count}.csv", "w", newline='', encoding='utf-8') as file:
-                                                writer = csv.DictWriter(file, fieldnames=jobs_data[0].keys())
-                                                writer.writeheader()
-                                                writer.writerows(jobs_data)
-                                            print(f"✅ Progress saved to indeed_jobs_progress_{job_count}.csv\n")
-                                    else:
-                                        consecutive_no_emails += 1
-                                        print(f"📧 Skipped remote job without email: {title} at {company}")
-                                        
-                                        if consecutive_no_emails >= 20:
-                                            print(f"⚠️  Found {consecutive_no_emails} consecutive jobs without emails.")
-                                            consecutive_no_emails = 0
-                                            
-                                except Exception as e:
-                                    print(f"❌ Error processing job {i+1}: {e}")
-                                    continue
-
-                            # Try to navigate to next page
-                            page_num += 1
-                            try:
-                                next_button = page.query_selector("a[aria-label='Next Page'], a[aria-label='Next']")
-                                if next_button and not next_button.is_disabled():
-                                    next_button.click()
-                                    page.wait_for_timeout(5000)
-                                    print(f"📄 Moving to page {page_num + 1} for {job_role} in {country} (Found {job_count} jobs so far)")
-                                else:
-                                    print(f"No more pages available for {job_role} in {country}")
-                                    break
-                            except Exception as e:
-                                print(f"Error navigating to next page: {e}")
-                                break
-                                
-                    except Exception as e:
-                        print(f"❌ Error loading page for {job_role} in {country}: {e}")
+                    if crawl_state.is_search_finished(search_url):
+                        print(f"⏭️  Already finished {job_role} in {country} in an earlier run")
                         continue
 
-            browser.close()
+                    walk = INDEED.listing_pages(recycled_page() or page, search_url, f"{job_role} in {country}",
+                                                max_pages=max_pages, crawl_state=crawl_state, reopen=recycled_page)
+                    for cards in walk:
+                        print(f"📋 Found {len(cards)} job cards on page {walk.page_num + 1}")
 
-            # ✅ Save final CSV
-            if jobs_data:
-                final_time = datetime.now()
-                duration = final_time - start_time
-                
-                with open("indeed_jobs_100k.csv", "w", newline='', encoding='utf-8') as file:
-                    writer = csv.DictWriter(file, fieldnames=jobs_data[0].keys())
-                    writer.writeheader()
-                    writer.writerows(jobs_data)
+                        # Postings already handled under another search, country or run are skipped before the click
+                        for card, details in INDEED.job_details(walk.page, cards[:CARDS_PER_PAGE], seen=job_index):
+                            pool.job_done()
+                            try:
+                                job = read_details(new_job(card, search_url, walk.page_num, country, job_role), details,
+                                                   crawl_state, job_index)
+                                if job:
+                                    # If no emails in description, try company website
+                                    if not job["emails"] and job["company_url"]:
+                                        job["emails"] = company_website_emails(walk.page, job, crawler, domain_cache)
+                                    write_job(job, sink, stats, target_jobs, crawl_state, job_index)
+                            except Exception as e:
+                                print(f"❌ Error processing job: {e}")
+                            if stats["job_count"] >= target_jobs:
+                                break
+                        if stats["job_count"] >= target_jobs:
+                            break
+                        job_index.checkpoint()
+            finally:
+                close_quietly(pool, crawler)
 
-                print(f"\n✅ Final data saved to indeed_jobs_100k.csv - Found {len(jobs_data)} REMOTE jobs with emails")
-                print(f"⏱️  Total runtime: {duration}")
-                
-                # Show statistics by country and job category
-                from collections import Counter
-                country_counts = Counter([job['country'] for job in jobs_data])
-                category_counts = Counter([job['job_category'] for job in jobs_data])
-                
-                print("\n📊 Remote jobs found by country:")
-                for country, count in country_counts.items():
-                    print(f"  • {country}: {count} jobs")
-                
-                print("\n📊 Remote jobs found by category:")
-                for category, count in category_counts.items():
-                    print(f"  • {category}: {count} jobs")
-            else:
-                print("❌ No remote jobs with emails found")
-                
     except KeyboardInterrupt:
-        print(f"\n⚠️  Script interrupted by user. Saving {len(jobs_data)} jobs found so far...")
-        
-        if jobs_data:
-            final_time = datetime.now()
-            duration = final_time - start_time
-            
-            with open("indeed_jobs_partial_100k.csv", "w", newline='', encoding='utf-8') as file:
-                writer = csv.DictWriter(file, fieldnames=jobs_data[0].keys())
-                writer.writeheader()
-                writer.writerows(jobs_data)
-            print(f"✅ Partial data saved to indeed_jobs_partial_100k.csv - {len(jobs_data)} jobs")
-            print(f"⏱️  Runtime before interruption: {duration}")
-        
-        try:
-            browser.close()
-        except:
-            pass
-            
+        print(f"\n⚠️  Script interrupted by user. Saving {sink.rows if sink else 0} jobs found so far...")
+        outcome = "partial"
     except Exception as e:
         print(f"❌ Unexpected error: {e}")
-        
-        if jobs_data:
-            with open("indeed_jobs_error_100k.csv", "w", newline='', encoding='utf-8') as file:
-                writer = csv.DictWriter(file, fieldnames=jobs_data[0].keys())
-                writer.writeheader()
-                writer.writerows(jobs_data)
-            print(f"✅ Data saved to indeed_jobs_error_100k.csv - {len(jobs_data)} jobs")
-        
-        try:
-            browser.close()
-        except:
-            pass
+        outcome = "error"
+    finally:
+        close_quietly(crawl_state, job_index, domain_cache)
+
+    if sink:
+        save_indeed_run(sink, output_ext, outcome, start_time, traffic, crawl_state, job_index, domain_cache, pool)
 
 if __name__ == "__main__":
-    scrape_google_jobs()
+    # python google_jobs_scraper.py --parquet   -> final files as Parquet instead of CSV
+    # python google_jobs_scraper.py --pipeline  -> staged discovery/detail/enrichment pipeline
+    # python google_jobs_scraper.py --pipeline --enrich-workers 12  -> scale one stage (also --detail-workers etc.)
+    output_ext = ".parquet" if "--parquet" in sys.argv else ".csv"
+    check_output_ext(output_ext)
+    if "--pipeline" in sys.argv:
+        workers = dict(PIPELINE_WORKERS)
+        for stage in workers:
+            flag = f"--{stage}-workers"
+            if flag in sys.argv:
+                workers[stage] = int(sys.argv[sys.argv.index(flag) + 1])
+        scrape_google_jobs_pipeline(output_ext=output_ext, workers=workers)
+    else:
+        scrape_google_jobs(output_ext)
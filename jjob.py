@@ -1,22 +1,24 @@
 import requests
-import openai
 import smtplib
 import feedparser
 from email.message import EmailMessage
 from pathlib import Path
 from dotenv import load_dotenv
 import os
-import time
 import random
+from email_generation import generate_emails
+from rate_limiter import LIMITER
 
 # Load secrets
 load_dotenv()
 
-# OpenAI and Email setup
-client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+# Email setup
 EMAIL_ADDRESS = os.getenv("EMAIL_USER")
 EMAIL_PASSWORD = os.getenv("EMAIL_PASS")
 CV_PATH = Path("Jawad Ali Resume.pdf")
+SMTP_HOST = "smtp.gmail.com"
+# SMTP replies that mean "slow down" (too many connections / messages) rather than a bad address
+SMTP_THROTTLE_CODES = {421, 450, 451, 452, 454}
 
 # RemoteOK job search
 def search_jobs_from_remoteok(max_jobs=100):
@@ -94,9 +96,9 @@ def search_multiple_job_sources(max_jobs=100):
         jobs.extend(generate_additional_jobs(max_jobs - len(jobs)))
     return jobs[:max_jobs]
 
-# Email content generation
-def generate_email(job):
-    prompt = f"""
+# Email content prompt (generated concurrently by email_generation.py)
+def email_prompt(job):
+    return f"""
     Write a short job application email for the position of {job['title']} at {job['company']}.
     Name: Jawad Ali Yousafzai
     Email: jawadaliyousafzai.ai@gmail.com
@@ -106,12 +108,6 @@ def generate_email(job):
     Education: BS in AI
     Experience: 3+ years
     """
-    response = client.chat.completions.create(
-        model="gpt-4",
-        messages=[{"role": "user", "content": prompt}],
-        max_tokens=250
-    )
-    return response.choices[0].message.content
 
 # Send email
 def send_email(subject, body, to_email):
@@ -127,28 +123,40 @@ def send_email(subject, body, to_email):
     else:
         print("⚠️ CV not found!")
 
+    # Paced by the adaptive limiter instead of a fixed 2-5 s sleep; it backs off when Gmail pushes back
+    LIMITER.wait(SMTP_HOST)
     try:
-        with smtplib.SMTP_SSL("smtp.gmail.com", 465) as smtp:
+        with smtplib.SMTP_SSL(SMTP_HOST, 465) as smtp:
             smtp.login(EMAIL_ADDRESS, EMAIL_PASSWORD)
             smtp.send_message(msg)
+        LIMITER.success(SMTP_HOST)
         print(f"✅ Email sent to {to_email}")
-        time.sleep(random.uniform(2, 5))
+    except smtplib.SMTPResponseException as e:
+        if e.smtp_code in SMTP_THROTTLE_CODES:
+            LIMITER.throttled(SMTP_HOST, f"SMTP {e.smtp_code}")
+        print(f"❌ Email error to {to_email}: {e}")
     except Exception as e:
         print(f"❌ Email error to {to_email}: {e}")
-        time.sleep(5)
 
 # Main loop
 def main():
     target = 100
     jobs = search_multiple_job_sources(target)
+    with_email = [job for job in jobs if job['email']]
+    print(f"\n🤖 Generating {len(with_email)} application emails...")
+    # Bodies come back in job order, so they are handed out in the loop below as it reaches each job with an email
+    bodies = iter(generate_emails(with_email, email_prompt))
     print(f"\n📨 Starting applications to {len(jobs)} jobs")
     sent = 0
     for i, job in enumerate(jobs, 1):
         print(f"\n[{i}] {job['title']} at {job['company']}")
         print(f"🔗 {job['url']}")
         if job['email']:
+            body = next(bodies)
+            if body is None:
+                print("❌ No email generated – skipped.")
+                continue
             try:
-                body = generate_email(job)
                 send_email(f"Application: {job['title']} at {job['company']}", body, job['email'])
                 sent += 1
             except Exception as e:
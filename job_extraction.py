@@ -0,0 +1,170 @@
+from run_metrics import METRICS
+
+# One-round-trip job detail extraction shared by the LinkedIn and Indeed scrapers.
+#
+# Reading each field with query_selector() + inner_text() costs two browser
+# round-trips per field. EXTRACT_DETAILS_JS reads every field of the detail pane
+# inside the page and returns them as one dict from a single page.evaluate().
+
+# Each field lists (css selector, required text) candidates tried in order,
+# mirroring the fallback chains the scrapers used with query_selector().
+# Playwright's :has-text() is not CSS, so it is expressed as required text.
+LINKEDIN_DETAIL_SPEC = {
+    "text": {
+        "title": [["h2.topcard__title", None]],
+        "company": [["span.topcard__flavor", None]],
+        "location": [["span.topcard__flavor--bullet", None]],
+        "description": [["div.description__text", None]],
+    },
+    "links": {
+        "recruiter": [
+            ["a.app-aware-link", "Recruiter"],
+            ["a[href*='/in/']:has(img)", None],
+            ["a.jobs-poster__name", None],
+            ["div.message-the-recruiter a[href*='/in/']", None],
+        ],
+        "company": [
+            ["a.jobs-details-top-card__company-url", None],
+            ["a[href*='/company/']", None],
+        ],
+    },
+}
+
+INDEED_DETAIL_SPEC = {
+    "text": {
+        "title": [["h1[data-testid='jobsearch-JobInfoHeader-title'], h1.jobsearch-JobInfoHeader-title", None]],
+        "company": [["[data-testid='inlineHeader-companyName'] a, .jobsearch-InlineCompanyRating a", None]],
+        "location": [["[data-testid='job-location'], .jobsearch-JobInfoHeader-subtitle", None]],
+        "description": [["#jobDescriptionText, .jobsearch-jobDescriptionText", None]],
+    },
+    "links": {
+        "recruiter": [],
+        "company": [["[data-testid='inlineHeader-companyName'] a, .jobsearch-InlineCompanyRating a", None]],
+    },
+}
+
+# First element matching one of the (css selector, required text) candidates, in order
+PICK_JS = """
+    const pick = (candidates) => {
+        for (const [selector, text] of candidates) {
+            for (const el of document.querySelectorAll(selector)) {
+                if (!text || el.innerText.includes(text)) return el;
+            }
+        }
+        return null;
+    };
+"""
+
+EXTRACT_DETAILS_JS = """
+(spec) => {""" + PICK_JS + """
+    const details = {};
+    for (const [name, candidates] of Object.entries(spec.text)) {
+        const el = pick(candidates);
+        details[name] = el ? el.innerText : "";
+    }
+    for (const [name, candidates] of Object.entries(spec.links)) {
+        const el = pick(candidates);
+        details[name + "_name"] = el ? el.innerText.trim() : "";
+        details[name + "_url"] = el ? (el.getAttribute("href") || "") : "";
+    }
+    return details;
+}
+"""
+
+def extract_job_details(page, spec=LINKEDIN_DETAIL_SPEC):
+    """Return title, company, location, description, recruiter_name/url and company_name/url in one evaluate"""
+    with METRICS.timer("extract"):
+        return page.evaluate(EXTRACT_DETAILS_JS, spec)
+
+async def extract_job_details_async(page, spec=LINKEDIN_DETAIL_SPEC):
+    with METRICS.timer("extract"):
+        return await page.evaluate(EXTRACT_DETAILS_JS, spec)
+
+# Where a recruiter or company profile may show an email, in the order they are read:
+# mailto links, then each section (contact info modal, About card), then on
+# company pages the overview sections.
+LINKEDIN_PROFILE_SPEC = {
+    "mailto": "a[href^='mailto:']",
+    "sections": [
+        [["section.artdeco-modal", None]],
+        [["section.artdeco-card", "About"]],
+    ],
+    "company_sections": [
+        [["section[data-module='OverviewModule']", None]],
+        [["section", "Website"]],
+    ],
+}
+
+EXTRACT_PROFILE_JS = """
+(spec) => {""" + PICK_JS + """
+    const texts = (sections) => sections.map((candidates) => {
+        const el = pick(candidates);
+        return el ? el.innerText : "";
+    });
+    return {
+        mailto: Array.from(document.querySelectorAll(spec.mailto), (a) => a.getAttribute("href") || ""),
+        sections: texts(spec.sections),
+        company_sections: texts(spec.company_sections),
+    };
+}
+"""
+
+def extract_profile_texts(page, spec=LINKEDIN_PROFILE_SPEC):
+    """Return the mailto hrefs and the text of every email-bearing section of a profile page in one evaluate"""
+    with METRICS.timer("extract"):
+        return page.evaluate(EXTRACT_PROFILE_JS, spec)
+
+async def extract_profile_texts_async(page, spec=LINKEDIN_PROFILE_SPEC):
+    with METRICS.timer("extract"):
+        return await page.evaluate(EXTRACT_PROFILE_JS, spec)
+
+def absolute_linkedin_url(href):
+    if href and not href.startswith('https://'):
+        return 'https://www.linkedin.com' + href
+    return href
+
+# Reads every card of the search results list (title, company, location, job id,
+# link) in one evaluate, so runs that only need the basic columns never click.
+HARVEST_LIST_JS = """
+(selector) => Array.from(document.querySelectorAll(selector), (li, index) => {
+    const text = (sel) => {
+        const el = li.querySelector(sel);
+        return el ? el.innerText.trim() : "";
+    };
+    const card = li.querySelector("[data-entity-urn]");
+    const link = li.querySelector("a.base-card__full-link, a[href*='/jobs/view/']");
+    const urn = card ? card.getAttribute("data-entity-urn") : "";
+    const href = link ? link.href : "";
+    const id = urn.match(/(\\d+)$/) || href.match(/(?:currentJobId=|-)(\\d+)(?:[/?&]|$)/);
+    const listed = li.querySelector("time");
+    return {
+        index: index,
+        job_id: id ? id[1] : "",
+        title: text("h3.base-search-card__title"),
+        company: text("h4.base-search-card__subtitle"),
+        location: text("span.job-search-card__location"),
+        listed_at: listed ? (listed.getAttribute("datetime") || "") : "",
+        job_url: href,
+    };
+})
+"""
+
+def harvest_job_list(page, selector="ul.jobs-search__results-list li"):
+    """Return the metadata of every results-list card (incl. its currentJobId) in one evaluate"""
+    with METRICS.timer("harvest"):
+        return page.evaluate(HARVEST_LIST_JS, selector)
+
+async def harvest_job_list_async(page, selector="ul.jobs-search__results-list li"):
+    with METRICS.timer("harvest"):
+        return await page.evaluate(HARVEST_LIST_JS, selector)
+
+def new_cards(cards, seen_job_ids):
+    """Drop cards already harvested (same posting under another search or page) and remember the rest"""
+    fresh = []
+    for card in cards:
+        key = card["job_id"] or card["job_url"]
+        if key and key in seen_job_ids:
+            continue
+        seen_job_ids.add(key)
+        fresh.append(card)
+    return fresh
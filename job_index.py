@@ -0,0 +1,102 @@
+import os
+import hashlib
+from array import array
+from bisect import bisect_left
+from heapq import merge
+
+# Persistent dedup index of job postings already processed by any search,
+# country or earlier run, checked before a job card is clicked.
+#
+# IDs are stored as 64-bit integers: LinkedIn's numeric currentJobId as-is,
+# anything else (Indeed's data-jk hex keys, fallback URLs) as a blake2b hash
+# with the top bit set so it can never equal a LinkedIn ID. On disk that is
+#
+#   <path>      sorted uint64 array, 8 bytes per ID, binary-searched in memory
+#   <path>.log  unsorted uint64 IDs appended at each checkpoint since the last compaction
+#
+# so a million IDs cost 8 MB and a lookup is one bisect, with no per-entry
+# Python object overhead. New IDs live in a set until compact() merges them.
+
+COMPACT_EVERY = 50000
+HASHED_ID_BIT = 1 << 63
+
+def job_id_to_int(job_id):
+    job_id = str(job_id).strip()
+    if job_id.isdigit() and int(job_id) < HASHED_ID_BIT:
+        return int(job_id)
+    digest = hashlib.blake2b(job_id.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little") | HASHED_ID_BIT
+
+def read_ids(path):
+    ids = array("Q")
+    if os.path.exists(path):
+        with open(path, "rb") as file:
+            data = file.read()
+        # A crash mid-append can leave a torn last entry; drop it
+        ids.frombytes(data[:len(data) - len(data) % ids.itemsize])
+    return ids
+
+class JobIdIndex:
+    """Set-like index of processed job IDs (supports `in`, add() and len()) persisted as a sorted array"""
+
+    def __init__(self, path):
+        self.path = path
+        self.log_path = path + ".log"
+        self.ids = read_ids(path)
+        self.pending = set(read_ids(self.log_path))
+        self.unflushed = []
+        self.hits = 0
+
+    def __contains__(self, job_id):
+        value = job_id_to_int(job_id)
+        if value in self.pending:
+            self.hits += 1
+            return True
+        position = bisect_left(self.ids, value)
+        if position < len(self.ids) and self.ids[position] == value:
+            self.hits += 1
+            return True
+        return False
+
+    def __len__(self):
+        return len(self.ids) + len(self.pending)
+
+    def add(self, job_id):
+        value = job_id_to_int(job_id)
+        if value not in self.pending:
+            self.pending.add(value)
+            self.unflushed.append(value)
+
+    def checkpoint(self):
+        """Persist IDs added since the last checkpoint (call after the crawl state commits)"""
+        if self.unflushed:
+            with open(self.log_path, "ab") as file:
+                file.write(array("Q", self.unflushed).tobytes())
+            self.unflushed = []
+        if len(self.pending) >= COMPACT_EVERY:
+            self.compact()
+
+    def compact(self):
+        """Merge the pending IDs into the sorted file and truncate the log"""
+        # Streaming merge of two sorted runs; avoids a set of millions of ints
+        merged = array("Q")
+        last = None
+        for value in merge(self.ids, sorted(self.pending)):
+            if value != last:
+                merged.append(value)
+                last = value
+        self.ids = merged
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "wb") as file:
+            file.write(self.ids.tobytes())
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, self.path)
+        if os.path.exists(self.log_path):
+            os.remove(self.log_path)
+        self.pending = set()
+        self.unflushed = []
+
+    def close(self):
+        self.checkpoint()
+        self.compact()
@@ -0,0 +1,117 @@
+import asyncio
+import time
+
+# Staged pipeline for the async scrapers:
+#
+#   discovery -> detail fetch -> email enrichment -> sink
+#
+# Every stage after discovery reads from its own bounded asyncio.Queue and has
+# its own number of workers. When a stage falls behind, its queue fills up and
+# the put() of the stage before it blocks, so backpressure travels back to
+# discovery instead of jobs piling up in memory; the slow enrichment stage is
+# scaled out by giving it more workers, without touching discovery.
+#
+# Jobs travel as dicts. A stage handler returns the job (updated) to pass it
+# on, or None to drop it. Every job that leaves the pipeline - dropped, failed
+# or through the last stage - is reported to on_done(), which is where crawl
+# checkpoints follow the completed work (crawl_state.PageCheckpoints).
+
+STOP = object()
+
+class Stage:
+    def __init__(self, name, handler, workers=1, queue_size=100):
+        self.name = name
+        self.handler = handler
+        self.workers = workers
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.processed = 0
+        self.dropped = 0
+        self.failed = 0
+        self.busy_seconds = 0.0
+        self.peak_queue = 0
+
+    async def put(self, job):
+        await self.queue.put(job)
+        self.peak_queue = max(self.peak_queue, self.queue.qsize())
+
+class Pipeline:
+    def __init__(self, stages, on_done=None):
+        self.stages = stages
+        self.on_done = on_done
+        self.discovered = 0
+
+    async def run(self, sources, discover, discovery_workers=1):
+        """Feed every source to discover(source, emit) and return once all emitted jobs have left the pipeline"""
+        source_queue = asyncio.Queue()
+        for source in sources:
+            source_queue.put_nowait(source)
+
+        async def emit(job):
+            self.discovered += 1
+            await self.stages[0].put(job)
+
+        async def discovery_worker():
+            while True:
+                try:
+                    source = source_queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                try:
+                    await discover(source, emit)
+                except Exception as e:
+                    print(f"❌ Discovery failed on {source}: {e}")
+
+        async def discovery():
+            await asyncio.gather(*(discovery_worker() for _ in range(discovery_workers)))
+            await self.stop(self.stages[0])
+
+        await asyncio.gather(discovery(), *(self.run_stage(index) for index in range(len(self.stages))))
+
+    async def stop(self, stage):
+        for _ in range(stage.workers):
+            await stage.queue.put(STOP)
+
+    async def run_stage(self, index):
+        stage = self.stages[index]
+        next_stage = self.stages[index + 1] if index + 1 < len(self.stages) else None
+        await asyncio.gather(*(self.stage_worker(stage, next_stage) for _ in range(stage.workers)))
+        if next_stage:
+            await self.stop(next_stage)
+
+    async def stage_worker(self, stage, next_stage):
+        while True:
+            job = await stage.queue.get()
+            if job is STOP:
+                return
+            started = time.perf_counter()
+            failed = False
+            try:
+                result = await stage.handler(job)
+            except Exception as e:
+                print(f"❌ {stage.name} stage failed: {e}")
+                failed = True
+                result = None
+            stage.busy_seconds += time.perf_counter() - started
+            stage.processed += 1
+
+            if result is None:
+                if failed:
+                    stage.failed += 1
+                else:
+                    stage.dropped += 1
+                self.finish(job)
+            elif next_stage:
+                await next_stage.put(result)
+            else:
+                self.finish(result)
+
+    def finish(self, job):
+        if self.on_done:
+            self.on_done(job)
+
+    def print_stats(self):
+        print(f"\n🧵 Pipeline: {self.discovered} jobs discovered")
+        for stage in self.stages:
+            per_job = stage.busy_seconds / stage.processed if stage.processed else 0
+            print(f"  • {stage.name}: {stage.workers} workers, {stage.processed} jobs ({stage.dropped} dropped, "
+                  f"{stage.failed} failed), {per_job:.2f}s/job, queue peak {stage.peak_queue}/{stage.queue.maxsize}")
@@ -0,0 +1,286 @@
+import csv
+import os
+import hashlib
+from collections import Counter
+from datetime import datetime
+from urllib.parse import urlsplit
+from run_metrics import METRICS
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+# Streaming output for the long-running scrapers.
+#
+# Each accepted job is appended to a stream file the moment it is found (fsync
+# every `fsync_every` rows), instead of rewriting the whole result list into a
+# new progress CSV every few hundred jobs. The stream survives crashes and is
+# reopened in append mode by the next run; finalize() turns it into the
+# deliverable file in one sequential pass. A job is identified by its job key
+# (the site's posting id, see job_sources) rather than its URL, whose tracking
+# parameters change between impressions: write() skips a job the stream already
+# holds, and finalize() drops duplicates left by streams written before that.
+#
+# Final files ending in .parquet are written by ParquetSink: batched row groups
+# with the fixed JOB_FIELDS schema, zstd-compressed, so downstream analysis can
+# load hundreds of thousands of rows without parsing CSV. Needs pyarrow.
+#
+# save_run() ends a long run the same way whichever way it ended: the stream
+# goes to <prefix>_100k.csv (or .parquet) after a complete run,
+# <prefix>_partial_100k after Ctrl+C and <prefix>_error_100k after a crash.
+# The smaller scrapers keep their results in memory, build each row with
+# job_row() (or JobSource.job()) and write it with save_jobs(), so their files
+# have the same columns and can be Parquet as well.
+
+# Columns every scraper writes, in order; scrapers may append their own extras to CSV output
+JOB_FIELDS = ["country", "job_category", "title", "company", "location", "description", "email", "source", "job_url", "scraped_at"]
+
+def job_schema():
+    fields = [pa.field(name, pa.string()) for name in JOB_FIELDS if name != "scraped_at"]
+    return pa.schema(fields + [pa.field("scraped_at", pa.timestamp("s"))])
+
+def scraped_at_now():
+    return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+def job_row(**columns):
+    """A row with every JOB_FIELDS column (empty unless given), scraped now"""
+    row = dict.fromkeys(JOB_FIELDS, "")
+    row["scraped_at"] = scraped_at_now()
+    row.update(columns)
+    return row
+
+def canonical_url(job_url):
+    """Job URL without query and fragment, the default job key of a CsvSink"""
+    parts = urlsplit(job_url)
+    return f"{parts.netloc.lower()}{parts.path.rstrip('/')}"
+
+class CsvSink:
+    """Append-only CSV writer: write() per record, finalize() for the final file
+
+    `job_key` maps a job_url to the id a job is deduplicated on (default: the URL
+    without its query string); rows counts distinct jobs, not stream lines.
+    """
+
+    def __init__(self, path, fieldnames, fsync_every=100, job_key=canonical_url):
+        self.path = path
+        self.fieldnames = list(fieldnames)
+        self.fsync_every = fsync_every
+        self.job_key = job_key
+        has_header = os.path.exists(path) and os.path.getsize(path) > 0
+        # 8-byte digests keep the key set small at hundreds of thousands of rows
+        self.keys = set()
+        if has_header:
+            with open(path, newline='', encoding='utf-8') as source:
+                self.keys.update(self.key_of(row) for row in csv.DictReader(source))
+        self.rows = len(self.keys)
+        self.file = open(path, "a", newline='', encoding='utf-8')
+        self.writer = csv.DictWriter(self.file, fieldnames=self.fieldnames, extrasaction="ignore")
+        if not has_header:
+            self.writer.writeheader()
+        self.unsynced = 0
+
+    def key_of(self, record):
+        """Digest of the job key of a record, or of every column but scraped_at when it has no URL"""
+        job_url = record.get("job_url")
+        if job_url:
+            key_text = self.job_key(job_url)
+        else:
+            key_text = "\x1f".join(str(record.get(name) or "") for name in self.fieldnames if name != "scraped_at")
+        return hashlib.blake2b(key_text.encode("utf-8"), digest_size=8).digest()
+
+    def write(self, record):
+        """Append a record; False (nothing written) when the stream already holds that job"""
+        key = self.key_of(record)
+        if key in self.keys:
+            METRICS.count("duplicates_skipped")
+            return False
+        with METRICS.timer("csv_write"):
+            self.writer.writerow(record)
+            self.keys.add(key)
+            self.rows += 1
+            self.unsynced += 1
+            if self.unsynced >= self.fsync_every:
+                self.sync()
+        METRICS.count("jobs_written")
+        return True
+
+    def sync(self):
+        if self.file.closed:
+            return
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.unsynced = 0
+
+    def unique_rows(self):
+        """Header, then every stream row once (streams of older runs may hold a job twice)"""
+        seen = set()
+        with open(self.path, newline='', encoding='utf-8') as source:
+            reader = csv.reader(source)
+            header = next(reader, self.fieldnames)
+            yield header
+            for row in reader:
+                key = self.key_of(dict(zip(header, row)))
+                if key not in seen:
+                    seen.add(key)
+                    yield row
+
+    def finalize(self, final_path):
+        """Write the de-duplicated stream to `final_path` (.csv or .parquet, atomically) and return its row count"""
+        with METRICS.timer("finalize"):
+            return self.write_final(final_path)
+
+    def write_final(self, final_path):
+        self.sync()
+        count = 0
+        temp_path = final_path + ".tmp"
+        rows = self.unique_rows()
+        header = next(rows)
+        if final_path.endswith(".parquet"):
+            target = ParquetSink(temp_path)
+            for row in rows:
+                target.write(dict(zip(header, row)))
+                count += 1
+            target.close()
+        else:
+            with open(temp_path, "w", newline='', encoding='utf-8') as file:
+                writer = csv.writer(file)
+                writer.writerow(header)
+                for row in rows:
+                    writer.writerow(row)
+                    count += 1
+                file.flush()
+                os.fsync(file.fileno())
+        os.replace(temp_path, final_path)
+        return count
+
+    def close(self):
+        if not self.file.closed:
+            self.sync()
+            self.file.close()
+
+class ParquetSink:
+    """Batched Parquet writer with the fixed JOB_FIELDS schema; the file is complete after close()"""
+
+    def __init__(self, path, batch_size=10000, compression="zstd"):
+        if pa is None:
+            raise ImportError("Parquet output needs pyarrow: pip install pyarrow")
+        self.path = path
+        self.batch_size = batch_size
+        self.schema = job_schema()
+        self.writer = pq.ParquetWriter(path, self.schema, compression=compression)
+        self.columns = {name: [] for name in JOB_FIELDS}
+        self.pending = 0
+        self.rows = 0
+
+    def write(self, record):
+        for name in JOB_FIELDS:
+            value = record.get(name)
+            if name == "scraped_at":
+                value = datetime.fromisoformat(value) if value else None
+            elif value is not None:
+                value = str(value)
+            self.columns[name].append(value)
+        self.pending += 1
+        self.rows += 1
+        if self.pending >= self.batch_size:
+            self.write_batch()
+
+    def write_batch(self):
+        if not self.pending:
+            return
+        self.writer.write_table(pa.table(self.columns, schema=self.schema))
+        self.columns = {name: [] for name in JOB_FIELDS}
+        self.pending = 0
+
+    def close(self):
+        if self.writer is not None:
+            self.write_batch()
+            self.writer.close()
+            self.writer = None
+
+def check_output_ext(output_ext):
+    """Fail before crawling, not at finalize(), when the requested final format cannot be written"""
+    if output_ext == ".parquet" and pa is None:
+        raise ImportError("Parquet output needs pyarrow: pip install pyarrow")
+
+def save_jobs(jobs, path, fieldnames=JOB_FIELDS):
+    """Write a scraper's in-memory job rows to one file (the final, partial and error saves); returns the path
+
+    A .parquet path gets the fixed JOB_FIELDS schema; a CSV has `fieldnames`
+    (JOB_FIELDS plus the scraper's extra columns, if any).
+    """
+    if path.endswith(".parquet"):
+        with METRICS.timer("finalize"):
+            target = ParquetSink(path)
+            for job in jobs:
+                target.write(job)
+            target.close()
+        return path
+    with METRICS.timer("csv_write"):
+        with open(path, "w", newline='', encoding='utf-8') as file:
+            writer = csv.DictWriter(file, fieldnames=list(fieldnames), extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(jobs)
+    return path
+
+def save_run(sink, prefix, output_ext, outcome, start_time, reports=()):
+    """Write the stream of a run to its final, partial or error file; returns the path (None without jobs)
+
+    `outcome` is "final", "partial" (interrupted) or "error"; after a final or
+    partial save each of `reports` (callables printing the run's stats) is called,
+    and a final file's jobs are broken down by country and category.
+    """
+    if not sink.rows:
+        if outcome == "final":
+            print("❌ No remote jobs with emails found")
+        return None
+    path = f"{prefix}{'' if outcome == 'final' else '_' + outcome}_100k{output_ext}"
+    try:
+        saved = sink.finalize(path)
+    except Exception as e:
+        print(f"❌ Could not save {path}: {e}")
+        return None
+    if outcome == "error":
+        print(f"✅ Data saved to {path} - {saved} jobs")
+        return path
+    if outcome == "final":
+        print(f"\n✅ Final data saved to {path} - Found {saved} REMOTE jobs with emails")
+        print(f"⏱️  Total runtime: {datetime.now() - start_time}")
+    else:
+        print(f"✅ Partial data saved to {path} - {saved} jobs")
+        print(f"⏱️  Runtime before interruption: {datetime.now() - start_time}")
+    for report in reports:
+        report()
+    if outcome == "final":
+        print_breakdown(path)
+    return path
+
+def print_breakdown(path, columns=(("country", "country"), ("job_category", "category"))):
+    """Jobs per country and per category of a saved CSV or Parquet file"""
+    for column, label in columns:
+        print(f"\n📊 Remote jobs found by {label}:")
+        for value, count in column_counts(path, column).items():
+            print(f"  • {value}: {count} jobs")
+
+def close_quietly(*resources):
+    """close() each resource that was opened, ignoring errors (cleanup after an interrupted or failed run)"""
+    for resource in resources:
+        if resource is None:
+            continue
+        try:
+            resource.close()
+        except Exception:
+            pass
+
+def count_rows(path):
+    with open(path, newline='', encoding='utf-8') as file:
+        return max(sum(1 for _ in csv.reader(file)) - 1, 0)
+
+def column_counts(path, column):
+    """Counter of the values of one column, read from a (possibly large) CSV or Parquet file without loading it"""
+    if path.endswith(".parquet"):
+        return Counter(pq.read_table(path, columns=[column]).column(column).to_pylist())
+    with open(path, newline='', encoding='utf-8') as file:
+        return Counter(row[column] for row in csv.DictReader(file))
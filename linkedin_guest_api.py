@@ -0,0 +1,188 @@
+import requests
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup
+from urllib.parse import urlsplit
+import sys
+from job_extraction import absolute_linkedin_url
+from rate_limiter import LIMITER
+
+# Browserless fetch backend for public LinkedIn job postings.
+#
+# LinkedIn serves the job search list and the job detail pane to logged-out
+# visitors as plain HTML fragments ("jobs-guest" endpoints). Fetching those with
+# a pooled requests.Session costs a few MB per worker instead of a Chromium
+# process; the browser is only started when a posting cannot be read over HTTP
+# (authwall, throttling, or a page that renders client-side).
+#
+#   python linkedin_guest_api.py fixtures/linkedin_job_posting.html   -> parse a saved page offline
+
+GUEST_SEARCH_URL = "https://www.linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/search"
+GUEST_JOB_URL = "https://www.linkedin.com/jobs-guest/jobs/api/jobPosting/{job_id}"
+JOB_VIEW_URL = "https://www.linkedin.com/jobs/view/{job_id}/"
+RESULTS_PER_PAGE = 25
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36',
+    'Accept-Language': 'en-US,en;q=0.9',
+}
+
+# Status codes LinkedIn answers with when it wants a logged-in browser (999 is its throttle code)
+BROWSER_REQUIRED_STATUS = {401, 403, 429, 999}
+
+try:
+    import lxml  # noqa: F401  (C parser, several times faster than html.parser)
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+def new_session(pool_size=10):
+    """requests.Session with a keep-alive connection pool sized for `pool_size` concurrent fetches"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=2)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update(HEADERS)
+    return session
+
+def guest_search_url(search_url, start=0):
+    """Turn a /jobs/search/?... URL into the guest list endpoint for results starting at `start`"""
+    query = urlsplit(search_url).query
+    return f"{GUEST_SEARCH_URL}?{query}&start={start}"
+
+def select_text(soup, selector):
+    element = soup.select_one(selector)
+    return element.get_text(" ", strip=True) if element else ""
+
+def parse_search_results(html):
+    """Parse a guest search page into the same card dicts harvest_job_list() returns
+
+    Only <li> elements that carry a job (an entity URN or a /jobs/view/ link) are
+    cards; navigation lists on an authwall or empty page yield none.
+    """
+    soup = BeautifulSoup(html, HTML_PARSER)
+    cards = []
+    for li in soup.find_all("li"):
+        card = li.select_one("[data-entity-urn]")
+        link = li.select_one("a.base-card__full-link, a[href*='/jobs/view/']")
+        if not card and not link:
+            continue
+        urn = card.get("data-entity-urn", "") if card else ""
+        job_url = link.get("href", "") if link else ""
+        listed = li.find("time")
+        cards.append({
+            "index": len(cards),
+            "job_id": urn.rsplit(":", 1)[-1] if urn else job_id_from_url(job_url),
+            "title": select_text(li, "h3.base-search-card__title"),
+            "company": select_text(li, "h4.base-search-card__subtitle"),
+            "location": select_text(li, "span.job-search-card__location"),
+            "listed_at": listed.get("datetime", "") if listed else "",
+            "job_url": job_url,
+        })
+    return cards
+
+def job_id_from_url(job_url):
+    path = urlsplit(job_url).path.rstrip("/")
+    tail = path.rsplit("-", 1)[-1].rsplit("/", 1)[-1]
+    return tail if tail.isdigit() else ""
+
+def parse_job_posting(html):
+    """Parse a public job posting into the same dict extract_job_details() returns"""
+    soup = BeautifulSoup(html, HTML_PARSER)
+    company_link = soup.select_one("a.topcard__org-name-link, a[href*='/company/']")
+    recruiter_link = soup.select_one("div.message-the-recruiter a[href*='/in/'], a.jobs-poster__name")
+    description = soup.select_one("div.show-more-less-html__markup, div.description__text")
+
+    return {
+        "title": select_text(soup, "h2.topcard__title, h1.topcard__title"),
+        "company": company_link.get_text(" ", strip=True) if company_link else select_text(soup, "span.topcard__flavor"),
+        "location": select_text(soup, "span.topcard__flavor--bullet"),
+        "description": description.get_text(" ", strip=True) if description else "",
+        "recruiter_name": select_text(soup, "div.message-the-recruiter h3") or (recruiter_link.get_text(" ", strip=True) if recruiter_link else ""),
+        "recruiter_url": recruiter_link.get("href", "") if recruiter_link else "",
+        "company_name": company_link.get_text(" ", strip=True) if company_link else "",
+        "company_url": company_link.get("href", "") if company_link else "",
+    }
+
+def fetch_search_page(session, search_url, start=0, timeout=15):
+    """Return the cards of one guest search page, or None when LinkedIn refuses the request"""
+    url = guest_search_url(search_url, start)
+    LIMITER.wait(url)
+    response = session.get(url, timeout=timeout)
+    # A followed authwall/login redirect comes back as 200 with a page that is not the results list
+    if LIMITER.record(url, response.status_code, response.url) or response.status_code in BROWSER_REQUIRED_STATUS:
+        return None
+    response.raise_for_status()
+    return parse_search_results(response.text)
+
+def fetch_job_posting(session, job_id, timeout=15):
+    """Return the parsed posting over HTTP, or None when the page needs a real browser"""
+    url = GUEST_JOB_URL.format(job_id=job_id)
+    LIMITER.wait(url)
+    response = session.get(url, timeout=timeout, allow_redirects=False)
+    reason = LIMITER.record(url, response.status_code, response.headers.get("location", ""))
+    if reason or response.status_code in BROWSER_REQUIRED_STATUS or response.is_redirect:
+        return None
+    response.raise_for_status()
+    details = parse_job_posting(response.text)
+    # An empty title means the markup was rendered client-side (or is an authwall stub)
+    return details if details["title"] else None
+
+class BrowserFallback:
+    """Starts Chromium on first use only, for the postings the HTTP backend cannot read"""
+
+    def __init__(self, headless=None):
+        self.headless = headless
+        self.playwright = None
+        self.browser = None
+        self.page = None
+        self.pages_loaded = 0
+
+    def fetch_job_posting(self, job_id):
+        from playwright.sync_api import sync_playwright
+        from browser_profile import get_profile
+        from job_extraction import extract_job_details
+        from scraper_waits import LINKEDIN_DETAIL_SELECTOR, goto_and_wait
+
+        if self.page is None:
+            self.playwright = sync_playwright().start()
+            profile = get_profile()
+            self.browser = profile.launch(self.playwright, headless=self.headless)
+            self.page = profile.new_context(self.browser).new_page()
+
+        goto_and_wait(self.page, JOB_VIEW_URL.format(job_id=job_id), LINKEDIN_DETAIL_SELECTOR, fixed_ms=3000)
+        self.pages_loaded += 1
+        return extract_job_details(self.page)
+
+    def close(self):
+        if self.browser:
+            self.browser.close()
+        if self.playwright:
+            self.playwright.stop()
+        self.playwright = self.browser = self.page = None
+
+def fetch_job_details(session, job_id, fallback=None):
+    """HTTP first, browser only if the guest endpoint cannot serve the posting"""
+    try:
+        details = fetch_job_posting(session, job_id)
+    except requests.RequestException as e:
+        print(f"⚠️  HTTP fetch failed for job {job_id}: {e}")
+        details = None
+
+    if details is None and fallback is not None:
+        details = fallback.fetch_job_posting(job_id)
+
+    if details:
+        details["recruiter_url"] = absolute_linkedin_url(details["recruiter_url"])
+        details["company_url"] = absolute_linkedin_url(details["company_url"])
+    return details
+
+if __name__ == "__main__":
+    # Offline check against a saved page: search results if it is a list of <li> cards, else a posting
+    with open(sys.argv[1], encoding="utf-8") as file:
+        html = file.read()
+    if html.lstrip().startswith("<li"):
+        for card in parse_search_results(html):
+            print(card)
+    else:
+        for key, value in parse_job_posting(html).items():
+            print(f"{key}: {value[:120]!r}")
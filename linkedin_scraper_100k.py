@@ -1,8 +1,19 @@
 from playwright.sync_api import sync_playwright
-import time
-import re
-import csv
+from playwright.async_api import async_playwright
+import asyncio
+import sys
 from datetime import datetime
+from crawl_state import CrawlState
+from job_index import JobIdIndex
+from browser_profile import TrafficMeter, get_profile
+from browser_pool import AsyncContextPool, ContextPool
+from linkedin_session import SESSION_PATH, ensure_session, login_interactively
+from email_cache import ProfileEmailCache
+from job_sinks import JOB_FIELDS, CsvSink, check_output_ext, close_quietly, save_run
+from job_sources import LINKEDIN
+from run_metrics import METRICS, finish_run, start_run
+from text_classify import extract_emails, is_remote
+from scraper_waits import print_wait_savings, reset_wait_stats
 
 # Multiple job search URLs for different roles - REMOTE ONLY in specific countries
 # f_WT=2 parameter filters for remote jobs on LinkedIn
@@ -16,416 +27,377 @@ COUNTRIES = {
 }
 
 JOB_ROLES = [
-    "data%20scientist",
-    "ai%20engineer", 
-    "data%20analysis",
-    "artificial%20intelligence%20engineer",
-    "data%20analyst"
+    "data scientist",
+    "ai engineer",
+    "data analysis",
+    "artificial intelligence engineer",
+    "data analyst"
 ]
 
+def linkedin_searches(countries=None, roles=None):
+    """(search url, country, role) for every country x role
+
+    `countries` is a list of COUNTRIES names or a {name: geoId} dict for countries not listed there.
+    """
+    if countries is None:
+        countries = COUNTRIES
+    if not isinstance(countries, dict):
+        unknown = [country for country in countries if country not in COUNTRIES]
+        if unknown:
+            raise ValueError(f"No LinkedIn geoId for {', '.join(unknown)}; pass countries as a {{name: geoId}} mapping")
+        countries = {country: COUNTRIES[country] for country in countries}
+    searches = []
+    for country, geo_id in countries.items():
+        for role in roles or JOB_ROLES:
+            searches.append((LINKEDIN.search_url(role, country, geo_id), country, role))
+    return searches
+
 # Generate URLs for each job role in each country
-JOB_SEARCH_URLS = []
-for country, geo_id in COUNTRIES.items():
-    for role in JOB_ROLES:
-        url = f"https://www.linkedin.com/jobs/search/?keywords={role}&location={country}&geoId={geo_id}&f_WT=2"
-        JOB_SEARCH_URLS.append((url, country, role.replace("%20", " ")))
-
-def extract_email(text):
-    # More comprehensive email pattern
-    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-    return re.findall(email_pattern, text)
-
-def extract_email_from_profile(page, profile_url):
-    """Extract email from LinkedIn profile page"""
-    try:
-        page.goto(profile_url)
-        page.wait_for_timeout(3000)
-        
-        # Look for contact info button
-        contact_button = page.query_selector("a[data-control-name='contact_see_more']")
-        if not contact_button:
-            contact_button = page.query_selector("button:has-text('Contact info')")
-        if not contact_button:
-            contact_button = page.query_selector("a:has-text('Contact info')")
-        
-        if contact_button:
-            contact_button.click()
-            page.wait_for_timeout(2000)
-            
-            # Extract email from contact info modal
-            email_elements = page.query_selector_all("a[href^='mailto:']")
-            if email_elements:
-                for element in email_elements:
-                    href = element.get_attribute('href')
-                    if href and 'mailto:' in href:
-                        email = href.replace('mailto:', '').strip()
-                        return [email]
-            
-            # Also check for email in text content of modal
-            contact_section = page.query_selector("section.artdeco-modal")
-            if contact_section:
-                contact_text = contact_section.inner_text()
-                emails = extract_email(contact_text)
-                if emails:
-                    return emails
-                    
-            # Close the modal
-            close_button = page.query_selector("button[aria-label='Dismiss']")
-            if close_button:
-                close_button.click()
-                page.wait_for_timeout(1000)
-        
-        # Check the about section for emails
-        about_section = page.query_selector("section.artdeco-card:has-text('About')")
-        if about_section:
-            about_text = about_section.inner_text()
-            emails = extract_email(about_text)
-            if emails:
-                return emails
-        
-        # For company pages, check additional sections
-        if '/company/' in profile_url:
-            # Check company overview section
-            overview_section = page.query_selector("section[data-module='OverviewModule']")
-            if overview_section:
-                overview_text = overview_section.inner_text()
-                emails = extract_email(overview_text)
-                if emails:
-                    return emails
-            
-            # Check company details/contact section
-            contact_section = page.query_selector("section:has-text('Website')")
-            if contact_section:
-                contact_text = contact_section.inner_text()
-                emails = extract_email(contact_text)
-                if emails:
-                    return emails
-                    
-    except Exception as e:
-        print(f"❌ Error extracting email from profile: {e}")
+JOB_SEARCH_URLS = linkedin_searches()
+
+# Number of browser contexts crawling searches at the same time in concurrent mode
+CONCURRENT_WORKERS = 4
+# Extra tabs per worker for recruiter/company lookups, so enrichment never navigates the results page
+PROFILE_PAGES_PER_WORKER = 2
+
+# Finished searches/pages/job cards, so a restarted run resumes where it stopped
+CRAWL_STATE_PATH = "linkedin_crawl_state.db"
+JOB_INDEX_PATH = "linkedin_job_ids.idx"
+# Emails (or their absence) per recruiter/company profile, shared with linkedin_scraper.py
+PROFILE_CACHE_PATH = "linkedin_profile_emails.db"
+RESULTS_PER_PAGE = LINKEDIN.page_size
+
+# Accepted jobs are appended here as they are found; the final CSV/Parquet files are written from it
+STREAM_PATH = "linkedin_jobs_100k.stream.csv"
+FIELDNAMES = JOB_FIELDS + ["recruiter_name"]
+
+def is_remote_job(title, company, description, location):
+    """Check the job text for remote work indicators"""
+    return is_remote(title, company, description, location)
+
+def ask_login_choice():
+    """'1' to log in by hand, '2' to continue logged out"""
+    print("🔐 LinkedIn Login Options:")
+    print("1. Login for better profile access (RECOMMENDED)")
+    print("2. Skip login and continue with limited access")
     
-    return []
+    while True:
+        choice = input("\nEnter your choice (1 or 2): ").strip()
+        if choice in ['1', '2']:
+            return choice
+        print("Please enter 1 or 2")
+
+def linkedin_login(playwright, profile, interactive=True):
+    """The saved session if LinkedIn still accepts it, else a manual login if the user wants one (None = logged out)
+
+    interactive=False (scheduled runs) never prompts: without a valid saved session the run continues logged out.
+    """
+    session = ensure_session(playwright, profile)
+    if session is None and interactive and ask_login_choice() == '1':
+        print("\n🔐 LinkedIn Login Required")
+        session = login_interactively(playwright)
+
+    if session:
+        print("🎉 Logged in - recruiter and company profiles show more contact information\n")
+    else:
+        print("\n⚠️  Continuing without login - profile access will be limited")
+        print("📧 Email extraction will focus on job descriptions and public info\n")
+    return session
+
+def screen_job(details):
+    """(is remote, emails in the description) of one job; profiles are only checked for remote jobs without one"""
+    remote = is_remote_job(details["title"], details["company"], details["description"], details["location"])
+    return remote, extract_emails(details["description"])
+
+def record_job(card, details, emails, remote, country, job_role, sink, stats, target_jobs, crawl_state, job_index):
+    """Stream a remote job with an email, report the others, and mark the posting handled"""
+    title = details["title"]
+    company = details["company"]
+    if emails and remote:
+        if stats["job_count"] >= target_jobs:
+            return
+        stats["consecutive_no_emails"] = 0
+        sink.write(LINKEDIN.job(title, company, details["location"], details["description"][:200], card["job_url"],
+                                country=country, job_category=job_role, email=", ".join(emails),
+                                recruiter_name=details["recruiter_name"]))
+        stats["job_count"] = sink.rows
+        print(f"✅ Found remote job {stats['job_count']} with email: {title} at {company} ({country})")
+
+        # Every job is already on disk; just report progress every 1000 jobs
+        if stats["job_count"] % 1000 == 0:
+            sink.sync()
+            print(f"\n💾 {stats['job_count']} jobs streamed to {STREAM_PATH}\n")
 
-def scrape_linkedin_jobs():
+    elif not remote:
+        print(f"⚠️  Skipped non-remote job: {title} at {company}")
+        METRICS.count("skipped_non_remote")
+    else:
+        stats["consecutive_no_emails"] += 1
+        print(f"📧 Skipped remote job without email: {title} at {company}")
+        METRICS.count("skipped_no_email")
+
+        # If too many consecutive jobs without emails, suggest manual intervention
+        if stats["consecutive_no_emails"] >= 20:
+            print(f"⚠️  Found {stats['consecutive_no_emails']} consecutive jobs without emails. Consider manual login for better profile access.")
+            stats["consecutive_no_emails"] = 0
+
+    crawl_state.mark_job_done()
+    if card["job_id"]:
+        job_index.add(card["job_id"])
+
+def save_linkedin_run(sink, output_ext, outcome, start_time, traffic, crawl_state, job_index, profile_cache, pool=None):
+    """save_run() with the stats of a LinkedIn run"""
+    reports = [print_wait_savings, finish_run, lambda: traffic.print_stats(crawl_state.jobs_marked)]
+    if pool:
+        reports.append(pool.print_stats)
+    reports.append(lambda: print(f"🔁 Skipped {job_index.hits} postings already seen under another search, country or run"))
+    reports.append(profile_cache.print_stats)
+    save_run(sink, "linkedin_jobs", output_ext, outcome, start_time, reports)
+    sink.close()
+
+def scrape_linkedin_jobs(output_ext=".csv", searches=None, target_jobs=100000, max_pages=None, interactive=True):
+    """Sequential crawl of `searches` (default: every country x role) until `target_jobs` jobs with emails
+
+    max_pages limits the results pages read per search (None = all of them).
+    """
+    searches = JOB_SEARCH_URLS if searches is None else searches
+    start_time = datetime.now()
+    traffic = pool = crawl_state = job_index = profile_cache = sink = None
+    outcome = "final"
     try:
         with sync_playwright() as p:
-            browser = p.chromium.launch(headless=False)  # set headless=True to hide browser
-            context = browser.new_context()
-            page = context.new_page()
-
-            jobs_data = []
-            job_count = 0
-            consecutive_no_emails = 0
-            start_time = datetime.now()
-            
-            print("🚀 Starting LinkedIn job scraper for REMOTE positions with emails...")
-            print("🎯 TARGET: 100,000 jobs with emails")
-            print("🌍 Searching in: Germany, China, United Kingdom, Australia, Canada")
-            print("📌 Press Ctrl+C to stop and save partial results")
-            print("🔍 This will now check recruiter and company profiles for contact emails")
-            print("⏱️  This may take several hours to complete - progress will be saved regularly")
-            print(f"🕐 Started at: {start_time.strftime('%Y-%m-%d %H:%M:%S')}\n")
-            
-            # Ask user if they want to login
-            print("🔐 LinkedIn Login Options:")
-            print("1. Login for better profile access (RECOMMENDED)")
-            print("2. Skip login and continue with limited access")
-            
-            while True:
-                try:
-                    choice = input("\nEnter your choice (1 or 2): ").strip()
-                    if choice in ['1', '2']:
-                        break
-                    else:
-                        print("Please enter 1 or 2")
-                except KeyboardInterrupt:
-                    print("\n❌ Script cancelled by user")
-                    return
-            
-            login_successful = False
-            
-            if choice == '1':
-                # ✅ Step 1: Login to LinkedIn
-                print("\n🔐 LinkedIn Login Required")
-            page.goto("https://www.linkedin.com/login")
-            print("Please log in to LinkedIn manually in the browser window...")
-            print("⏳ Waiting for you to complete login (60 seconds)...")
-            print("📝 Make sure you're logged in before the timer expires!")
-            print("💡 TIP: If you need more time, the script will check again after 60 seconds\n")
-            
-            login_successful = False
-            max_login_attempts = 3
-            login_attempt = 1
-            
-            while not login_successful and login_attempt <= max_login_attempts:
-                if login_attempt > 1:
-                    print(f"🔄 Login attempt {login_attempt}/{max_login_attempts}")
-                    print("⏳ Additional 30 seconds to complete login...\n")
-                    time.sleep(30)
-                else:
-                    time.sleep(60)
-                
-                # Check if login was successful
-                try:
-                    # Try to navigate to LinkedIn feed to verify login
-                    page.goto("https://www.linkedin.com/feed/")
-                    page.wait_for_timeout(3000)
-                    
-                    # Check if we're redirected back to login page or if we can see feed elements
-                    if "login" in page.url:
-                        print(f"❌ Login attempt {login_attempt} failed - still on login page")
-                        if login_attempt < max_login_attempts:
-                            print("🔄 Please complete login in the browser window...")
-                    else:
-                        # Check for feed elements to confirm we're logged in
-                        feed_element = page.query_selector("main.feed-scaffold-layout__content")
-                        if feed_element:
-                            login_successful = True
-                            print("✅ Login successful! Enhanced profile access enabled")
-                            print("🎉 You can now access more contact information from profiles\n")
-                        else:
-                            print(f"⚠️  Login verification inconclusive on attempt {login_attempt}")
-                            if login_attempt < max_login_attempts:
-                                print("🔄 Please ensure you're fully logged in...")
-                                
-                except Exception as e:
-                    print(f"⚠️  Could not verify login status on attempt {login_attempt}: {e}")
-                
-                login_attempt += 1
-            
-            if not login_successful:
-                print("⚠️  Proceeding without confirmed login - profile access may be limited")
-                print("📧 Email extraction will focus on job descriptions and public info\n")
-            else:
-                print("\n⚠️  Skipping login - profile access will be limited")
-                print("📧 Email extraction will focus on job descriptions and public info\n")
-            
-            # ✅ Step 2: Search through multiple job categories and countries (Remote jobs only)
-            for search_url, country, job_role in JOB_SEARCH_URLS:
-                if job_count >= 100000:
-                    break
-                    
-                print(f"\n🔍 Searching for: {job_role} in {country}")
-                
-                try:
-                    page.goto(search_url)
-                    page.wait_for_timeout(3000)
-                except Exception as e:
-                    print(f"❌ Error loading page for {job_role} in {country}: {e}")
-                    continue
-            
-                page_num = 0
-
-                while job_count < 100000:
-                    # Get current page job cards
-                    job_cards = page.query_selector_all("ul.jobs-search__results-list li")
-                    
-                    if not job_cards:
-                        print(f"No more job cards found for {job_role} in {country}")
+            # ✅ Step 1: LinkedIn session - reloaded from disk, a manual login only when it has expired
+            profile = get_profile()
+            try:
+                session = linkedin_login(p, profile, interactive)
+            except KeyboardInterrupt:
+                print("\n❌ Script cancelled by user")
+                return
+
+            # Every (recycled) context starts from the session and keeps the saved copy fresh
+            traffic = TrafficMeter()
+            pool = ContextPool(p, profile, traffic, pages=2, storage_state=session,
+                               storage_state_path=SESSION_PATH if session else None)
+            # Recruiter/company lookups run on their own tab so the results page never reloads
+            page, profile_page = pool.open()
+
+            def recycled_page():
+                """The new results page if the context was just recycled (profile tab swapped too), else None"""
+                nonlocal page, profile_page
+                pages = pool.maybe_recycle()
+                if pages:
+                    page, profile_page = pages
+                    return page
+
+            try:
+                reset_wait_stats()
+                start_run("linkedin_100k")
+                crawl_state = CrawlState(CRAWL_STATE_PATH)
+                job_index = JobIdIndex(JOB_INDEX_PATH)
+                profile_cache = ProfileEmailCache(PROFILE_CACHE_PATH)
+                sink = CsvSink(STREAM_PATH, FIELDNAMES, job_key=LINKEDIN.job_key)
+                stats = {"job_count": sink.rows, "consecutive_no_emails": 0}
+
+                print("🚀 Starting LinkedIn job scraper for REMOTE positions with emails...")
+                print(f"🎯 TARGET: {target_jobs:,} jobs with emails")
+                print(f"🌍 Searching in: {', '.join(dict.fromkeys(country for _, country, _ in searches))}")
+                print("📌 Press Ctrl+C to stop and save partial results")
+                print("🔍 This will now check recruiter and company profiles for contact emails")
+                print("⏱️  This may take several hours to complete - progress will be saved regularly")
+                print(f"🕐 Started at: {start_time.strftime('%Y-%m-%d %H:%M:%S')}\n")
+                if sink.rows:
+                    print(f"♻️  Resuming crawl from {CRAWL_STATE_PATH}: {sink.rows} jobs already in {STREAM_PATH}\n")
+
+                # ✅ Step 2: Search through multiple job categories and countries (Remote jobs only)
+                for search_url, country, job_role in searches:
+                    if stats["job_count"] >= target_jobs:
                         break
 
-                    for job in job_cards:
-                        if job_count >= 100000:
+                    if crawl_state.is_search_finished(search_url):
+                        print(f"⏭️  Already finished: {job_role} in {country}")
+                        continue
+
+                    walk = LINKEDIN.listing_pages(page, search_url, f"{job_role} in {country}", max_pages=max_pages,
+                                                  crawl_state=crawl_state, reopen=recycled_page)
+                    if not walk.in_range():
+                        print(f"⏭️  Page limit reached earlier: {job_role} in {country}")
+                        continue
+                    print(f"\n🔍 Searching for: {job_role} in {country}")
+                    if walk.page_num:
+                        print(f"♻️  Resuming at page {walk.page_num + 1}")
+                    walk.page = recycled_page() or walk.page
+
+                    for cards in walk:
+                        # Postings already handled under another search, country or run are skipped before the click
+                        for card, details in LINKEDIN.job_details(walk.page, cards, seen=job_index):
+                            try:
+                                remote, emails = screen_job(details)
+                                if not emails and remote:
+                                    print(f"🔍 Looking for recruiter profile for: {details['title']} at {details['company']}")
+                                    emails = LINKEDIN.contact_emails(details, profile_page, profile_cache)
+                                record_job(card, details, emails, remote, country, job_role, sink, stats, target_jobs,
+                                           crawl_state, job_index)
+                                pool.job_done()
+                            except Exception as e:
+                                print(f"❌ Error processing job: {e}")
+                            if stats["job_count"] >= target_jobs:
+                                break
+                        if stats["job_count"] >= target_jobs:
                             break
-                        
-                        try:
-                            job.click()
-                            page.wait_for_timeout(2000)
-
-                            title = page.query_selector("h2.topcard__title").inner_text() if page.query_selector("h2.topcard__title") else ""
-                            company = page.query_selector("span.topcard__flavor").inner_text() if page.query_selector("span.topcard__flavor") else ""
-                            description = page.query_selector("div.description__text").inner_text() if page.query_selector("div.description__text") else ""
-                            
-                            # Check for remote work indicators
-                            location_element = page.query_selector("span.topcard__flavor--bullet")
-                            location = location_element.inner_text() if location_element else ""
-                            
-                            # Verify job is remote
-                            remote_keywords = ["remote", "work from home", "telecommute", "anywhere", "distributed", "virtual"]
-                            full_text = (title + " " + company + " " + description + " " + location).lower()
-                            is_remote = any(keyword in full_text for keyword in remote_keywords)
-
-                            # First check description for emails (rare but possible)
-                            emails = extract_email(description)
-                            recruiter_name = ""
-                            
-                            # If no emails in description, try to get from recruiter profile
-                            if not emails and is_remote:
-                                print(f"🔍 Looking for recruiter profile for: {title} at {company}")
-                                
-                                # Look for recruiter information
-                                recruiter_element = page.query_selector("a.app-aware-link:has-text('Recruiter')")
-                                if not recruiter_element:
-                                    recruiter_element = page.query_selector("a[href*='/in/']:has(img)")
-                                if not recruiter_element:
-                                    recruiter_element = page.query_selector("a.jobs-poster__name")
-                                    
-                                if recruiter_element:
-                                    recruiter_name = recruiter_element.inner_text().strip()
-                                    recruiter_url = recruiter_element.get_attribute('href')
-                                    
-                                    if recruiter_url and '/in/' in recruiter_url:
-                                        if not recruiter_url.startswith('https://'):
-                                            recruiter_url = 'https://www.linkedin.com' + recruiter_url
-                                        
-                                        print(f"📧 Checking recruiter profile: {recruiter_name}")
-                                        profile_emails = extract_email_from_profile(page, recruiter_url)
-                                        if profile_emails:
-                                            emails = profile_emails
-                                            print(f"✅ Found email in recruiter profile: {emails[0]}")
-                                        else:
-                                            print(f"❌ No email found in recruiter profile")
-                                        
-                                        # Go back to job page
-                                        page.go_back()
-                                        page.wait_for_timeout(2000)
-                                
-                                # If still no emails, try company page
-                                if not emails:
-                                    company_element = page.query_selector("a.jobs-details-top-card__company-url")
-                                    if not company_element:
-                                        company_element = page.query_selector("a[href*='/company/']")
-                                    
-                                    if company_element:
-                                        company_url = company_element.get_attribute('href')
-                                        if company_url and '/company/' in company_url:
-                                            if not company_url.startswith('https://'):
-                                                company_url = 'https://www.linkedin.com' + company_url
-                                            
-                                            print(f"🏢 Checking company profile: {company}")
-                                            company_emails = extract_email_from_profile(page, company_url)
-                                            if company_emails:
-                                                emails = company_emails
-                                                print(f"✅ Found email in company profile: {emails[0]}")
-                                            else:
-                                                print(f"❌ No email found in company profile")
-                                            
-                                            # Go back to job page
-                                            page.go_back()
-                                            page.wait_for_timeout(2000)
-                            
-                            # Only add jobs that have emails AND are remote
-                            if emails and is_remote:
-                                consecutive_no_emails = 0
-                                jobs_data.append({
-                                    "country": country,
-                                    "job_category": job_role,
-                                    "title": title,
-                                    "company": company,
-                                    "location": location,
-                                    "recruiter_name": recruiter_name,
-                                    "description": description[:200],
-                                    "email": ", ".join(emails)
-                                })
-                                job_count += 1
-                                print(f"✅ Found remote job {job_count} with email: {title} at {company} ({country})")
-                                
-                                # Save progress every 1000 jobs
-                                if job_count % 1000 == 0:
-                                    print(f"\n💾 Auto-saving progress at {job_count} jobs...")
-                                    with open(f"linkedin_jobs_progress_{job_count}.csv", "w", newline='', encoding='utf-8') as file:
-                                        writer = csv.DictWriter(file, fieldnames=jobs_data[0].keys())
-                                        writer.writeheader()
-                                        writer.writerows(jobs_data)
-                                    print(f"✅ Progress saved to linkedin_jobs_progress_{job_count}.csv\n")
-                                    
-                            elif not is_remote:
-                                print(f"⚠️  Skipped non-remote job: {title} at {company}")
-                            elif is_remote and not emails:
-                                consecutive_no_emails += 1
-                                print(f"📧 Skipped remote job without email: {title} at {company}")
-                                
-                                # If too many consecutive jobs without emails, suggest manual intervention
-                                if consecutive_no_emails >= 20:
-                                    print(f"⚠️  Found {consecutive_no_emails} consecutive jobs without emails. Consider manual login for better profile access.")
-                                    consecutive_no_emails = 0
-                                
-                        except Exception as e:
-                            print(f"❌ Error processing job: {e}")
-                            continue
-
-                    # Navigate to next page for current job category
-                    page_num += 1
+                        job_index.checkpoint()
+            finally:
+                close_quietly(pool)
+
+    except KeyboardInterrupt:
+        print(f"\n⚠️  Script interrupted by user. Saving {sink.rows if sink else 0} jobs found so far...")
+        outcome = "partial"
+    except Exception as e:
+        print(f"❌ Unexpected error: {e}")
+        outcome = "error"
+    finally:
+        close_quietly(crawl_state, job_index, profile_cache)
+
+    if sink:
+        save_linkedin_run(sink, output_ext, outcome, start_time, traffic, crawl_state, job_index, profile_cache, pool)
+
+async def finish_job_async(card, details, country, job_role, sink, stats, target_jobs, crawl_state, job_index,
+                           profile_cache, profile_pages):
+    """Email enrichment and output for one job; runs as a task while the listing walk moves on"""
+    try:
+        remote, emails = screen_job(details)
+        if not emails and remote:
+            emails = await LINKEDIN.contact_emails_async(details, profile_pages, profile_cache)
+        record_job(card, details, emails, remote, country, job_role, sink, stats, target_jobs, crawl_state, job_index)
+    except Exception as e:
+        print(f"❌ Error processing job: {e}")
+
+async def scrape_search_async(pool, search_url, country, job_role, sink, stats, target_jobs, crawl_state, job_index,
+                              profile_cache, profile_pages, max_pages=None):
+    """Walk every results page of one (country, role) search on its own page
+
+    Detail panes are read on the results page; enrichment of each job is handed
+    to a task on the profile page pool so the walk continues meanwhile. A page
+    is only checkpointed once all of its enrichment tasks have finished.
+    """
+    page = await pool.context.new_page()
+    enrichment = []
+    try:
+        print(f"\n🔍 Searching for: {job_role} in {country}")
+        walk = LINKEDIN.listing_pages(page, search_url, f"{job_role} in {country}", max_pages=max_pages,
+                                      crawl_state=crawl_state)
+        async for cards in walk:
+            enrichment = []
+            async for card, details in LINKEDIN.job_details_async(page, cards, seen=job_index):
+                pool.job_done()
+                enrichment.append(asyncio.create_task(finish_job_async(
+                    card, details, country, job_role, sink, stats, target_jobs, crawl_state, job_index,
+                    profile_cache, profile_pages
+                )))
+                if stats["job_count"] >= target_jobs:
+                    break
+
+            await asyncio.gather(*enrichment)
+            if stats["job_count"] >= target_jobs:
+                break
+            job_index.checkpoint()
+    finally:
+        # Let enrichment still running for an interrupted page finish before the context goes away
+        await asyncio.gather(*enrichment)
+        await page.close()
+
+async def crawl_searches_concurrently(sink, workers, target_jobs, crawl_state, job_index, profile_cache, traffic,
+                                      session=None, searches=None, max_pages=None):
+    """Run up to `workers` searches at once, one browser context per worker (all sharing `session`)
+
+    Each worker's context is recycled between its searches (see browser_pool.AsyncContextPool).
+    """
+    stats = {"job_count": sink.rows, "consecutive_no_emails": 0}
+    work_items = asyncio.Queue()
+    for item in JOB_SEARCH_URLS if searches is None else searches:
+        if not crawl_state.is_search_finished(item[0]):
+            work_items.put_nowait(item)
+
+    async with async_playwright() as p:
+        profile = get_profile()
+        browser = await profile.launch_async(p)
+
+        pools = [AsyncContextPool(p, profile, traffic, pages=PROFILE_PAGES_PER_WORKER, storage_state=session, browser=browser)
+                 for _ in range(workers)]
+
+        async def worker(worker_id, pool):
+            try:
+                pages = await pool.open()
+                while stats["job_count"] < target_jobs:
                     try:
-                        # Look for next button and click it
-                        next_button = page.query_selector("button[aria-label='Page forward']")
-                        if not next_button:
-                            next_button = page.query_selector("button[aria-label='Next']")
-                        
-                        if next_button and not next_button.is_disabled():
-                            next_button.click()
-                            page.wait_for_timeout(3000)
-                            print(f"📄 Moving to page {page_num + 1} for {job_role} in {country} (Found {job_count} jobs so far)")
-                        else:
-                            print(f"No more pages available for {job_role} in {country}")
-                            break
-                    except Exception as e:
-                        print(f"Error navigating to next page for {job_role} in {country}: {e}")
+                        search_url, country, job_role = work_items.get_nowait()
+                    except asyncio.QueueEmpty:
                         break
+                    profile_pages = asyncio.Queue()
+                    for page in pages:
+                        profile_pages.put_nowait(page)
+                    try:
+                        await scrape_search_async(pool, search_url, country, job_role, sink, stats, target_jobs, crawl_state, job_index,
+                                                  profile_cache, profile_pages, max_pages)
+                    except Exception as e:
+                        print(f"❌ Worker {worker_id} failed on {job_role} in {country}: {e}")
+                    # Between searches no page of this worker is in use
+                    pages = await pool.maybe_recycle() or pages
+            finally:
+                await pool.close()
 
-            browser.close()
-
-            # ✅ Save final CSV
-            if jobs_data:
-                final_time = datetime.now()
-                duration = final_time - start_time
-                
-                with open("linkedin_jobs_100k.csv", "w", newline='', encoding='utf-8') as file:
-                    writer = csv.DictWriter(file, fieldnames=jobs_data[0].keys())
-                    writer.writeheader()
-                    writer.writerows(jobs_data)
-
-                print(f"\n✅ Final data saved to linkedin_jobs_100k.csv - Found {len(jobs_data)} REMOTE jobs with emails")
-                print(f"⏱️  Total runtime: {duration}")
-                
-                # Show statistics by country and job category
-                from collections import Counter
-                country_counts = Counter([job['country'] for job in jobs_data])
-                category_counts = Counter([job['job_category'] for job in jobs_data])
-                
-                print("\n📊 Remote jobs found by country:")
-                for country, count in country_counts.items():
-                    print(f"  • {country}: {count} jobs")
-                
-                print("\n📊 Remote jobs found by category:")
-                for category, count in category_counts.items():
-                    print(f"  • {category}: {count} jobs")
-            else:
-                print("❌ No remote jobs with emails found")
-                
-    except KeyboardInterrupt:
-        print(f"\n⚠️  Script interrupted by user. Saving {len(jobs_data)} jobs found so far...")
-        
-        if jobs_data:
-            final_time = datetime.now()
-            duration = final_time - start_time
-            
-            with open("linkedin_jobs_partial_100k.csv", "w", newline='', encoding='utf-8') as file:
-                writer = csv.DictWriter(file, fieldnames=jobs_data[0].keys())
-                writer.writeheader()
-                writer.writerows(jobs_data)
-            print(f"✅ Partial data saved to linkedin_jobs_partial_100k.csv - {len(jobs_data)} jobs")
-            print(f"⏱️  Runtime before interruption: {duration}")
-        
         try:
-            browser.close()
-        except:
-            pass
-            
+            await asyncio.gather(*(worker(i + 1, pool) for i, pool in enumerate(pools)))
+        finally:
+            await browser.close()
+        recycles = sum(pool.recycles for pool in pools)
+        if recycles:
+            print(f"♻️  Browser contexts recycled {recycles} times across {workers} workers")
+
+def scrape_linkedin_jobs_concurrent(workers=CONCURRENT_WORKERS, target_jobs=100000, output_ext=".csv", searches=None,
+                                    max_pages=None):
+    """Worker-pool mode: each (country, role) search is crawled by one of N concurrent browser contexts"""
+    searches = JOB_SEARCH_URLS if searches is None else searches
+    start_time = datetime.now()
+    reset_wait_stats()
+    start_run("linkedin_100k")
+    crawl_state = CrawlState(CRAWL_STATE_PATH)
+    job_index = JobIdIndex(JOB_INDEX_PATH)
+    profile_cache = ProfileEmailCache(PROFILE_CACHE_PATH)
+    sink = CsvSink(STREAM_PATH, FIELDNAMES, job_key=LINKEDIN.job_key)
+    traffic = TrafficMeter()
+    # Saved login (see linkedin_session.py) if it is still valid; workers never prompt for one
+    with sync_playwright() as p:
+        session = ensure_session(p)
+
+    print("🚀 Starting concurrent LinkedIn job scraper for REMOTE positions with emails...")
+    print(f"🎯 TARGET: {target_jobs:,} jobs with emails")
+    print(f"⚡ Workers: {workers} browser contexts over {len(searches)} searches")
+    print("📌 Press Ctrl+C to stop and save partial results")
+    print(f"🕐 Started at: {start_time.strftime('%Y-%m-%d %H:%M:%S')}\n")
+    if sink.rows:
+        print(f"♻️  Resuming crawl from {CRAWL_STATE_PATH}: {sink.rows} jobs already in {STREAM_PATH}\n")
+
+    outcome = "final"
+    try:
+        asyncio.run(crawl_searches_concurrently(sink, workers, target_jobs, crawl_state, job_index, profile_cache, traffic,
+                                                session, searches, max_pages))
+    except KeyboardInterrupt:
+        print(f"\n⚠️  Script interrupted by user. Saving {sink.rows} jobs found so far...")
+        outcome = "partial"
     except Exception as e:
         print(f"❌ Unexpected error: {e}")
-        
-        if jobs_data:
-            with open("linkedin_jobs_error_100k.csv", "w", newline='', encoding='utf-8') as file:
-                writer = csv.DictWriter(file, fieldnames=jobs_data[0].keys())
-                writer.writeheader()
-                writer.writerows(jobs_data)
-            print(f"✅ Data saved to linkedin_jobs_error_100k.csv - {len(jobs_data)} jobs")
-        
-        try:
-            browser.close()
-        except:
-            pass
+        outcome = "error"
+    finally:
+        close_quietly(crawl_state, job_index, profile_cache)
+
+    save_linkedin_run(sink, output_ext, outcome, start_time, traffic, crawl_state, job_index, profile_cache)
 
 if __name__ == "__main__":
-    scrape_linkedin_jobs()
+    # python linkedin_scraper_100k.py --workers 8  -> concurrent worker-pool mode
+    # python linkedin_scraper_100k.py --parquet    -> final files as Parquet instead of CSV
+    output_ext = ".parquet" if "--parquet" in sys.argv else ".csv"
+    check_output_ext(output_ext)
+    if "--workers" in sys.argv:
+        scrape_linkedin_jobs_concurrent(int(sys.argv[sys.argv.index("--workers") + 1]), output_ext=output_ext)
+    else:
+        scrape_linkedin_jobs(output_ext)
@@ -0,0 +1,104 @@
+import json
+import os
+import time
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+from browser_profile import get_profile
+from scraper_waits import LINKEDIN_FEED_SELECTOR
+
+# Persisted LinkedIn login for the scrapers.
+#
+# Logging in used to mean a 60 s sleep plus 30 s retries on every run. The
+# authenticated storage_state (cookies + local storage) is now saved to
+# SESSION_PATH after a login and reloaded at startup. A saved session is first
+# checked offline (li_at cookie present and not expired), then with one headless
+# load of the feed page; only when that fails is a visible browser opened on the
+# login page, and the scraper continues the moment LinkedIn navigates away from
+# the login/checkpoint pages instead of after a fixed timer.
+#
+# The returned storage_state is passed to every context (ContextPool and the
+# concurrent workers), so all of them share the one session.
+
+SESSION_PATH = "linkedin_session.json"
+FEED_URL = "https://www.linkedin.com/feed/"
+LOGIN_URL = "https://www.linkedin.com/login"
+AUTH_COOKIE = "li_at"
+PROBE_CEILING_MS = 8000
+LOGIN_TIMEOUT_S = 300
+
+# Pages LinkedIn shows instead of the feed when the session is not (yet) logged in
+LOGGED_OUT_PATHS = ("/login", "/checkpoint", "/authwall", "/uas/", "/signup")
+
+def is_logged_out_url(url):
+    return any(path in url for path in LOGGED_OUT_PATHS)
+
+def load_session(path=SESSION_PATH):
+    """The saved storage_state, or None if there is none (or it is unreadable)"""
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, encoding="utf-8") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+def has_auth_cookie(storage_state):
+    """True if the state holds a LinkedIn auth cookie that has not expired"""
+    for cookie in (storage_state or {}).get("cookies", []):
+        if cookie.get("name") == AUTH_COOKIE and "linkedin.com" in cookie.get("domain", ""):
+            expires = cookie.get("expires", -1)
+            return expires == -1 or expires > time.time()
+    return False
+
+def probe_session(browser, storage_state, profile):
+    """One headless feed load: True if LinkedIn serves the feed to this session"""
+    context = profile.new_context(browser, storage_state=storage_state)
+    try:
+        page = context.new_page()
+        page.goto(FEED_URL, wait_until="domcontentloaded", timeout=PROBE_CEILING_MS * 2)
+        if is_logged_out_url(page.url):
+            return False
+        page.wait_for_selector(LINKEDIN_FEED_SELECTOR, timeout=PROBE_CEILING_MS)
+        return True
+    except Exception:
+        return False
+    finally:
+        context.close()
+
+def login_interactively(playwright, path=SESSION_PATH, timeout_s=LOGIN_TIMEOUT_S):
+    """Open a visible browser on the login page, wait for the user to finish, save and return the session"""
+    browser = get_profile().launch(playwright, headless=False)
+    try:
+        page = browser.new_context().new_page()
+        page.goto(LOGIN_URL)
+        print("Please log in to LinkedIn manually in the browser window...")
+        print(f"⏳ The scraper continues as soon as you are logged in (up to {timeout_s // 60} minutes)")
+        try:
+            page.wait_for_url(lambda url: "linkedin.com" in url and not is_logged_out_url(url), timeout=timeout_s * 1000)
+            page.wait_for_load_state("domcontentloaded")
+        except PlaywrightTimeoutError:
+            print("❌ Login was not completed in time")
+            return None
+        storage_state = page.context.storage_state(path=path)
+        print(f"✅ Login successful! Session saved to {path} for the next runs")
+        return storage_state
+    finally:
+        browser.close()
+
+def ensure_session(playwright, profile=None, path=SESSION_PATH):
+    """The saved session if LinkedIn still accepts it, else None (without asking for a login)"""
+    storage_state = load_session(path)
+    if not has_auth_cookie(storage_state):
+        return None
+
+    profile = profile or get_profile()
+    started = time.perf_counter()
+    browser = profile.launch(playwright)
+    try:
+        valid = probe_session(browser, storage_state, profile)
+    finally:
+        browser.close()
+    if not valid:
+        print(f"⚠️  Saved LinkedIn session in {path} has expired")
+        return None
+    print(f"✅ Reusing saved LinkedIn session from {path} (checked in {time.perf_counter() - started:.1f}s)")
+    return storage_state
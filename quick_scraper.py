@@ -1,10 +1,19 @@
 from playwright.sync_api import sync_playwright
-import csv
 from datetime import datetime
+import sys
 import time
+from browser_profile import TrafficMeter, get_profile
+from job_extraction import new_cards
+from job_sinks import check_output_ext, save_jobs
+from job_sources import LINKEDIN
+from scraper_waits import print_wait_savings, reset_wait_stats
 
-def quick_linkedin_scraper():
-    """Super simple LinkedIn job scraper - just basic info, no complexity"""
+def quick_linkedin_scraper(list_only=False, target_jobs=100, output_ext=".csv"):
+    """Super simple LinkedIn job scraper - just basic info, no complexity
+
+    list_only=True reads title/company/location straight from the results list
+    without clicking a single card (description is left as N/A).
+    """
     
     # Multiple search URLs to get more jobs faster
     SEARCH_URLS = [
@@ -16,118 +25,76 @@ def quick_linkedin_scraper():
     ]
     
     jobs_data = []
-    target_jobs = 100
+    seen_job_ids = set()
+    reset_wait_stats()
     
     print("🚀 Quick LinkedIn Job Scraper")
     print(f"🎯 Target: {target_jobs} jobs")
-    print("⚡ Fast extraction - basic info only\n")
+    if list_only:
+        print("⚡ List-only mode - no job cards are clicked\n")
+    else:
+        print("⚡ Fast extraction - basic info only\n")
     
     try:
         with sync_playwright() as p:
-            browser = p.chromium.launch(headless=False)
-            page = browser.new_page()
+            profile = get_profile()
+            browser = profile.launch(p)
+            traffic = TrafficMeter()
+            page = profile.new_context(browser, traffic).new_page()
             
             for search_url in SEARCH_URLS:
                 if len(jobs_data) >= target_jobs:
                     break
                     
-                print(f"🔍 Searching: {search_url.split('keywords=')[1].split('&')[0].replace('%20', ' ')}")
-                
-                page.goto(search_url)
-                page.wait_for_timeout(3000)
+                keywords = search_url.split('keywords=')[1].split('&')[0].replace('%20', ' ')
+                print(f"🔍 Searching: {keywords}")
                 
-                # Get all job cards on first page
-                job_cards = page.query_selector_all("ul.jobs-search__results-list li")
-                
-                for job_card in job_cards:
-                    if len(jobs_data) >= target_jobs:
-                        break
-                        
-                    try:
-                        job_card.click()
-                        page.wait_for_timeout(1500)  # Shorter wait for speed
-                        
-                        # Quick extraction
-                        title = "N/A"
-                        company = "N/A"
-                        location = "N/A"
-                        description = "N/A"
-                        
-                        try:
-                            title_el = page.query_selector("h2.topcard__title")
-                            if title_el:
-                                title = title_el.inner_text().strip()
-                        except:
-                            pass
-                            
-                        try:
-                            company_el = page.query_selector("span.topcard__flavor")
-                            if company_el:
-                                company = company_el.inner_text().strip()
-                        except:
-                            pass
-                            
-                        try:
-                            location_el = page.query_selector("span.topcard__flavor--bullet")
-                            if location_el:
-                                location = location_el.inner_text().strip()
-                        except:
-                            pass
-                            
-                        try:
-                            desc_el = page.query_selector("div.description__text")
-                            if desc_el:
-                                description = desc_el.inner_text().strip()[:200]  # First 200 chars only
-                        except:
-                            pass
+                # First results page only, every card harvested in one pass; only new
+                # postings are kept (the same job shows up under several keywords)
+                for cards in LINKEDIN.listing_pages(page, search_url, keywords, max_pages=1, elements=not list_only):
+                    cards = new_cards(cards, seen_job_ids)
+                    # Quick extraction - every field of a clicked card in one evaluate call
+                    listed = [(card, {}) for card in cards] if list_only else LINKEDIN.job_details(page, cards)
+                    
+                    for card, details in listed:
+                        title = details.get("title", "").strip() or card["title"] or "N/A"
+                        company = details.get("company", "").strip() or card["company"] or "N/A"
+                        location = details.get("location", "").strip() or card["location"] or "N/A"
+                        description = details.get("description", "").strip()[:200] or "N/A"  # First 200 chars only
                         
-                        jobs_data.append({
-                            "job_number": len(jobs_data) + 1,
-                            "title": title,
-                            "company": company,
-                            "location": location,
-                            "description": description,
-                            "scraped_at": datetime.now().strftime('%H:%M:%S')
-                        })
+                        jobs_data.append(LINKEDIN.job(title, company, location, description, card["job_url"]))
                         
                         print(f"✅ {len(jobs_data)}: {title} @ {company}")
-                        
-                    except Exception as e:
-                        continue
+                        if len(jobs_data) >= target_jobs:
+                            break
             
             browser.close()
             
-            # Save to CSV
+            # Save to CSV (or Parquet)
             if jobs_data:
-                filename = f"quick_jobs_{len(jobs_data)}.csv"
-                with open(filename, "w", newline='', encoding='utf-8') as file:
-                    writer = csv.DictWriter(file, fieldnames=jobs_data[0].keys())
-                    writer.writeheader()
-                    writer.writerows(jobs_data)
+                filename = save_jobs(jobs_data, f"quick_jobs_{len(jobs_data)}{output_ext}")
                 
                 print(f"\n🎉 SUCCESS! Collected {len(jobs_data)} jobs")
                 print(f"📁 Saved to: {filename}")
                 print(f"⏱️  Time: {datetime.now().strftime('%H:%M:%S')}")
+                print_wait_savings()
+                traffic.print_stats(len(jobs_data))
             
     except KeyboardInterrupt:
         print(f"\n⏹️  Stopped by user. Saving {len(jobs_data)} jobs...")
         if jobs_data:
-            filename = f"quick_jobs_partial_{len(jobs_data)}.csv"
-            with open(filename, "w", newline='', encoding='utf-8') as file:
-                writer = csv.DictWriter(file, fieldnames=jobs_data[0].keys())
-                writer.writeheader()
-                writer.writerows(jobs_data)
+            filename = save_jobs(jobs_data, f"quick_jobs_partial_{len(jobs_data)}{output_ext}")
             print(f"✅ Saved to: {filename}")
     
     except Exception as e:
         print(f"❌ Error: {e}")
         if jobs_data:
-            filename = f"quick_jobs_error_{len(jobs_data)}.csv"
-            with open(filename, "w", newline='', encoding='utf-8') as file:
-                writer = csv.DictWriter(file, fieldnames=jobs_data[0].keys())
-                writer.writeheader()
-                writer.writerows(jobs_data)
+            filename = save_jobs(jobs_data, f"quick_jobs_error_{len(jobs_data)}{output_ext}")
             print(f"✅ Error recovery - saved to: {filename}")
 
 if __name__ == "__main__":
-    quick_linkedin_scraper()
+    # python quick_scraper.py --list-only  -> basic columns only, no clicks
+    # python quick_scraper.py --parquet    -> results as Parquet instead of CSV
+    output_ext = ".parquet" if "--parquet" in sys.argv else ".csv"
+    check_output_ext(output_ext)
+    quick_linkedin_scraper(list_only="--list-only" in sys.argv, output_ext=output_ext)
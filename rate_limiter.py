@@ -0,0 +1,216 @@
+import asyncio
+import re
+import threading
+import time
+from urllib.parse import urlsplit
+
+# Adaptive request pacing for LinkedIn, Indeed and the other hosts the scrapers hit.
+#
+# Each host gets a token bucket whose rate, and the number of requests allowed
+# in flight at once (async scrapers), follow AIMD like TCP congestion control:
+# every healthy response adds `increase` requests/s (and one more concurrent
+# request after a full window of successes), a throttling signal halves both
+# and pauses the host for a cooldown that doubles while the signals keep
+# coming. Signals that arrive while the host is already paused (the other
+# requests that were in flight when it got blocked) are only counted, so one
+# block costs one decrease. The rate settles just under what the site
+# tolerates without any hand-tuned sleeps.
+#
+# Throttling signals: 403/429/503/999 responses, redirects to a login, authwall,
+# checkpoint or captcha page, captcha markup, and a first results page without
+# a single job card. The readiness waits in scraper_waits.py report every goto
+# and click through the shared limiter, so all browser scrapers are paced by it.
+
+# Starting point and bounds per host; unknown hosts use DEFAULT_LIMITS
+DEFAULT_LIMITS = {"rate": 1.0, "min_rate": 0.05, "max_rate": 5.0, "burst": 2, "concurrency": 2, "max_concurrency": 8}
+HOST_LIMITS = {
+    "www.linkedin.com": {"max_rate": 3.0},
+    "www.indeed.com": {"max_rate": 3.0},
+    # The old send loop slept 2-5 s between emails; Gmail counts messages, not connections
+    "smtp.gmail.com": {"rate": 0.3, "max_rate": 1.0, "burst": 1, "concurrency": 1, "max_concurrency": 1},
+}
+INCREASE = 0.05
+DECREASE = 0.5
+COOLDOWN_S = 30
+MAX_COOLDOWN_S = 600
+
+# 403 is how Indeed's bot protection answers; LinkedIn uses 999
+THROTTLE_STATUS = {403, 429, 503, 999}
+THROTTLE_URL_PARTS = ("/login", "/authwall", "/checkpoint", "/uas/", "captcha", "cdn-cgi/challenge")
+# Member-only pages: a login/authwall redirect there is expected when running logged out, not a throttle
+LOGIN_GATED_PATHS = ("/in/", "/company/")
+LOGIN_REDIRECTS = ("redirected to login", "redirected to authwall")
+CAPTCHA_RE = re.compile(r"captcha|cf-challenge|verify you are (?:a )?human|unusual traffic", re.IGNORECASE)
+# Runs in a row whose first results page was empty before a search counts as having no results
+MAX_EMPTY_FIRST_PAGES = 3
+
+def host_of(url):
+    """Host of a URL; bare host names ("smtp.gmail.com") are keys as they are"""
+    return (urlsplit(url).hostname or url) if "//" in url else url
+
+def throttle_reason(url="", status=None, text=None):
+    """Why a response looks throttled (status, redirect target or captcha markup), else None"""
+    if status in THROTTLE_STATUS:
+        return f"HTTP {status}"
+    parts = urlsplit(url or "")
+    target = f"{parts.path}?{parts.query}".lower()
+    for part in THROTTLE_URL_PARTS:
+        if part in target:
+            return f"redirected to {part.strip('/')}"
+    if text and CAPTCHA_RE.search(text[:20000]):
+        return "captcha"
+    return None
+
+class HostState:
+    def __init__(self, limits):
+        self.rate = limits["rate"]
+        self.min_rate = limits["min_rate"]
+        self.max_rate = limits["max_rate"]
+        self.burst = limits["burst"]
+        self.concurrency = limits["concurrency"]
+        self.max_concurrency = limits["max_concurrency"]
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self.paused_until = 0
+        self.cooldown = 0
+        self.in_flight = 0
+        self.slot_freed = None  # asyncio.Condition of the event loop in slot_loop
+        self.slot_loop = None
+        self.window_successes = 0
+        self.requests = 0
+        self.throttles = 0
+        self.waited_s = 0.0
+        self.reasons = {}
+
+class AdaptiveRateLimiter:
+    """Per-host AIMD token buckets; call wait() before a request and success()/throttled() after it"""
+
+    def __init__(self, host_limits=HOST_LIMITS, increase=INCREASE, decrease=DECREASE, cooldown_s=COOLDOWN_S):
+        self.host_limits = host_limits
+        self.increase = increase
+        self.decrease = decrease
+        self.cooldown_s = cooldown_s
+        self.hosts = {}
+        self.lock = threading.Lock()
+        # False: requests are still counted but never delayed (offline benchmarks against recorded pages)
+        self.enabled = True
+
+    def state(self, host):
+        if host not in self.hosts:
+            self.hosts[host] = HostState({**DEFAULT_LIMITS, **self.host_limits.get(host, {})})
+        return self.hosts[host]
+
+    def reserve(self, url):
+        """Take a token for `url`'s host; returns the seconds to wait before sending the request"""
+        now = time.monotonic()
+        with self.lock:
+            host = self.state(host_of(url))
+            host.tokens = min(host.burst, host.tokens + (now - host.updated) * host.rate)
+            host.updated = now
+            host.tokens -= 1
+            delay = max(0.0, -host.tokens / host.rate, host.paused_until - now) if self.enabled else 0.0
+            host.requests += 1
+            host.waited_s += delay
+            return delay
+
+    def wait(self, url):
+        delay = self.reserve(url)
+        if delay:
+            time.sleep(delay)
+
+    async def wait_async(self, url):
+        delay = self.reserve(url)
+        if delay:
+            await asyncio.sleep(delay)
+
+    def slot_condition(self, host):
+        """The host's slot condition, bound to the running loop (the limiter outlives asyncio.run() calls)"""
+        loop = asyncio.get_running_loop()
+        if host.slot_loop is not loop:
+            host.slot_freed = asyncio.Condition()
+            host.slot_loop = loop
+        return host.slot_freed
+
+    async def acquire_async(self, url):
+        """wait_async() plus a slot under the host's concurrency limit; pair with release_async()"""
+        host = self.state(host_of(url))
+        slot_freed = self.slot_condition(host)
+        async with slot_freed:
+            # A slot added by success() is picked up at the next release; one is always pending while all are taken
+            await slot_freed.wait_for(lambda: not self.enabled or host.in_flight < host.concurrency)
+            host.in_flight += 1
+        await self.wait_async(url)
+
+    async def release_async(self, url):
+        host = self.state(host_of(url))
+        slot_freed = self.slot_condition(host)
+        async with slot_freed:
+            host.in_flight = max(0, host.in_flight - 1)
+            slot_freed.notify_all()
+
+    def success(self, url):
+        """Additive increase: a bit more rate, and one more slot per window of successes"""
+        with self.lock:
+            host = self.state(host_of(url))
+            host.rate = min(host.max_rate, host.rate + self.increase)
+            host.cooldown = 0
+            host.window_successes += 1
+            if host.window_successes >= host.concurrency:
+                host.window_successes = 0
+                host.concurrency = min(host.max_concurrency, host.concurrency + 1)
+
+    def throttled(self, url, reason="throttled"):
+        """Multiplicative decrease, and a growing pause of the host (once per pause)"""
+        with self.lock:
+            host = self.state(host_of(url))
+            host.reasons[reason] = host.reasons.get(reason, 0) + 1
+            if host.paused_until > time.monotonic():
+                return
+            host.rate = max(host.min_rate, host.rate * self.decrease)
+            host.concurrency = max(1, int(host.concurrency * self.decrease))
+            host.window_successes = 0
+            host.tokens = min(host.tokens, 0)
+            host.cooldown = min(MAX_COOLDOWN_S, host.cooldown * 2 or self.cooldown_s)
+            host.paused_until = time.monotonic() + host.cooldown
+            host.throttles += 1
+        print(f"🐢 {host_of(url)} throttled ({reason}): {host.rate:.2f} req/s, {host.concurrency} concurrent, "
+              f"pausing {host.cooldown:.0f}s")
+
+    def record(self, url, status=None, final_url=None, text=None):
+        """success() or throttled() from what came back; returns the throttle reason or None"""
+        reason = throttle_reason(final_url or "", status, text)
+        if reason in LOGIN_REDIRECTS and any(path in urlsplit(url).path for path in LOGIN_GATED_PATHS):
+            return None
+        if reason:
+            self.throttled(url, reason)
+        else:
+            self.success(url)
+        return reason
+
+    def print_stats(self):
+        for name, host in sorted(self.hosts.items(), key=lambda item: -item[1].requests):
+            if not host.requests:
+                continue
+            reasons = ", ".join(f"{reason} {count}" for reason, count in host.reasons.items())
+            print(f"🚦 {name}: {host.requests} requests, settled at {host.rate:.2f} req/s x {host.concurrency}, "
+                  f"{host.throttles} throttled{f' ({reasons})' if reasons else ''}, {host.waited_s:.0f}s paced")
+
+# One limiter per process, so every scraper module paces a host together
+LIMITER = AdaptiveRateLimiter()
+
+def blocked_search(url, page_num, crawl_state, search_key):
+    """True (and the host backs off) when a search's first results page came back without job cards
+
+    A block is far more likely than a search with no results at all, so the
+    caller leaves the search unfinished for a later run instead of marking it
+    done - until it has opened empty MAX_EMPTY_FIRST_PAGES times in a row, when
+    it is taken to really have no results and the caller finishes it.
+    """
+    if page_num:
+        return False
+    empty = crawl_state.mark_empty_first_page(search_key)
+    if empty >= MAX_EMPTY_FIRST_PAGES:
+        print(f"🚦 First results page empty {empty} times in a row - treating the search as having no results")
+        return False
+    LIMITER.throttled(url, "no job cards")
+    return True
@@ -0,0 +1,378 @@
+import os
+import re
+import threading
+import zlib
+from urllib.parse import parse_qs, urlencode, urlsplit
+from browser_profile import REPLAY_ENV
+from text_classify import REMOTE_KEYWORDS
+from website_emails import serve_directory
+
+# Offline replay of LinkedIn, Indeed, RemoteOK and WeWorkRemotely from the recorded pages in fixtures/.
+#
+# ReplaySite answers every URL the scrapers request on those sites with a page
+# built from the recordings: search results pages repeat the recorded cards with
+# a fresh job id per card (derived from the search and the card's position, so
+# every run sees the same jobs), postings are the recorded posting under the
+# requested id, and the small scripts LinkedIn and Indeed run on their results
+# pages (card click loads the detail pane, "next" opens the next page) are
+# replaced by a few lines doing the same. Every NO_EMAIL_EVERY-th posting has
+# no email in its description (recruiter profile / company website lookup) and
+# every ON_SITE_EVERY-th is not remote, so every path of the scrapers runs.
+#
+# Company websites are served from fixtures/company_site on a local port, so
+# the HTTP crawler (website_emails.py) reads them unchanged.
+#
+# Browser traffic is replayed by the route browser_profile.py installs on every
+# context when $SCRAPER_REPLAY_DIR is set; everything else is aborted, nothing
+# leaves the machine. replay_requests() does the same for requests (RemoteOK,
+# WeWorkRemotely, the LinkedIn guest API). benchmark_scrapers.py drives the scrapers this way:
+#
+#   SCRAPER_REPLAY_DIR=fixtures python quick_scraper.py   -> one scraper against the recordings
+
+PAGES_PER_SEARCH = 4
+LINKEDIN_PAGE_SIZE = 25
+INDEED_PAGE_SIZE = 10  # the start= step of Indeed's pagination; a page shows more cards than that
+INDEED_CARDS_PER_PAGE = 15
+REMOTEOK_ROWS = 60
+WWR_ROWS = 60
+NO_EMAIL_EVERY = 4
+ON_SITE_EVERY = 10
+# Distinct recruiter profiles behind the postings, so the profile cache sees misses as well as hits
+RECRUITERS = 40
+
+LINKEDIN_JOB_ID = "4231868796"
+LINKEDIN_RECRUITER_PATH = "/in/jane-recruiter-12345"
+INDEED_JOB_KEY = "a3f1c07e92d54b18"
+COMPANY_WEBSITE = "https://www.acme-analytics.example/"
+
+HTML = "text/html; charset=utf-8"
+EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+REMOTE_RE = re.compile("|".join(re.escape(word) for word in REMOTE_KEYWORDS + ["home office", "homeoffice"]), re.IGNORECASE)
+LIST_ITEM_RE = re.compile(r"^<li>.*?^</li>", re.DOTALL | re.MULTILINE)
+REMOTEOK_ROW_RE = re.compile(r'<tr class="job".*?</tr>\s*<tr class="expand.*?</tr>', re.DOTALL)
+WWR_ITEM_RE = re.compile(r'<li (?:class="feature" )?id="job-\d+">.*?</li>\s*', re.DOTALL)
+
+LINKEDIN_SEARCH_PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head><title>{title} | LinkedIn</title></head>
+<body>
+<main class="two-pane-serp-page">
+<section class="two-pane-serp-page__results-list">
+<ul class="jobs-search__results-list">
+{cards}
+</ul>
+<button aria-label="Page forward" type="button" data-href="{next_url}"{disabled}>See more jobs</button>
+</section>
+<section class="two-pane-serp-page__detail-view" id="replay-detail"></section>
+</main>
+<script>
+document.querySelector("ul.jobs-search__results-list").addEventListener("click", (event) => {
+    const item = event.target.closest("li");
+    if (!item) return;
+    event.preventDefault();
+    const urn = item.querySelector("[data-entity-urn]").getAttribute("data-entity-urn");
+    fetch("/jobs-guest/jobs/api/jobPosting/" + urn.split(":").pop())
+        .then((response) => response.text())
+        .then((html) => { document.getElementById("replay-detail").innerHTML = html; });
+}, true);
+const forward = document.querySelector("button[aria-label='Page forward']");
+forward.addEventListener("click", () => { location.href = forward.dataset.href; });
+</script>
+</body>
+</html>
+"""
+
+LINKEDIN_JOB_PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head><title>LinkedIn job posting</title></head>
+<body>
+<main class="main">
+{posting}
+</main>
+</body>
+</html>
+"""
+
+PROFILE_SCRIPT = """<script>
+const overlay = document.querySelector(".artdeco-modal-overlay");
+document.getElementById("top-card-text-details-contact-info").addEventListener("click", (event) => {
+    event.preventDefault();
+    overlay.hidden = false;
+});
+document.querySelector("button[aria-label='Dismiss']").addEventListener("click", () => { overlay.hidden = true; });
+</script>
+</body>"""
+
+INDEED_SEARCH_PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head><title>{title} - Indeed</title></head>
+<body>
+<div id="mosaic-provider-jobcards" class="mosaic mosaic-provider-jobcards">
+<ul class="css-zu9cdh eu4oa1w0">
+{cards}
+</ul>
+</div>
+<div id="replay-detail" class="jobsearch-RightPane"></div>
+<nav role="navigation" aria-label="pagination">{next_link}</nav>
+<script>
+document.addEventListener("click", (event) => {
+    const link = event.target.closest("h2.jobTitle a");
+    if (!link) return;
+    event.preventDefault();
+    fetch(link.getAttribute("href"))
+        .then((response) => response.text())
+        .then((html) => { document.getElementById("replay-detail").innerHTML = html; });
+}, true);
+</script>
+</body>
+</html>
+"""
+
+INDEED_NEXT_LINK = '<a data-testid="pagination-page-next" aria-label="Next Page" href="{next_url}">Next</a>'
+
+def fill(template, **values):
+    """str.format() for templates that also contain JavaScript braces"""
+    for name, value in values.items():
+        template = template.replace("{" + name + "}", str(value))
+    return template
+
+def search_number(*parts):
+    """Stable number of a search, the high digits of the job ids it lists"""
+    return zlib.crc32("|".join(parts).encode()) % 100000
+
+def query_value(query, name, default=""):
+    values = query.get(name)
+    return values[-1] if values else default
+
+def page_of(query, page_size):
+    start = query_value(query, "start", "0")
+    return int(start) // page_size if start.isdigit() else 0
+
+def next_page_url(scheme_host, path, query, start):
+    params = {name: values[-1] for name, values in query.items()}
+    params["start"] = str(start)
+    return f"{scheme_host}{path}?{urlencode(params)}"
+
+class ReplaySite:
+    def __init__(self, directory, pages=PAGES_PER_SEARCH):
+        self.directory = directory
+        self.pages = pages
+        self.linkedin_cards = LIST_ITEM_RE.findall(self.read("linkedin_search_results.html"))
+        self.linkedin_posting = self.read("linkedin_job_posting.html")
+        self.linkedin_profile = self.read("linkedin_profile.html").replace("</body>", PROFILE_SCRIPT)
+        self.indeed_cards = LIST_ITEM_RE.findall(self.read("indeed_search_results.html"))
+        self.indeed_posting = self.read("indeed_job_posting.html")
+        self.indeed_company = self.read("indeed_company_page.html")
+        self.remoteok_rows = REMOTEOK_ROW_RE.findall(self.read("remoteok_jobs.html"))
+        self.remoteok_page = REMOTEOK_ROW_RE.sub("", self.read("remoteok_jobs.html"))
+        self.wwr_items = WWR_ITEM_RE.findall(self.read("weworkremotely_jobs.html"))
+        self.wwr_page = WWR_ITEM_RE.sub("", self.read("weworkremotely_jobs.html"))
+        self.company_server = None
+        self.lock = threading.Lock()
+        self.served = 0
+        self.unmatched = 0
+
+    def read(self, name):
+        with open(os.path.join(self.directory, name), encoding="utf-8") as file:
+            return file.read()
+
+    def company_website(self):
+        """Base URL of fixtures/company_site on a local port (started on first use)"""
+        with self.lock:
+            if self.company_server is None:
+                self.company_server = serve_directory(os.path.join(self.directory, "company_site"))
+        return f"http://127.0.0.1:{self.company_server.server_port}/"
+
+    def is_local(self, url):
+        return self.company_server is not None and urlsplit(url).netloc == f"127.0.0.1:{self.company_server.server_port}"
+
+    def answer(self, url):
+        """(status, content type, body) of the recorded page for `url`, or None if it was not recorded"""
+        parts = urlsplit(url)
+        host = (parts.hostname or "").lower()
+        query = parse_qs(parts.query)
+        body = None
+        if host == "linkedin.com" or host.endswith(".linkedin.com"):
+            body = self.linkedin(parts, query)
+        elif host.endswith("indeed.com"):
+            body = self.indeed(parts, query)
+        elif host in ("remoteok.io", "remoteok.com"):
+            body = self.remoteok()
+        elif host.endswith("weworkremotely.com"):
+            body = self.weworkremotely()
+        if body is None:
+            return None
+        self.served += 1
+        return 200, HTML, body
+
+    def variant(self, posting, number):
+        """The recorded posting, without its email or its remote wording for some of the jobs"""
+        if number % NO_EMAIL_EVERY == NO_EMAIL_EVERY - 1:
+            posting = EMAIL_RE.sub("the hiring team", posting)
+        if number % ON_SITE_EVERY == ON_SITE_EVERY - 1:
+            posting = REMOTE_RE.sub("on-site", posting)
+        return posting
+
+    def linkedin(self, parts, query):
+        path = parts.path
+        if path.startswith("/jobs/search"):
+            cards, next_start = self.linkedin_results(query)
+            return fill(LINKEDIN_SEARCH_PAGE, title=query_value(query, "keywords", "Jobs"), cards=cards,
+                        next_url=next_page_url("https://www.linkedin.com", path, query, next_start) if next_start else "",
+                        disabled="" if next_start else " disabled")
+        if path.startswith("/jobs-guest/jobs/api/seeMoreJobPostings"):
+            return self.linkedin_results(query)[0]
+        if path.startswith("/jobs-guest/jobs/api/jobPosting/"):
+            return self.linkedin_job(path.rstrip("/").rsplit("/", 1)[-1])
+        if path.startswith("/jobs/view/"):
+            job_id = path.rstrip("/").rsplit("-", 1)[-1].rsplit("/", 1)[-1]
+            return fill(LINKEDIN_JOB_PAGE, posting=self.linkedin_job(job_id))
+        if path.startswith(("/in/", "/company/")):
+            return self.linkedin_profile
+        return None
+
+    def linkedin_results(self, query):
+        """(the cards of one results page, start of the next page or None)"""
+        page = page_of(query, LINKEDIN_PAGE_SIZE)
+        if page >= self.pages:
+            return "", None
+        first_id = 4300000000 + search_number(query_value(query, "keywords"), query_value(query, "location")) * 10000
+        cards = []
+        for index in range(LINKEDIN_PAGE_SIZE):
+            number = page * LINKEDIN_PAGE_SIZE + index
+            card = self.linkedin_cards[number % len(self.linkedin_cards)]
+            recorded_id = re.search(r"urn:li:jobPosting:(\d+)", card).group(1)
+            cards.append(card.replace(recorded_id, str(first_id + number)))
+        next_start = (page + 1) * LINKEDIN_PAGE_SIZE if page + 1 < self.pages else None
+        return "\n".join(cards), next_start
+
+    def linkedin_job(self, job_id):
+        if not job_id.isdigit():
+            return None
+        number = int(job_id) % 10000
+        posting = self.linkedin_posting.replace(LINKEDIN_JOB_ID, job_id)
+        posting = posting.replace(LINKEDIN_RECRUITER_PATH, f"{LINKEDIN_RECRUITER_PATH}-{number % RECRUITERS}")
+        return self.variant(posting, number)
+
+    def indeed(self, parts, query):
+        path = parts.path
+        if path.startswith("/jobs"):
+            return self.indeed_results(path, query)
+        if path.startswith(("/viewjob", "/rc/clk")):
+            job_key = query_value(query, "jk")
+            if not re.fullmatch(r"[0-9a-f]{16}", job_key):
+                return None
+            return self.variant(self.indeed_posting.replace(INDEED_JOB_KEY, job_key), int(job_key[6:], 16))
+        if path.startswith("/cmp/"):
+            return self.indeed_company.replace(COMPANY_WEBSITE, self.company_website())
+        return None
+
+    def indeed_results(self, path, query):
+        page = page_of(query, INDEED_PAGE_SIZE)
+        if page >= self.pages:
+            return fill(INDEED_SEARCH_PAGE, title=query_value(query, "q", "Jobs"), cards="", next_link="")
+        search = search_number(query_value(query, "q"), query_value(query, "l"))
+        cards = []
+        for index in range(INDEED_CARDS_PER_PAGE):
+            number = page * INDEED_CARDS_PER_PAGE + index
+            card = self.indeed_cards[number % len(self.indeed_cards)]
+            recorded_key = re.search(r'data-jk="([0-9a-f]+)"', card).group(1)
+            cards.append(card.replace(recorded_key, f"{search:06x}{number:010x}"))
+        next_link = ""
+        if page + 1 < self.pages:
+            next_url = next_page_url("https://www.indeed.com", path, query, (page + 1) * INDEED_PAGE_SIZE)
+            next_link = fill(INDEED_NEXT_LINK, next_url=next_url.replace("&", "&amp;"))
+        return fill(INDEED_SEARCH_PAGE, title=query_value(query, "q", "Jobs"), cards="\n".join(cards), next_link=next_link)
+
+    def remoteok(self):
+        rows = []
+        for number in range(REMOTEOK_ROWS):
+            row = self.remoteok_rows[number % len(self.remoteok_rows)]
+            recorded_id = re.search(r'data-id="(\d+)"', row).group(1)
+            rows.append(row.replace(recorded_id, str(1200000 + number)))
+        return self.remoteok_page.replace('<table id="jobsboard">', '<table id="jobsboard">\n' + "\n".join(rows))
+
+    def weworkremotely(self):
+        items = []
+        for number in range(WWR_ROWS):
+            item = self.wwr_items[number % len(self.wwr_items)]
+            slug = re.search(r'href="(/remote-jobs/[^"]+)"', item).group(1)
+            items.append(re.sub(r'id="job-\d+"', f'id="job-{5000 + number}"', item).replace(slug, f"{slug}-{5000 + number}"))
+        return self.wwr_page.replace('<li class="view-all">', "".join(items) + '<li class="view-all">')
+
+    def handle_route(self, route):
+        """context.route() handler: recorded pages, the local company site, nothing else"""
+        url = route.request.url
+        answer = self.answer(url)
+        if answer:
+            status, content_type, body = answer
+            route.fulfill(status=status, content_type=content_type, body=body)
+        elif self.is_local(url):
+            route.continue_()
+        else:
+            self.unmatched += 1
+            route.abort()
+
+    async def handle_route_async(self, route):
+        url = route.request.url
+        answer = self.answer(url)
+        if answer:
+            status, content_type, body = answer
+            await route.fulfill(status=status, content_type=content_type, body=body)
+        elif self.is_local(url):
+            await route.continue_()
+        else:
+            self.unmatched += 1
+            await route.abort()
+
+    def print_stats(self):
+        print(f"🎞️  Replayed {self.served} recorded pages ({self.unmatched} requests to other URLs aborted)")
+
+    def close(self):
+        if self.company_server:
+            self.company_server.shutdown()
+
+SITE = None
+
+def current_replay():
+    """The ReplaySite of $SCRAPER_REPLAY_DIR (created on first use), or None when replay is off"""
+    global SITE
+    if SITE is None and os.environ.get(REPLAY_ENV):
+        SITE = ReplaySite(os.environ[REPLAY_ENV])
+    return SITE
+
+def install_replay(directory, pages=PAGES_PER_SEARCH):
+    """Replay `directory` for the browser contexts and requests calls of this process"""
+    global SITE
+    os.environ[REPLAY_ENV] = os.path.abspath(directory)
+    SITE = ReplaySite(os.environ[REPLAY_ENV], pages)
+    replay_requests(SITE)
+    return SITE
+
+def replay_requests(site):
+    """Answer every requests.Session call from `site`; URLs it has no recording for fail like a dead network"""
+    import requests
+
+    class ReplayAdapter(requests.adapters.BaseAdapter):
+        def send(self, request, **kwargs):
+            answer = site.answer(request.url)
+            if answer is None:
+                site.unmatched += 1
+                raise requests.ConnectionError(f"No recording for {request.url} (offline replay)", request=request)
+            status, content_type, body = answer
+            response = requests.Response()
+            response.status_code = status
+            response.reason = "OK"
+            response.headers["Content-Type"] = content_type
+            response._content = body.encode("utf-8")
+            response.encoding = "utf-8"
+            response.url = request.url
+            response.request = request
+            return response
+
+        def close(self):
+            pass
+
+    adapter = ReplayAdapter()
+    get_adapter = requests.Session.get_adapter
+    requests.Session.get_adapter = lambda session, url: get_adapter(session, url) if site.is_local(url) else adapter
@@ -0,0 +1,205 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+# Per-stage timing and counters for a scraper run.
+#
+# The shared helpers time themselves into METRICS: pacing, goto, click and
+# readiness waits (scraper_waits.py), detail extraction (job_extraction.py),
+# CSV writes (job_sinks.py); the scrapers add profile visits, website crawls and
+# counters (jobs seen, duplicates, skipped non-remote / without email, cache
+# hits). Each stage keeps a histogram with fixed millisecond buckets, so a
+# 100k-job run costs a few integers per stage, not a list of samples.
+#
+# At the end of a run the scraper prints where the time went, writes a JSON
+# report next to its output (<run>_run_metrics.json) and, when
+# $SCRAPER_METRICS_PROM is set, the Prometheus text format:
+#
+#   SCRAPER_METRICS_PROM=metrics.prom python linkedin_scraper_100k.py   -> written at the end of the run
+#   SCRAPER_METRICS_PROM=:9108 python linkedin_scraper_100k.py          -> live on http://localhost:9108/metrics
+
+PROMETHEUS_ENV = "SCRAPER_METRICS_PROM"
+BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
+
+class Histogram:
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)  # last bucket: above the largest bound
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, ms):
+        index = 0
+        while index < len(BUCKETS_MS) and ms > BUCKETS_MS[index]:
+            index += 1
+        self.counts[index] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-quantile (the max for the overflow bucket)"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return BUCKETS_MS[index] if index < len(BUCKETS_MS) else self.max_ms
+        return self.max_ms
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "total_s": round(self.total_ms / 1000, 3),
+            "mean_ms": round(self.total_ms / self.count, 1) if self.count else 0,
+            "p50_ms": self.quantile(0.5),
+            "p95_ms": self.quantile(0.95),
+            "max_ms": round(self.max_ms, 1),
+            "buckets_ms": dict(zip([str(bound) for bound in BUCKETS_MS] + ["+Inf"], self.counts)),
+        }
+
+class RunMetrics:
+    def __init__(self, name="scraper"):
+        self.lock = threading.Lock()
+        self.server = None
+        self.reset(name)
+
+    def reset(self, name=None):
+        with self.lock:
+            self.name = name or self.name
+            self.started_at = datetime.now()
+            self.started = time.perf_counter()
+            self.stages = {}
+            self.counters = {}
+
+    def observe(self, stage, seconds):
+        with self.lock:
+            if stage not in self.stages:
+                self.stages[stage] = Histogram()
+            self.stages[stage].observe(seconds * 1000)
+
+    @contextmanager
+    def timer(self, stage):
+        """with METRICS.timer("goto"): ... - also fine around awaits, it measures wall time"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+    def count(self, name, n=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def set(self, name, value):
+        with self.lock:
+            self.counters[name] = value
+
+    def report(self, jobs=None):
+        elapsed_s = time.perf_counter() - self.started
+        jobs = self.counters.get("jobs_written", 0) if jobs is None else jobs
+        with self.lock:
+            return {
+                "run": self.name,
+                "started_at": self.started_at.isoformat(timespec="seconds"),
+                "duration_s": round(elapsed_s, 1),
+                "jobs": jobs,
+                "jobs_per_min": round(jobs / elapsed_s * 60, 2) if elapsed_s else 0,
+                "counters": dict(self.counters),
+                "stages": {stage: histogram.to_dict() for stage, histogram in self.stages.items()},
+            }
+
+    def prometheus_text(self, jobs=None):
+        report = self.report(jobs)
+        run = report["run"]
+        lines = [
+            "# TYPE scraper_stage_seconds histogram",
+        ]
+        for stage, stats in report["stages"].items():
+            cumulative = 0
+            for bound, count in stats["buckets_ms"].items():
+                cumulative += count
+                le = bound if bound == "+Inf" else f"{int(bound) / 1000:g}"
+                lines.append(f'scraper_stage_seconds_bucket{{run="{run}",stage="{stage}",le="{le}"}} {cumulative}')
+            lines.append(f'scraper_stage_seconds_sum{{run="{run}",stage="{stage}"}} {stats["total_s"]}')
+            lines.append(f'scraper_stage_seconds_count{{run="{run}",stage="{stage}"}} {stats["count"]}')
+        lines.append("# TYPE scraper_events_total counter")
+        for name, value in report["counters"].items():
+            lines.append(f'scraper_events_total{{run="{run}",event="{name}"}} {value}')
+        lines.append("# TYPE scraper_jobs_per_minute gauge")
+        lines.append(f'scraper_jobs_per_minute{{run="{run}"}} {report["jobs_per_min"]}')
+        lines.append("# TYPE scraper_run_seconds gauge")
+        lines.append(f'scraper_run_seconds{{run="{run}"}} {report["duration_s"]}')
+        return "\n".join(lines) + "\n"
+
+    def write_json(self, path, jobs=None):
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.report(jobs), file, indent=2)
+
+    def write_prometheus(self, path, jobs=None):
+        temp_path = path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            file.write(self.prometheus_text(jobs))
+        os.replace(temp_path, path)  # a node_exporter textfile collector never sees half a file
+
+    def serve_prometheus(self, port, host=""):
+        """Serve prometheus_text() on /metrics from a daemon thread (once per process)"""
+        if self.server:
+            return
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        metrics = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = metrics.prometheus_text().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), MetricsHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        print(f"📈 Prometheus metrics on http://localhost:{port}/metrics")
+
+    def print_summary(self, jobs=None):
+        report = self.report(jobs)
+        print(f"📈 {report['jobs']} jobs in {report['duration_s']:.0f}s = {report['jobs_per_min']:.1f} jobs/min")
+        stages = sorted(report["stages"].items(), key=lambda item: -item[1]["total_s"])
+        for stage, stats in stages:
+            share = stats["total_s"] / report["duration_s"] if report["duration_s"] else 0
+            print(f"📈   {stage:<14} {stats['count']:>7} x  {stats['total_s']:>8.1f}s ({share:>4.0%})  "
+                  f"p50 {stats['p50_ms']:g} ms  p95 {stats['p95_ms']:g} ms")
+        if report["counters"]:
+            print("📈   " + ", ".join(f"{name} {value}" for name, value in sorted(report["counters"].items())))
+
+# One collector per process, shared by every module of a run
+METRICS = RunMetrics()
+
+def start_run(name):
+    """Reset METRICS for a new run; starts the live endpoint when $SCRAPER_METRICS_PROM is a port (":9108")"""
+    METRICS.reset(name)
+    target = os.environ.get(PROMETHEUS_ENV, "")
+    if target.lstrip(":").isdigit():
+        METRICS.serve_prometheus(int(target.lstrip(":")))
+
+def finish_run(jobs=None, report_path=None):
+    """Print the stage summary and write the JSON report (and the Prometheus file if configured)"""
+    METRICS.print_summary(jobs)
+    report_path = report_path or f"{METRICS.name}_run_metrics.json"
+    try:
+        METRICS.write_json(report_path, jobs)
+        print(f"📈 Run metrics saved to {report_path}")
+        target = os.environ.get(PROMETHEUS_ENV, "")
+        if target and not target.lstrip(":").isdigit():
+            METRICS.write_prometheus(target, jobs)
+    except OSError as e:
+        print(f"⚠️  Could not write run metrics: {e}")
@@ -0,0 +1,337 @@
+import argparse
+import json
+import os
+import signal
+import sys
+import threading
+from crawl_state import CrawlState
+from job_sinks import check_output_ext, count_rows
+from work_queue import LeaseKeeper, open_queue, print_counts, worker_name
+
+# Unattended entry point for every scraper, driven by the command line and/or a
+# JSON config file, for scheduled runs and runs sharded over several machines.
+#
+# The (country x role) matrix of the LinkedIn and Indeed scrapers is built from
+# the config instead of the module constants, and `shard` splits it over nodes:
+# shard i of n takes every n-th search of the matrix, starting at the i-th, so
+# all nodes must run with the same countries and roles. No prompt is ever shown:
+# LinkedIn uses the saved session (linkedin_session.py) if it is still valid and
+# otherwise runs logged out.
+#
+#   python run_scraper.py linkedin-100k --countries Germany,Canada --target 5000 --shard 1/4
+#   python run_scraper.py indeed --config nightly.json --shard 2/4 --dry-run
+#
+# A config file holds the same settings as the flags; flags given on the command
+# line override it:
+#
+#   {"scraper": "indeed", "countries": ["Germany", "Canada"], "roles": ["data scientist remote"],
+#    "target_jobs": 20000, "max_pages": 5, "pipeline": true, "output": "parquet", "workdir": "runs/indeed"}
+#
+# LinkedIn countries outside linkedin_scraper_100k.COUNTRIES need their geoId:
+# "countries": {"France": "105015875"}.
+#
+# Instead of a fixed shard, the 100k scrapers can also take their searches from
+# a shared work queue (work_queue.py): one node seeds it, every worker claims
+# searches as it goes, and a search whose worker died is handed to another one,
+# which resumes at the last results page the first worker reported.
+#
+#   python run_scraper.py indeed --config nightly.json --seed-queue crawl_queue.db
+#   python work_queue.py serve crawl_queue.db 8765
+#   python run_scraper.py indeed --config nightly.json --queue http://coordinator:8765   (on every node)
+
+SCRAPERS = ("linkedin", "linkedin-100k", "indeed", "quick", "simple", "easy")
+MATRIX_SCRAPERS = ("linkedin", "linkedin-100k", "indeed")
+# Scrapers with a crawl state, so a search can move between workers
+QUEUE_SCRAPERS = ("linkedin-100k", "indeed")
+# Settings each scraper reads besides target_jobs and workdir; anything else is rejected, not ignored
+MATRIX_OPTIONS = {"countries", "roles", "shard", "max_pages"}
+SCRAPER_OPTIONS = {
+    "linkedin": MATRIX_OPTIONS | {"output"},
+    "linkedin-100k": MATRIX_OPTIONS | {"workers", "output"},
+    "indeed": MATRIX_OPTIONS | {"workers", "pipeline", "output"},
+    "quick": {"list_only", "output"},
+    "simple": {"http", "list_only", "output"},
+    "easy": {"output"},
+}
+OPTION_FLAGS = {"output": "--parquet"}
+
+DEFAULTS = {
+    "countries": None,
+    "roles": None,
+    "target_jobs": None,
+    "max_pages": None,
+    "workers": None,
+    "pipeline": False,
+    "http": False,
+    "list_only": False,
+    "output": "csv",
+    "shard": None,
+    "workdir": None,
+}
+
+def parse_shard(shard):
+    """(index, count) from "i/n" with 1 <= i <= n"""
+    try:
+        index, count = (int(part) for part in str(shard).split("/"))
+    except ValueError:
+        raise ValueError(f"Shard must look like 2/4, got {shard!r}")
+    if not 1 <= index <= count:
+        raise ValueError(f"Shard {shard!r} is out of range")
+    return index, count
+
+def shard_searches(searches, shard):
+    """The searches of one shard ("i/n"): every n-th search, starting at the i-th"""
+    if not shard:
+        return searches
+    index, count = parse_shard(shard)
+    return searches[index - 1::count]
+
+def split_list(value):
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+def load_config(path):
+    with open(path, encoding="utf-8") as file:
+        config = json.load(file)
+    unknown = set(config) - set(DEFAULTS) - {"scraper"}
+    if unknown:
+        raise ValueError(f"Unknown settings in {path}: {', '.join(sorted(unknown))}")
+    return config
+
+def build_config(argv=None):
+    """Defaults, overridden by the config file, overridden by the command-line flags"""
+    parser = argparse.ArgumentParser(description="Run a job scraper unattended")
+    parser.add_argument("scraper", nargs="?", choices=SCRAPERS)
+    parser.add_argument("--config", help="JSON file with the run settings")
+    parser.add_argument("--countries", type=split_list, help="comma-separated country names")
+    parser.add_argument("--roles", type=split_list, help="comma-separated job roles / search terms")
+    parser.add_argument("--target", dest="target_jobs", type=int, help="stop after this many jobs")
+    parser.add_argument("--max-pages", type=int, help="results pages per search")
+    parser.add_argument("--workers", type=int, help="concurrent browser contexts (linkedin-100k)")
+    parser.add_argument("--pipeline", action="store_true", default=None, help="staged pipeline mode (indeed)")
+    parser.add_argument("--http", action="store_true", default=None, help="guest-API HTTP backend (simple)")
+    parser.add_argument("--list-only", action="store_true", default=None, help="never click a card (quick, simple)")
+    parser.add_argument("--parquet", dest="output", action="store_const", const="parquet", help="final files as Parquet")
+    parser.add_argument("--shard", help="this node's share of the country x role matrix, e.g. 2/4")
+    parser.add_argument("--workdir", help="directory for the crawl state, caches and output files")
+    parser.add_argument("--dry-run", action="store_true", help="print this node's searches and exit")
+    parser.add_argument("--seed-queue", metavar="QUEUE", help="add the searches to a work queue (file or URL) and exit")
+    parser.add_argument("--queue", help="take searches from a work queue (file or URL) until it is empty")
+    args = parser.parse_args(argv)
+
+    config = dict(DEFAULTS)
+    if args.config:
+        config.update(load_config(args.config))
+    config.update({key: value for key, value in vars(args).items() if value is not None and key in DEFAULTS})
+    config["scraper"] = args.scraper or config.get("scraper")
+    if config["scraper"] not in SCRAPERS:
+        parser.error(f"choose a scraper ({', '.join(SCRAPERS)}) on the command line or in the config file")
+    if config["shard"]:
+        parse_shard(config["shard"])
+    # A worker count the chosen scraper does not take would otherwise be dropped silently
+    if isinstance(config["workers"], int) and config["scraper"] != "linkedin-100k":
+        parser.error("--workers is a number of browser contexts for linkedin-100k; the indeed pipeline scales "
+                     "its stages with \"workers\": {\"enrich\": 12} in the config file")
+    if isinstance(config["workers"], dict) and not (config["scraper"] == "indeed" and config["pipeline"]):
+        parser.error("per-stage \"workers\" only apply to the indeed pipeline")
+    unsupported = [OPTION_FLAGS.get(key, "--" + key.replace("_", "-")) for key, value in config.items()
+                   if key in DEFAULTS and value != DEFAULTS[key] and key not in ("target_jobs", "workdir")
+                   and key not in SCRAPER_OPTIONS[config["scraper"]]]
+    if config["scraper"] == "simple" and config["http"] and config["list_only"]:
+        unsupported.append("--list-only (with --http)")
+    if unsupported:
+        parser.error(f"{config['scraper']} does not take {', '.join(unsupported)}")
+    if config["workdir"]:
+        # Absolute once, so entering it again (queue worker, then run()) cannot nest it
+        config["workdir"] = os.path.abspath(config["workdir"])
+    if (args.queue or args.seed_queue) and config["scraper"] not in QUEUE_SCRAPERS:
+        parser.error(f"work queues need a scraper with a crawl state: {', '.join(QUEUE_SCRAPERS)}")
+    return config, args
+
+def matrix_searches(config):
+    """The (search url, country, role) list of the configured scraper, already sharded"""
+    if config["scraper"] == "indeed":
+        from google_jobs_scraper import indeed_searches
+        searches = indeed_searches(config["countries"], config["roles"])
+    else:
+        from linkedin_scraper_100k import linkedin_searches
+        searches = linkedin_searches(config["countries"], config["roles"])
+    return shard_searches(searches, config["shard"])
+
+def page_limit(config):
+    """Results pages per search the configured scraper will read (None = all)"""
+    if config["scraper"] == "indeed":
+        from google_jobs_scraper import MAX_PAGES_PER_SEARCH
+        return config["max_pages"] or MAX_PAGES_PER_SEARCH
+    return config["max_pages"]
+
+def run(config, searches=None, in_workdir=False):
+    """Run the configured scraper; in_workdir=True when the caller (run_worker) has already entered the workdir"""
+    scraper = config["scraper"]
+    output_ext = "." + config["output"]
+    check_output_ext(output_ext)
+    if searches is None and scraper in MATRIX_SCRAPERS:
+        searches = matrix_searches(config)
+    target = config["target_jobs"]
+    if not in_workdir:
+        enter_workdir(config)
+    if config["shard"] and searches is not None:
+        print(f"🧩 Shard {config['shard']}: {len(searches)} searches")
+
+    if scraper == "linkedin-100k":
+        from linkedin_scraper_100k import scrape_linkedin_jobs, scrape_linkedin_jobs_concurrent
+        if isinstance(config["workers"], int):
+            scrape_linkedin_jobs_concurrent(config["workers"], target or 100000, output_ext,
+                                            searches, config["max_pages"])
+        else:
+            scrape_linkedin_jobs(output_ext, searches, target or 100000, config["max_pages"], interactive=False)
+    elif scraper == "indeed":
+        from google_jobs_scraper import PIPELINE_WORKERS, scrape_google_jobs, scrape_google_jobs_pipeline
+        max_pages = page_limit(config)
+        if config["pipeline"]:
+            # "workers": {"enrich": 12} in the config file scales single pipeline stages
+            workers = dict(PIPELINE_WORKERS)
+            if isinstance(config["workers"], dict):
+                workers.update(config["workers"])
+            scrape_google_jobs_pipeline(target or 100000, output_ext, workers, searches, max_pages)
+        else:
+            scrape_google_jobs(output_ext, searches, target or 100000, max_pages, interactive=False)
+    elif scraper == "linkedin":
+        from linkedin_scraper import scrape_linkedin_jobs
+        scrape_linkedin_jobs(searches, target or 100000, config["max_pages"], output_ext)
+    elif scraper == "quick":
+        from quick_scraper import quick_linkedin_scraper
+        quick_linkedin_scraper(config["list_only"], target or 100, output_ext)
+    elif scraper == "simple":
+        from simple_linkedin_scraper import scrape_linkedin_jobs_http, scrape_linkedin_jobs_simple
+        if config["http"]:
+            scrape_linkedin_jobs_http(target or 100, output_ext)
+        else:
+            scrape_linkedin_jobs_simple(config["list_only"], target or 100, output_ext)
+    elif scraper == "easy":
+        from easy_scraper import simple_job_scraper
+        simple_job_scraper(target or 100, output_ext)
+
+def enter_workdir(config):
+    if config["workdir"] and os.path.abspath(config["workdir"]) != os.getcwd():
+        os.makedirs(config["workdir"], exist_ok=True)
+        os.chdir(config["workdir"])
+
+def scraper_files(scraper):
+    """(crawl state path, stream path) of a queue scraper"""
+    if scraper == "indeed":
+        from google_jobs_scraper import CRAWL_STATE_PATH, STREAM_PATH
+    else:
+        from linkedin_scraper_100k import CRAWL_STATE_PATH, STREAM_PATH
+    return CRAWL_STATE_PATH, STREAM_PATH
+
+def search_progress(state_path, search_url):
+    state = CrawlState(state_path)
+    try:
+        return {"pages_done": state.pages_done(search_url), "finished": state.is_search_finished(search_url)}
+    finally:
+        state.close()
+
+def jobs_streamed(stream_path):
+    return count_rows(stream_path) if os.path.exists(stream_path) else 0
+
+def claim_batch_size(config):
+    """Searches one scraper call can crawl at the same time"""
+    if config["scraper"] == "linkedin-100k" and isinstance(config["workers"], int):
+        return config["workers"]
+    if config["scraper"] == "indeed" and config["pipeline"]:
+        from google_jobs_scraper import PIPELINE_WORKERS
+        return PIPELINE_WORKERS["discovery"]
+    return 1
+
+def seed_queue(config, target):
+    queue = open_queue(target)
+    searches = matrix_searches(config)
+    added = queue.add((search[0], list(search)) for search in searches)
+    print(f"📬 Added {added} of {len(searches)} searches to {target}")
+    print_counts(queue)
+    queue.close()
+
+def stop_on_signals():
+    """Event set by Ctrl+C / SIGTERM; the scraper still gets its KeyboardInterrupt to save partial results"""
+    stop = threading.Event()
+
+    def handle(signum, frame):
+        stop.set()
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGINT, handle)
+    signal.signal(signal.SIGTERM, handle)
+    return stop
+
+def run_worker(config, target):
+    """Claim searches from the work queue and crawl them until it is empty, the target is met or we are stopped"""
+    queue = open_queue(target)
+    worker = worker_name()
+    enter_workdir(config)
+    state_path, stream_path = scraper_files(config["scraper"])
+    max_pages = page_limit(config)
+    target_jobs = config["target_jobs"] or 100000
+    stop = stop_on_signals()
+    print(f"👷 Worker {worker} taking searches from {target}")
+
+    try:
+        while not stop.is_set():
+            if jobs_streamed(stream_path) >= target_jobs:
+                print(f"🎯 Target of {target_jobs:,} jobs reached on this node")
+                break
+            items = []
+            for _ in range(claim_batch_size(config)):
+                item = queue.claim(worker)
+                if item is None:
+                    break
+                items.append(item)
+            if not items:
+                print("📭 Work queue is empty")
+                break
+
+            for item in items:
+                # Pick up where an earlier attempt (on any node) stopped
+                pages_done = (item["progress"] or {}).get("pages_done", 0)
+                state = CrawlState(state_path)
+                if pages_done > state.pages_done(item["key"]):
+                    state.mark_page_done(item["key"], pages_done)
+                state.close()
+                print(f"📥 Claimed {item['payload'][2]} in {item['payload'][1]} (attempt {item['attempts']}, page {pages_done + 1})")
+
+            keys = [item["key"] for item in items]
+            with LeaseKeeper(queue, worker, keys, lambda key: search_progress(state_path, key)) as keeper:
+                run(config, [tuple(item["payload"]) for item in items], in_workdir=True)
+
+            for key in keys:
+                if key in keeper.lost:
+                    continue
+                progress = search_progress(state_path, key)
+                if progress["finished"] or (max_pages and progress["pages_done"] >= max_pages):
+                    queue.complete(key, worker, progress)
+                elif stop.is_set() or jobs_streamed(stream_path) >= target_jobs:
+                    queue.release(key, worker, progress)
+                else:
+                    queue.fail(key, worker, "stopped before the last results page", progress)
+    except KeyboardInterrupt:
+        print("\n⚠️  Worker stopped; its unfinished leases expire and go to other workers")
+    finally:
+        print_counts(queue)
+        queue.close()
+
+if __name__ == "__main__":
+    try:
+        config, args = build_config()
+        if args.seed_queue:
+            seed_queue(config, args.seed_queue)
+        elif args.queue:
+            run_worker(config, args.queue)
+        elif args.dry_run:
+            searches = matrix_searches(config) if config["scraper"] in MATRIX_SCRAPERS else []
+            print(f"🧩 {config['scraper']} shard {config['shard'] or '1/1'}: {len(searches)} searches")
+            for search_url, country, job_role in searches:
+                print(f"  • {job_role} in {country}: {search_url}")
+        else:
+            run(config)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(2)
@@ -0,0 +1,185 @@
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+import time
+from rate_limiter import LIMITER
+from run_metrics import METRICS
+
+# Readiness waits shared by the Playwright scrapers.
+#
+# Instead of sleeping a fixed number of milliseconds after every goto, click and
+# go_back, each helper waits for the element that proves the page is ready (or
+# for network idle when there is no such element), capped by a ceiling timeout.
+# The fixed sleep the wait replaces is recorded so each run can report how much
+# time was saved.
+#
+# Every goto, click and go_back is also paced by the shared adaptive rate
+# limiter (rate_limiter.py) and reports back whether the page looks throttled
+# (blocked status, login/authwall/captcha redirect, captcha title). Pacing,
+# navigation, clicks and waits are each timed into the run metrics.
+
+LINKEDIN_RESULTS_SELECTOR = "ul.jobs-search__results-list li"
+LINKEDIN_DETAIL_SELECTOR = "div.description__text"
+LINKEDIN_TITLE_SELECTOR = "h2.topcard__title"
+LINKEDIN_CONTACT_MODAL_SELECTOR = "section.artdeco-modal"
+LINKEDIN_FEED_SELECTOR = "main.feed-scaffold-layout__content"
+INDEED_RESULTS_SELECTOR = "h2.jobTitle a, [data-jk] h2 a"
+INDEED_DETAIL_SELECTOR = "#jobDescriptionText"
+
+DEFAULT_CEILING_MS = 10000
+
+# Elements present before a click are tagged so the wait only succeeds once the
+# page has rendered a new one (the detail pane keeps the previous job otherwise)
+STALE_ATTRIBUTE = "data-scraper-stale"
+MARK_STALE_JS = f"sel => document.querySelectorAll(sel).forEach(el => el.setAttribute('{STALE_ATTRIBUTE}', '1'))"
+
+wait_stats = {"waits": 0, "timeouts": 0, "fixed_ms": 0, "waited_ms": 0.0}
+
+def reset_wait_stats():
+    for key in wait_stats:
+        wait_stats[key] = 0
+
+def record_wait(fixed_ms, waited_ms, timed_out):
+    METRICS.observe("wait", waited_ms / 1000)
+    wait_stats["waits"] += 1
+    wait_stats["fixed_ms"] += fixed_ms
+    wait_stats["waited_ms"] += waited_ms
+    if timed_out:
+        wait_stats["timeouts"] += 1
+
+def print_wait_savings():
+    """Print how much time the readiness waits saved compared to the old fixed sleeps"""
+    if not wait_stats["waits"]:
+        return
+    fixed_s = wait_stats["fixed_ms"] / 1000
+    waited_s = wait_stats["waited_ms"] / 1000
+    print(f"⏱️  Readiness waits: {wait_stats['waits']} waits took {waited_s:.1f}s instead of {fixed_s:.1f}s of fixed sleeps "
+          f"(saved {fixed_s - waited_s:.1f}s, {wait_stats['timeouts']} hit the ceiling)")
+    LIMITER.print_stats()
+
+def fresh_selector(selector):
+    """Restrict every part of a selector list to elements rendered after MARK_STALE_JS ran"""
+    return ", ".join(f"{part.strip()}:not([{STALE_ATTRIBUTE}])" for part in selector.split(","))
+
+def wait_for_ready(page, selector=None, fixed_ms=2000, ceiling_ms=DEFAULT_CEILING_MS, state="visible"):
+    """Wait for `selector` (or network idle) instead of sleeping `fixed_ms`; returns False on ceiling
+
+    Network idle is not a definitive signal (long-polling pages never reach it),
+    so without a selector the wait is never longer than the sleep it replaces.
+    """
+    start = time.perf_counter()
+    timed_out = False
+    try:
+        if selector:
+            page.wait_for_selector(selector, state=state, timeout=ceiling_ms)
+        else:
+            page.wait_for_load_state("networkidle", timeout=min(ceiling_ms, fixed_ms))
+    except PlaywrightTimeoutError:
+        timed_out = True
+    record_wait(fixed_ms, (time.perf_counter() - start) * 1000, timed_out)
+    return not timed_out
+
+def report_page(page, url, response=None, ready=True):
+    """Tell the rate limiter how the request for `url` went; the page title is only read after a timeout"""
+    title = None
+    if not ready:
+        try:
+            title = page.title()
+        except:
+            pass
+    LIMITER.record(url, response.status if response else None, page.url, title)
+
+async def report_page_async(page, url, response=None, ready=True):
+    title = None
+    if not ready:
+        try:
+            title = await page.title()
+        except:
+            pass
+    LIMITER.record(url, response.status if response else None, page.url, title)
+
+def goto_and_wait(page, url, selector=None, fixed_ms=3000, ceiling_ms=15000, **goto_kwargs):
+    goto_kwargs.setdefault("wait_until", "domcontentloaded")
+    with METRICS.timer("pacing"):
+        LIMITER.wait(url)
+    with METRICS.timer("goto"):
+        response = page.goto(url, **goto_kwargs)
+    ready = wait_for_ready(page, selector, fixed_ms, ceiling_ms)
+    report_page(page, url, response, ready)
+    return ready
+
+def click_and_wait(page, element, selector=None, fixed_ms=2000, ceiling_ms=DEFAULT_CEILING_MS):
+    """Click `element` and wait until a freshly rendered `selector` appears"""
+    url = page.url
+    if selector:
+        page.evaluate(MARK_STALE_JS, selector)
+    with METRICS.timer("pacing"):
+        LIMITER.wait(url)
+    with METRICS.timer("click"):
+        element.click()
+    ready = wait_for_ready(page, fresh_selector(selector) if selector else None, fixed_ms, ceiling_ms)
+    report_page(page, url, ready=ready)
+    return ready
+
+def go_back_and_wait(page, selector=None, fixed_ms=2000, ceiling_ms=DEFAULT_CEILING_MS):
+    url = page.url
+    with METRICS.timer("pacing"):
+        LIMITER.wait(url)
+    with METRICS.timer("go_back"):
+        page.go_back(wait_until="domcontentloaded")
+    ready = wait_for_ready(page, selector, fixed_ms, ceiling_ms)
+    report_page(page, url, ready=ready)
+    return ready
+
+async def wait_for_ready_async(page, selector=None, fixed_ms=2000, ceiling_ms=DEFAULT_CEILING_MS, state="visible"):
+    start = time.perf_counter()
+    timed_out = False
+    try:
+        if selector:
+            await page.wait_for_selector(selector, state=state, timeout=ceiling_ms)
+        else:
+            await page.wait_for_load_state("networkidle", timeout=min(ceiling_ms, fixed_ms))
+    except PlaywrightTimeoutError:
+        timed_out = True
+    record_wait(fixed_ms, (time.perf_counter() - start) * 1000, timed_out)
+    return not timed_out
+
+async def goto_and_wait_async(page, url, selector=None, fixed_ms=3000, ceiling_ms=15000, **goto_kwargs):
+    """goto_and_wait() for the async scrapers; also holds one of the host's concurrent-request slots"""
+    goto_kwargs.setdefault("wait_until", "domcontentloaded")
+    with METRICS.timer("pacing"):
+        await LIMITER.acquire_async(url)
+    try:
+        with METRICS.timer("goto"):
+            response = await page.goto(url, **goto_kwargs)
+        ready = await wait_for_ready_async(page, selector, fixed_ms, ceiling_ms)
+        await report_page_async(page, url, response, ready)
+    finally:
+        await LIMITER.release_async(url)
+    return ready
+
+async def click_and_wait_async(page, element, selector=None, fixed_ms=2000, ceiling_ms=DEFAULT_CEILING_MS):
+    url = page.url
+    if selector:
+        await page.evaluate(MARK_STALE_JS, selector)
+    with METRICS.timer("pacing"):
+        await LIMITER.acquire_async(url)
+    try:
+        with METRICS.timer("click"):
+            await element.click()
+        ready = await wait_for_ready_async(page, fresh_selector(selector) if selector else None, fixed_ms, ceiling_ms)
+        await report_page_async(page, url, ready=ready)
+    finally:
+        await LIMITER.release_async(url)
+    return ready
+
+async def go_back_and_wait_async(page, selector=None, fixed_ms=2000, ceiling_ms=DEFAULT_CEILING_MS):
+    url = page.url
+    with METRICS.timer("pacing"):
+        await LIMITER.acquire_async(url)
+    try:
+        with METRICS.timer("go_back"):
+            await page.go_back(wait_until="domcontentloaded")
+        ready = await wait_for_ready_async(page, selector, fixed_ms, ceiling_ms)
+        await report_page_async(page, url, ready=ready)
+    finally:
+        await LIMITER.release_async(url)
+    return ready
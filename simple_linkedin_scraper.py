@@ -1,128 +1,89 @@
 from playwright.sync_api import sync_playwright
+import sys
 import time
-import csv
 from datetime import datetime
+from browser_profile import TrafficMeter, get_profile
+from job_extraction import new_cards
+from job_sinks import check_output_ext, save_jobs
+from job_sources import LINKEDIN
+from linkedin_guest_api import RESULTS_PER_PAGE, BrowserFallback, fetch_job_details, fetch_search_page, new_session
+from scraper_waits import print_wait_savings, reset_wait_stats
 
-def scrape_linkedin_jobs_simple():
-    """Simple LinkedIn job scraper - gets 100 jobs with basic info only"""
-    
-    # Simple job search URL for data science roles
-    SEARCH_URL = "https://www.linkedin.com/jobs/search/?keywords=data%20scientist&location=Worldwide&f_WT=2"
+# Simple job search URL for data science roles
+SEARCH_URL = "https://www.linkedin.com/jobs/search/?keywords=data%20scientist&location=Worldwide&f_WT=2"
+
+def scrape_linkedin_jobs_simple(list_only=False, target_jobs=100, output_ext=".csv"):
+    """Simple LinkedIn job scraper - gets 100 jobs with basic info only
+
+    list_only=True harvests title/company/location/job URL from the results
+    list in one pass per page and never clicks a card (description is N/A).
+    """
     
     try:
         with sync_playwright() as p:
-            browser = p.chromium.launch(headless=False)
-            page = browser.new_page()
+            profile = get_profile()
+            browser = profile.launch(p)
+            traffic = TrafficMeter()
+            page = profile.new_context(browser, traffic).new_page()
             
             jobs_data = []
             job_count = 0
-            target_jobs = 100
+            seen_job_ids = set()
+            reset_wait_stats()
             
             print("🚀 Starting Simple LinkedIn Job Scraper")
             print(f"🎯 TARGET: {target_jobs} jobs")
             print("📝 Extracting: Title, Company, Location, Description")
             print(f"🕐 Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
             
-            # Navigate to LinkedIn jobs
-            page.goto(SEARCH_URL)
-            page.wait_for_timeout(5000)
-            
-            page_num = 0
-            
-            while job_count < target_jobs:
-                print(f"📄 Processing page {page_num + 1}...")
+            walk = LINKEDIN.listing_pages(page, SEARCH_URL, "the search", elements=not list_only)
+            for cards in walk:
+                print(f"📄 Processing page {walk.page_num + 1}...")
                 
-                # Get job cards on current page
-                job_cards = page.query_selector_all("ul.jobs-search__results-list li")
+                # Every card of the page is harvested in one pass; cards already seen
+                # on an earlier page (the list grows as it pages) are skipped
+                cards = new_cards(cards, seen_job_ids)
+                # Clicked cards are read in one evaluate call each
+                listed = [(card, {}) for card in cards] if list_only else LINKEDIN.job_details(page, cards)
                 
-                if not job_cards:
-                    print("❌ No job cards found, stopping...")
-                    break
-                
-                for i, job_card in enumerate(job_cards):
-                    if job_count >= target_jobs:
-                        break
+                for card, details in listed:
+                    title = details.get("title", "").strip() or card["title"] or "N/A"
+                    company = details.get("company", "").strip() or card["company"] or "N/A"
+                    location = details.get("location", "").strip() or card["location"] or "N/A"
                     
-                    try:
-                        # Click on job card to load details
-                        job_card.click()
-                        page.wait_for_timeout(2000)
-                        
-                        # Extract basic information
-                        title_element = page.query_selector("h2.topcard__title")
-                        title = title_element.inner_text().strip() if title_element else "N/A"
-                        
-                        company_element = page.query_selector("span.topcard__flavor")
-                        company = company_element.inner_text().strip() if company_element else "N/A"
-                        
-                        location_element = page.query_selector("span.topcard__flavor--bullet")
-                        location = location_element.inner_text().strip() if location_element else "N/A"
-                        
-                        description_element = page.query_selector("div.description__text")
-                        if description_element:
-                            description = description_element.inner_text().strip()
-                            # Limit description to first 300 characters
-                            description = description[:300] + "..." if len(description) > 300 else description
-                        else:
-                            description = "N/A"
-                        
-                        # Get job URL
-                        job_url = page.url
-                        
-                        # Store job data
-                        jobs_data.append({
-                            "job_number": job_count + 1,
-                            "title": title,
-                            "company": company,
-                            "location": location,
-                            "description": description,
-                            "job_url": job_url,
-                            "scraped_at": datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                        })
-                        
-                        job_count += 1
-                        print(f"✅ Job {job_count}: {title} at {company}")
-                        
-                        # Save progress every 25 jobs
-                        if job_count % 25 == 0:
-                            print(f"💾 Progress: {job_count}/{target_jobs} jobs collected")
-                        
-                    except Exception as e:
-                        print(f"❌ Error processing job {i+1}: {e}")
-                        continue
-                
-                # Try to go to next page
-                if job_count < target_jobs:
-                    try:
-                        next_button = page.query_selector("button[aria-label='Page forward']")
-                        if not next_button:
-                            next_button = page.query_selector("button[aria-label='Next']")
-                        
-                        if next_button and not next_button.is_disabled():
-                            next_button.click()
-                            page.wait_for_timeout(3000)
-                            page_num += 1
-                        else:
-                            print("📄 No more pages available")
-                            break
-                    except Exception as e:
-                        print(f"❌ Error navigating to next page: {e}")
+                    description = details.get("description", "").strip()
+                    if description:
+                        # Limit description to first 300 characters
+                        description = description[:300] + "..." if len(description) > 300 else description
+                    else:
+                        description = "N/A"
+                    
+                    # Store job data (a clicked card's URL is the one the page shows)
+                    jobs_data.append(LINKEDIN.job(title, company, location, description,
+                                                  page.url if details else card["job_url"]))
+                    
+                    job_count += 1
+                    print(f"✅ Job {job_count}: {title} at {company}")
+                    
+                    # Save progress every 25 jobs
+                    if job_count % 25 == 0:
+                        print(f"💾 Progress: {job_count}/{target_jobs} jobs collected")
+                    if job_count >= target_jobs:
                         break
+                if job_count >= target_jobs:
+                    break
             
             browser.close()
             
-            # Save results to CSV
+            # Save results to CSV (or Parquet)
             if jobs_data:
-                filename = f"linkedin_jobs_simple_{len(jobs_data)}.csv"
-                with open(filename, "w", newline='', encoding='utf-8') as file:
-                    fieldnames = ["job_number", "title", "company", "location", "description", "job_url", "scraped_at"]
-                    writer = csv.DictWriter(file, fieldnames=fieldnames)
-                    writer.writeheader()
-                    writer.writerows(jobs_data)
+                filename = save_jobs(jobs_data, f"linkedin_jobs_simple_{len(jobs_data)}{output_ext}")
                 
                 print(f"\n✅ SUCCESS! Scraped {len(jobs_data)} jobs")
                 print(f"📁 Data saved to: {filename}")
                 print(f"⏱️  Completed at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+                print_wait_savings()
+                traffic.print_stats(len(jobs_data))
                 
                 # Show sample of collected data
                 print(f"\n📊 Sample of collected jobs:")
@@ -136,26 +97,84 @@ def scrape_linkedin_jobs_simple():
         print(f"\n⚠️  Script stopped by user. Saving {len(jobs_data)} jobs collected so far...")
         
         if jobs_data:
-            filename = f"linkedin_jobs_partial_{len(jobs_data)}.csv"
-            with open(filename, "w", newline='', encoding='utf-8') as file:
-                fieldnames = ["job_number", "title", "company", "location", "description", "job_url", "scraped_at"]
-                writer = csv.DictWriter(file, fieldnames=fieldnames)
-                writer.writeheader()
-                writer.writerows(jobs_data)
+            filename = save_jobs(jobs_data, f"linkedin_jobs_partial_{len(jobs_data)}{output_ext}")
             print(f"✅ Partial data saved to: {filename}")
         
     except Exception as e:
         print(f"❌ Unexpected error: {e}")
         
         if jobs_data:
-            filename = f"linkedin_jobs_error_{len(jobs_data)}.csv"
-            with open(filename, "w", newline='', encoding='utf-8') as file:
-                fieldnames = ["job_number", "title", "company", "location", "description", "job_url", "scraped_at"]
-                writer = csv.DictWriter(file, fieldnames=fieldnames)
-                writer.writeheader()
-                writer.writerows(jobs_data)
+            filename = save_jobs(jobs_data, f"linkedin_jobs_error_{len(jobs_data)}{output_ext}")
             print(f"✅ Error recovery - data saved to: {filename}")
 
+def scrape_linkedin_jobs_http(target_jobs=100, output_ext=".csv"):
+    """Browserless variant: pooled HTTP fetches of the public guest pages, Chromium only as a fallback"""
+    session = new_session()
+    fallback = BrowserFallback()
+    jobs_data = []
+    seen_job_ids = set()
+    start = 0
+
+    print("🚀 Starting Simple LinkedIn Job Scraper (HTTP backend, no browser)")
+    print(f"🎯 TARGET: {target_jobs} jobs")
+    print(f"🕐 Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+
+    try:
+        while len(jobs_data) < target_jobs:
+            print(f"📄 Processing page {start // RESULTS_PER_PAGE + 1}...")
+            cards = fetch_search_page(session, SEARCH_URL, start)
+            if cards is None:
+                print("⚠️  LinkedIn refused the guest search request - try the browser mode")
+                break
+            if not cards:
+                print("📄 No more pages available")
+                break
+
+            # A card without a posting id has nothing to fetch details for (and would never be deduped)
+            for card in new_cards([card for card in cards if card["job_id"]], seen_job_ids):
+                if len(jobs_data) >= target_jobs:
+                    break
+
+                try:
+                    details = fetch_job_details(session, card["job_id"], fallback) or {}
+                except Exception as e:
+                    # One broken detail page (or a crashed fallback) only costs this card its description
+                    print(f"❌ Error loading details of job {card['job_id']}: {e}")
+                    details = {}
+                description = details.get("description", "").strip()
+                if description:
+                    description = description[:300] + "..." if len(description) > 300 else description
+
+                jobs_data.append(LINKEDIN.job(details.get("title") or card["title"],
+                                              details.get("company") or card["company"],
+                                              details.get("location") or card["location"],
+                                              description, card["job_url"]))
+                print(f"✅ Job {len(jobs_data)}: {jobs_data[-1]['title']} at {jobs_data[-1]['company']}")
+
+            start += RESULTS_PER_PAGE
+
+        if jobs_data:
+            filename = save_jobs(jobs_data, f"linkedin_jobs_simple_{len(jobs_data)}{output_ext}")
+            print(f"\n✅ SUCCESS! Scraped {len(jobs_data)} jobs ({fallback.pages_loaded} needed the browser fallback)")
+            print(f"📁 Data saved to: {filename}")
+        else:
+            print("❌ No jobs were collected")
+
+    except KeyboardInterrupt:
+        print(f"\n⚠️  Script stopped by user. Saving {len(jobs_data)} jobs collected so far...")
+        if jobs_data:
+            filename = save_jobs(jobs_data, f"linkedin_jobs_partial_{len(jobs_data)}{output_ext}")
+            print(f"✅ Partial data saved to: {filename}")
+
+    except Exception as e:
+        print(f"❌ Unexpected error: {e}")
+        if jobs_data:
+            filename = save_jobs(jobs_data, f"linkedin_jobs_error_{len(jobs_data)}{output_ext}")
+            print(f"✅ Error recovery - data saved to: {filename}")
+
+    finally:
+        fallback.close()
+
 if __name__ == "__main__":
     # Install required package if not already installed
     try:
@@ -167,4 +186,12 @@ if __name__ == "__main__":
         subprocess.run(["playwright", "install"], check=True)
         print("✅ Playwright installed successfully!")
     
-    scrape_linkedin_jobs_simple()
+    # python simple_linkedin_scraper.py --list-only  -> basic columns only, no clicks
+    # python simple_linkedin_scraper.py --http       -> guest-API HTTP backend, browser only as fallback
+    # python simple_linkedin_scraper.py --parquet    -> results as Parquet instead of CSV
+    output_ext = ".parquet" if "--parquet" in sys.argv else ".csv"
+    check_output_ext(output_ext)
+    if "--http" in sys.argv:
+        scrape_linkedin_jobs_http(output_ext=output_ext)
+    else:
+        scrape_linkedin_jobs_simple(list_only="--list-only" in sys.argv, output_ext=output_ext)
@@ -0,0 +1,89 @@
+import re
+
+try:
+    import ahocorasick  # pyahocorasick: Aho-Corasick automaton in C
+except ImportError:
+    ahocorasick = None
+
+# Shared text classification for the scrapers: email extraction and
+# remote/role keyword matching, with everything compiled once at import.
+#
+# Emails: the regex only runs on the whitespace-separated tokens that contain
+# an "@" (an address can never span whitespace), so most descriptions cost
+# one C-level "@" scan instead of a full backtracking regex pass.
+#
+# Keywords: KeywordMatcher lowercases once and finds every keyword. Large
+# keyword sets go through an Aho-Corasick automaton (one pass whatever the
+# number of keywords); small ones through C-level substring scans, which for a
+# handful of keywords beat any automaton driven from Python.
+#
+# classify_batch() runs thousands of jobs through those shared matchers.
+# Scanning one concatenation of all texts and mapping hits back was measured
+# slower than the per-text path, so it does not.
+
+EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+
+REMOTE_KEYWORDS = ["remote", "work from home", "telecommute", "anywhere", "distributed", "virtual"]
+
+ROLE_KEYWORDS = [
+    "data scientist", "data science", "data analyst", "data analysis", "ai engineer",
+    "artificial intelligence engineer", "machine learning engineer", "ml engineer", "python developer"
+]
+
+# Below this many keywords, plain substring scans are faster than the automaton
+AUTOMATON_MIN_KEYWORDS = 16
+
+def extract_emails(text):
+    """Same matches as EMAIL_RE.findall(text), without running the regex over @-free text"""
+    if "@" not in text:
+        return []
+    return [email for token in text.split() if "@" in token for email in EMAIL_RE.findall(token)]
+
+class KeywordMatcher:
+    """Case-insensitive substring matcher for a fixed keyword list"""
+
+    def __init__(self, keywords, automaton=None):
+        self.keywords = [keyword.lower() for keyword in keywords]
+        if automaton is None:
+            automaton = len(self.keywords) >= AUTOMATON_MIN_KEYWORDS
+        self.automaton = None
+        if automaton and ahocorasick is not None:
+            self.automaton = ahocorasick.Automaton()
+            for keyword in self.keywords:
+                self.automaton.add_word(keyword, keyword)
+            self.automaton.make_automaton()
+
+    def search(self, text):
+        """True if any keyword occurs in `text`"""
+        text = text.lower()
+        if self.automaton is not None:
+            return next(self.automaton.iter(text), None) is not None
+        return any(keyword in text for keyword in self.keywords)
+
+    def find_all(self, text):
+        text = text.lower()
+        if self.automaton is not None:
+            return {keyword for _, keyword in self.automaton.iter(text)}
+        return {keyword for keyword in self.keywords if keyword in text}
+
+REMOTE_MATCHER = KeywordMatcher(REMOTE_KEYWORDS)
+ROLE_MATCHER = KeywordMatcher(ROLE_KEYWORDS)
+
+def is_remote(*parts, matcher=REMOTE_MATCHER):
+    return matcher.search(" ".join(parts))
+
+def classify(title, company, description, location, remote_matcher=REMOTE_MATCHER):
+    """Emails in the description, remote flag and role keywords of one job"""
+    return {
+        "emails": extract_emails(description),
+        "is_remote": remote_matcher.search(" ".join((title, company, description, location))),
+        "roles": ROLE_MATCHER.find_all(title),
+    }
+
+def classify_batch(jobs, remote_matcher=REMOTE_MATCHER):
+    """classify() for a list of dicts with title/company/description/location"""
+    return [
+        classify(job.get("title", ""), job.get("company", ""), job.get("description", ""), job.get("location", ""),
+                 remote_matcher)
+        for job in jobs
+    ]
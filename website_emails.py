@@ -0,0 +1,220 @@
+import asyncio
+import functools
+import html
+import re
+import sys
+import threading
+import time
+from urllib.parse import unquote, urldefrag, urljoin, urlsplit
+from text_classify import extract_emails
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+# Company-website email crawler over plain HTTP.
+#
+# Replaces driving Chromium to a company homepage, waiting, and then visiting
+# up to three contact/about/team links one after another. The homepage is
+# fetched with a pooled httpx.AsyncClient, its contact-like links are resolved
+# with urljoin and fetched concurrently, and emails are parsed from the raw
+# HTML: plain addresses, mailto: links (URL-encoded too), HTML entities and
+# lightly obfuscated forms such as "jobs [at] acme [dot] com".
+#
+# Requests to one host are limited to `max_per_host` at a time and spaced by
+# `host_delay` seconds, whatever the number of callers. find_emails() returns
+# None when the site cannot be read over HTTP (error status, not HTML, or a
+# client-rendered shell without links); callers then fall back to the browser.
+#
+#   python website_emails.py https://example.com          -> crawl one site
+#   python website_emails.py fixtures/company_site         -> crawl the fixture site on a local server
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml',
+    'Accept-Language': 'en-US,en;q=0.9,de;q=0.8',
+}
+
+# Links worth following from a homepage (Impressum/Kontakt: German sites must list a contact address there)
+CONTACT_LINK_WORDS = ("contact", "about", "team", "impressum", "imprint", "kontakt")
+MAX_CONTACT_PAGES = 3
+MAX_PAGE_CHARS = 2000000
+
+HREF_RE = re.compile(r'<a\s[^>]*?href\s*=\s*["\']([^"\']+)["\']', re.IGNORECASE)
+MAILTO_RE = re.compile(r'mailto:([^"\'?>\s]+)', re.IGNORECASE)
+OBFUSCATED_AT = r'\s*[\[\(\{]\s*at\s*[\]\)\}]\s*|\s+at\s+'
+OBFUSCATED_DOT = r'\s*[\[\(\{]\s*dot\s*[\]\)\}]\s*|\s+dot\s+|\.'
+OBFUSCATED_RE = re.compile(
+    rf'\b([A-Za-z0-9._%+-]+)(?:{OBFUSCATED_AT})([A-Za-z0-9-]+(?:(?:{OBFUSCATED_DOT})[A-Za-z0-9-]+)*(?:{OBFUSCATED_DOT})[A-Za-z]{{2,}})\b',
+    re.IGNORECASE
+)
+DOT_RE = re.compile(OBFUSCATED_DOT, re.IGNORECASE)
+BRACKETED_AT_RE = re.compile(r'[\[\(\{]\s*at\s*[\]\)\}]', re.IGNORECASE)
+SPELLED_DOT_RE = re.compile(r'[\[\(\{]\s*dot\s*[\]\)\}]|\s+dot\s+', re.IGNORECASE)
+# Left behind by "mail a@b.com, or ..." and "(a@b.com)"
+EMAIL_TRIM = ".,;:!?()[]{}<>'\""
+
+# "logo@2x.png" and friends look like addresses to the email regex
+NOT_EMAIL_SUFFIXES = (".png", ".jpg", ".jpeg", ".gif", ".svg", ".webp", ".css", ".js")
+
+def parse_emails(page_html):
+    """Every distinct email in raw HTML: plain, mailto:, entity-encoded and [at]/[dot]-obfuscated"""
+    text = html.unescape(page_html)
+    found = [unquote(address) for address in MAILTO_RE.findall(text)]
+    found += extract_emails(text)
+    for match in OBFUSCATED_RE.finditer(text):
+        at_sign = text[match.end(1):match.start(2)]
+        # Plain "x at y.com" is too often just prose; only trust it when the dot is spelled out too
+        if not BRACKETED_AT_RE.search(at_sign) and not SPELLED_DOT_RE.search(match.group(2)):
+            continue
+        found.append(f"{match.group(1)}@{DOT_RE.sub('.', match.group(2))}")
+
+    emails = []
+    for email in found:
+        email = email.strip().strip(EMAIL_TRIM).lower()
+        if "@" in email and not email.endswith(NOT_EMAIL_SUFFIXES) and email not in emails:
+            emails.append(email)
+    return emails
+
+def same_site(host, other):
+    return (host or "").removeprefix("www.") == (other or "").removeprefix("www.")
+
+def contact_links(page_html, base_url, limit=MAX_CONTACT_PAGES):
+    """Absolute same-site contact/about/team links of a page, in page order"""
+    base_host = urlsplit(base_url).hostname
+    links = []
+    for href in HREF_RE.findall(page_html):
+        href = html.unescape(href).strip()
+        if href.lower().startswith(("mailto:", "tel:", "javascript:", "#")):
+            continue
+        if not any(word in href.lower() for word in CONTACT_LINK_WORDS):
+            continue
+        url = urldefrag(urljoin(base_url, href))[0]
+        if urlsplit(url).scheme in ("http", "https") and same_site(urlsplit(url).hostname, base_host) and url not in links:
+            links.append(url)
+            if len(links) >= limit:
+                break
+    return links
+
+class WebsiteEmailCrawler:
+    """Async company-website email lookup with per-host politeness; close with aclose()"""
+
+    def __init__(self, max_connections=20, max_per_host=2, host_delay=0.5, timeout=10):
+        if httpx is None:
+            raise ImportError("The HTTP website crawler needs httpx: pip install httpx")
+        self.client = httpx.AsyncClient(
+            headers=HEADERS,
+            timeout=timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        )
+        self.max_per_host = max_per_host
+        self.host_delay = host_delay
+        self.host_slots = {}
+        self.host_next_start = {}
+        self.pages_fetched = 0
+        self.fetch_errors = 0
+
+    async def fetch(self, url):
+        """(html, final url) of a page, or (None, url) when it is not readable HTML"""
+        host = urlsplit(url).hostname or ""
+        slot = self.host_slots.setdefault(host, asyncio.Semaphore(self.max_per_host))
+        async with slot:
+            now = time.monotonic()
+            start = max(now, self.host_next_start.get(host, now))
+            self.host_next_start[host] = start + self.host_delay
+            if start > now:
+                await asyncio.sleep(start - now)
+            try:
+                response = await self.client.get(url)
+            except httpx.HTTPError:
+                self.fetch_errors += 1
+                return None, url
+        self.pages_fetched += 1
+        content_type = response.headers.get("content-type", "html")
+        if response.status_code != 200 or "html" not in content_type:
+            return None, str(response.url)
+        return response.text[:MAX_PAGE_CHARS], str(response.url)
+
+    async def find_emails(self, website_url):
+        """Emails on the homepage, else on its contact pages; None when the site needs a real browser"""
+        if not urlsplit(website_url).scheme:
+            website_url = "https://" + website_url
+        page_html, final_url = await self.fetch(website_url)
+        if page_html is None:
+            return None
+
+        emails = parse_emails(page_html)
+        if emails:
+            return emails
+
+        links = contact_links(page_html, final_url)
+        if not links and not HREF_RE.search(page_html):
+            return None  # client-rendered shell: nothing to read without JavaScript
+
+        for contact_html, _ in await asyncio.gather(*(self.fetch(link) for link in links)):
+            if contact_html:
+                emails += [email for email in parse_emails(contact_html) if email not in emails]
+        return emails
+
+    async def aclose(self):
+        await self.client.aclose()
+
+class SyncWebsiteEmailCrawler:
+    """WebsiteEmailCrawler for the sync scrapers, on an event loop thread so its connection pool lives across calls"""
+
+    def __init__(self, **kwargs):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+        self.crawler = self.call(self.create(kwargs))
+
+    async def create(self, kwargs):
+        return WebsiteEmailCrawler(**kwargs)
+
+    def call(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+
+    def find_emails(self, website_url):
+        return self.call(self.crawler.find_emails(website_url))
+
+    def close(self):
+        if self.loop.is_closed():
+            return
+        self.call(self.crawler.aclose())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+def serve_directory(directory):
+    """Serve `directory` on a free localhost port from a daemon thread; returns the server"""
+    from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+    class QuietHandler(SimpleHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(QuietHandler, directory=directory))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+async def crawl_and_print(website_url):
+    crawler = WebsiteEmailCrawler(host_delay=0)
+    started = time.perf_counter()
+    try:
+        emails = await crawler.find_emails(website_url)
+    finally:
+        await crawler.aclose()
+    print(f"🌐 {website_url}: {emails} ({crawler.pages_fetched} pages in {time.perf_counter() - started:.2f}s)")
+
+if __name__ == "__main__":
+    target = sys.argv[1]
+    if target.startswith(("http://", "https://")):
+        asyncio.run(crawl_and_print(target))
+    else:
+        server = serve_directory(target)
+        try:
+            asyncio.run(crawl_and_print(f"http://127.0.0.1:{server.server_port}/"))
+        finally:
+            server.shutdown()
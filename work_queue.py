@@ -0,0 +1,306 @@
+import json
+import os
+import socket
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime
+
+try:
+    import requests
+except ImportError:
+    requests = None
+
+# Shared work queue with leases for crawls spread over several processes/machines.
+#
+# Each work item (one country x role search) is claimed by one worker for
+# `lease_seconds`. While the worker crawls it, a LeaseKeeper thread heartbeats
+# the lease and reports the item's progress (results pages done); the worker
+# then completes it with a result or fails it. A lease that is not renewed -
+# the node crashed, was killed or lost its network - expires, and the item goes
+# to the next worker that asks, which resumes from the last reported progress.
+# An item whose lease expired or that failed `max_attempts` times is parked as
+# "failed" instead of taking down every node in turn.
+#
+# WorkQueue keeps the items in SQLite (WAL, one write transaction per claim), so
+# processes on one machine can share the file directly. Across machines one
+# node serves the file over HTTP and the others use RemoteWorkQueue, which has
+# the same methods; open_queue() picks one from a path or a URL:
+#
+#   python work_queue.py serve crawl_queue.db 8765      -> coordinator on port 8765
+#   python work_queue.py status crawl_queue.db          -> items per state (path or http://host:8765)
+#
+# Items are added and crawled by run_scraper.py (--seed-queue / --queue).
+
+LEASE_SECONDS = 600
+MAX_ATTEMPTS = 3
+QUEUE_METHODS = ("add", "claim", "heartbeat", "complete", "fail", "release", "counts")
+
+def worker_name():
+    """host-pid, unique per worker process across the machines of a run"""
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+class WorkQueue:
+    def __init__(self, path, lease_seconds=LEASE_SECONDS, max_attempts=MAX_ATTEMPTS):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.lock = threading.Lock()
+        # Autocommit mode: every method runs its own BEGIN IMMEDIATE ... COMMIT
+        self.conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS items (
+                key TEXT PRIMARY KEY,
+                payload TEXT,
+                state TEXT NOT NULL DEFAULT 'pending',
+                worker TEXT,
+                lease_until REAL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                progress TEXT,
+                result TEXT,
+                error TEXT,
+                updated_at TEXT
+            )
+        """)
+
+    def write(self, sql_statements):
+        """Run [(sql, params), ...] in one write transaction; returns the cursor of the last statement"""
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                for sql, params in sql_statements:
+                    cursor = self.conn.execute(sql, params)
+                self.conn.execute("COMMIT")
+            except:
+                self.conn.execute("ROLLBACK")
+                raise
+            return cursor
+
+    def add(self, items):
+        """Queue [(key, payload), ...]; keys already in the queue (in any state) are left alone"""
+        added = 0
+        for key, payload in items:
+            added += self.write([(
+                "INSERT OR IGNORE INTO items (key, payload, updated_at) VALUES (?, ?, ?)",
+                (key, json.dumps(payload), now_text()),
+            )]).rowcount
+        return added
+
+    def claim(self, worker):
+        """Lease the next pending (or expired) item to `worker`: {key, payload, progress, attempts}, or None"""
+        now = time.time()
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Items whose lease ran out on their last attempt are parked instead of handed out again
+                self.conn.execute(
+                    "UPDATE items SET state = 'failed', error = 'lease expired', updated_at = ? "
+                    "WHERE state = 'leased' AND lease_until < ? AND attempts >= ?",
+                    (now_text(), now, self.max_attempts),
+                )
+                row = self.conn.execute(
+                    "SELECT key, payload, progress, attempts FROM items "
+                    "WHERE state = 'pending' OR (state = 'leased' AND lease_until < ?) ORDER BY rowid LIMIT 1",
+                    (now,),
+                ).fetchone()
+                if row:
+                    self.conn.execute(
+                        "UPDATE items SET state = 'leased', worker = ?, lease_until = ?, attempts = attempts + 1, "
+                        "updated_at = ? WHERE key = ?",
+                        (worker, now + self.lease_seconds, now_text(), row[0]),
+                    )
+                self.conn.execute("COMMIT")
+            except:
+                self.conn.execute("ROLLBACK")
+                raise
+        if row is None:
+            return None
+        return {"key": row[0], "payload": json.loads(row[1]), "progress": json.loads(row[2] or "null"),
+                "attempts": row[3] + 1}
+
+    def heartbeat(self, key, worker, progress=None):
+        """Extend `worker`'s lease on `key` (and record its progress); False if the lease was lost"""
+        return self.write([(
+            "UPDATE items SET lease_until = ?, progress = COALESCE(?, progress), updated_at = ? "
+            "WHERE key = ? AND worker = ? AND state = 'leased'",
+            (time.time() + self.lease_seconds, json_or_none(progress), now_text(), key, worker),
+        )]).rowcount == 1
+
+    def complete(self, key, worker, result=None):
+        return self.write([(
+            "UPDATE items SET state = 'done', result = ?, lease_until = NULL, updated_at = ? "
+            "WHERE key = ? AND worker = ? AND state = 'leased'",
+            (json_or_none(result), now_text(), key, worker),
+        )]).rowcount == 1
+
+    def fail(self, key, worker, error="", progress=None):
+        """Give `key` back for a retry, or park it as failed after max_attempts"""
+        return self.write([(
+            "UPDATE items SET state = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, error = ?, "
+            "progress = COALESCE(?, progress), lease_until = NULL, updated_at = ? "
+            "WHERE key = ? AND worker = ? AND state = 'leased'",
+            (self.max_attempts, str(error), json_or_none(progress), now_text(), key, worker),
+        )]).rowcount == 1
+
+    def release(self, key, worker, progress=None):
+        """Give `key` back untouched (worker stopping), without spending an attempt"""
+        return self.write([(
+            "UPDATE items SET state = 'pending', attempts = attempts - 1, progress = COALESCE(?, progress), "
+            "lease_until = NULL, updated_at = ? WHERE key = ? AND worker = ? AND state = 'leased'",
+            (json_or_none(progress), now_text(), key, worker),
+        )]).rowcount == 1
+
+    def counts(self):
+        """{state: items}; leases that ran out show as "expired" """
+        counts = {}
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT state, state = 'leased' AND lease_until < ?, COUNT(*) FROM items GROUP BY 1, 2", (time.time(),)
+            ).fetchall()
+        for state, expired, count in rows:
+            state = "expired" if expired else state
+            counts[state] = counts.get(state, 0) + count
+        return counts
+
+    def close(self):
+        self.conn.close()
+
+def now_text():
+    return datetime.now().isoformat(timespec="seconds")
+
+def json_or_none(value):
+    return None if value is None else json.dumps(value)
+
+class RemoteWorkQueue:
+    """WorkQueue methods over HTTP, against `python work_queue.py serve`"""
+
+    def __init__(self, url, timeout=30):
+        if requests is None:
+            raise ImportError("The remote work queue needs requests: pip install requests")
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def call(self, method, **kwargs):
+        response = self.session.post(f"{self.url}/{method}", json=kwargs, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()["result"]
+
+    def add(self, items):
+        return self.call("add", items=[list(item) for item in items])
+
+    def claim(self, worker):
+        return self.call("claim", worker=worker)
+
+    def heartbeat(self, key, worker, progress=None):
+        return self.call("heartbeat", key=key, worker=worker, progress=progress)
+
+    def complete(self, key, worker, result=None):
+        return self.call("complete", key=key, worker=worker, result=result)
+
+    def fail(self, key, worker, error="", progress=None):
+        return self.call("fail", key=key, worker=worker, error=error, progress=progress)
+
+    def release(self, key, worker, progress=None):
+        return self.call("release", key=key, worker=worker, progress=progress)
+
+    def counts(self):
+        return self.call("counts")
+
+    def close(self):
+        self.session.close()
+
+def open_queue(target, lease_seconds=LEASE_SECONDS):
+    """RemoteWorkQueue for an http(s):// URL, else a WorkQueue on the SQLite file `target`"""
+    if target.startswith(("http://", "https://")):
+        return RemoteWorkQueue(target)
+    return WorkQueue(target, lease_seconds)
+
+def serve_queue(path, port, host="0.0.0.0", lease_seconds=LEASE_SECONDS):
+    """Serve a WorkQueue to RemoteWorkQueue clients until interrupted"""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    queue = WorkQueue(path, lease_seconds)
+
+    class QueueHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            method = self.path.strip("/")
+            if method not in QUEUE_METHODS:
+                self.send_error(404)
+                return
+            try:
+                kwargs = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                body = json.dumps({"result": getattr(queue, method)(**kwargs)}).encode()
+            except Exception as e:
+                self.send_error(400, str(e))
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), QueueHandler)
+    print(f"📬 Work queue {path} served on http://{host}:{port} (lease {lease_seconds}s)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        queue.close()
+
+class LeaseKeeper:
+    """Heartbeats the leases of the items a worker is crawling from a background thread
+
+    `progress(key)` is sent with every heartbeat; `lost` lists the keys whose lease
+    was taken over by another worker.
+    """
+
+    def __init__(self, queue, worker, keys, progress=None, interval=None):
+        self.queue = queue
+        self.worker = worker
+        self.keys = list(keys)
+        self.progress = progress or (lambda key: None)
+        self.interval = interval or getattr(queue, "lease_seconds", LEASE_SECONDS) / 3
+        self.lost = set()
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            for key in self.keys:
+                if key in self.lost:
+                    continue
+                try:
+                    if not self.queue.heartbeat(key, self.worker, self.progress(key)):
+                        print(f"⚠️  Lease on {key} was lost - another worker took it over")
+                        self.lost.add(key)
+                except Exception as e:
+                    print(f"⚠️  Heartbeat failed: {e}")  # retried next interval; the lease may still hold
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stopped.set()
+        self.thread.join()
+
+def print_counts(queue):
+    counts = queue.counts()
+    total = sum(counts.values())
+    print(f"📬 {total} work items: " + ", ".join(f"{state} {count}" for state, count in sorted(counts.items())))
+
+if __name__ == "__main__":
+    command, target = sys.argv[1], sys.argv[2]
+    if command == "serve":
+        serve_queue(target, int(sys.argv[3]) if len(sys.argv) > 3 else 8765)
+    elif command == "status":
+        queue = open_queue(target)
+        print_counts(queue)
+        queue.close()